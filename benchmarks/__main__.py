@@ -0,0 +1,139 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+# Runs the benchmark suite against the recorded and the synthetic fixtures:
+#
+#   python -m benchmarks --output results.json
+#   python -m benchmarks --filter dmidecode --fixture synthetic-server
+#   python -m benchmarks --compare baseline.json --threshold 10
+#
+# The results are written as JSON, a summary table goes to stderr. With --compare the exit code is 1 when a
+# benchmark got slower than the baseline by more than the threshold.
+# pylint: disable=wrong-import-position,wrong-import-order
+import os
+import sys
+import tempfile
+
+# importing the models opens the database in the config directory, keep the user's one out of the way
+_XDG_HOME = tempfile.mkdtemp(prefix='gst-benchmarks-')
+os.environ['XDG_CONFIG_HOME'] = os.path.join(_XDG_HOME, 'config')
+os.environ['XDG_CACHE_HOME'] = os.path.join(_XDG_HOME, 'cache')
+
+from benchmarks import gtk_stub
+
+gtk_stub.install()
+
+import argparse
+import datetime
+import json
+import platform
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks import bench_dmidecode, bench_hardware_monitor, bench_main_view, bench_proc_cpuinfo, \
+    bench_sys_devices_cache  # noqa: F401 pylint: disable=unused-import
+from benchmarks.fixtures import get_fixtures
+from benchmarks.runner import BENCHMARKS, run_benchmark
+
+
+def _get_git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, universal_newlines=True,
+                              cwd=str(Path(__file__).parent)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _print_summary(results: List[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<36} {'fixture':<24} {'median':>12} {'throughput':>22} {'peak alloc':>12}", file=sys.stderr)
+    for result in results:
+        throughput = f"{result['items_per_second']:,.0f} {result['unit']}/s" if result['items_per_second'] else ''
+        print(f"{result['benchmark']:<36} {result['fixture']:<24} "
+              f"{result['median_seconds'] * 1000:>9.3f} ms {throughput:>22} "
+              f"{result['peak_bytes'] / 1024:>9.1f} KiB", file=sys.stderr)
+
+
+def _compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    baseline = {(result['benchmark'], result['fixture']): result
+                for result in json.loads(Path(baseline_path).read_text())['results']}
+    regressions = False
+    for result in results:
+        baseline_result = baseline.get((result['benchmark'], result['fixture']))
+        if baseline_result is None:
+            continue
+        change = (result['median_seconds'] / baseline_result['median_seconds'] - 1) * 100
+        if change > threshold:
+            regressions = True
+            print(f"REGRESSION {result['benchmark']} on {result['fixture']}: {change:+.1f}%", file=sys.stderr)
+        elif change < -threshold:
+            print(f"improvement {result['benchmark']} on {result['fixture']}: {change:+.1f}%", file=sys.stderr)
+    return not regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Run the GST benchmark suite")
+    parser.add_argument('--filter', '-k', default='', help="run only the benchmarks containing this text")
+    parser.add_argument('--fixture', '-f', action='append', help="run only on this fixture (can be repeated)")
+    parser.add_argument('--repeat', '-r', type=int, default=5, help="timed samples per benchmark (default: 5)")
+    parser.add_argument('--output', '-o', help="write the JSON results to this file instead of stdout")
+    parser.add_argument('--compare', '-c', help="JSON results of a previous run to compare with")
+    parser.add_argument('--threshold', '-t', type=float, default=10.0,
+                        help="slowdown in percent reported as a regression by --compare (default: 10)")
+    parser.add_argument('--list', '-l', action='store_true', help="list the benchmarks and the fixtures")
+    args = parser.parse_args()
+
+    fixtures = [fixture for fixture in get_fixtures() if not args.fixture or fixture.name in args.fixture]
+    benchmarks = [benchmark for benchmark in BENCHMARKS if args.filter in benchmark.name]
+    if args.list:
+        for benchmark in benchmarks:
+            print(benchmark.name)
+        for fixture in fixtures:
+            print(f"{fixture.name}{' (synthetic)' if fixture.synthetic else ''}: {fixture.description}")
+        return 0
+
+    results = []
+    for benchmark in benchmarks:
+        for fixture in fixtures:
+            result = run_benchmark(benchmark, fixture, args.repeat)
+            if result is not None:
+                results.append(result)
+    _print_summary(results)
+
+    output = json.dumps({
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'revision': _get_git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'results': results,
+    }, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + '\n')
+    else:
+        print(output)
+    if args.compare:
+        return 0 if _compare(results, args.compare, args.threshold) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        shutil.rmtree(_XDG_HOME, ignore_errors=True)
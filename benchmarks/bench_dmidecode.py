@@ -0,0 +1,104 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import Dict, Iterator, List, Optional
+
+from benchmarks.fixtures import Fixture
+from benchmarks.runner import Case, benchmark
+from gst.util.dmidecode import DmiParse, DmiType
+from gst.util.smbios import SmbiosParse
+
+# the keys DmiDecodeRepository._update_system_info reads
+_REPOSITORY_KEYS: Dict[DmiType, List[str]] = {
+    DmiType.MEMORY_DEVICE: ['Locator', 'Bank Locator', 'Type', 'Type Detail', 'Size', 'Speed', 'Rank',
+                            'Manufacturer', 'Part Number'],
+    DmiType.PROCESSOR: ['Upgrade', 'Signature'],
+}
+
+
+# returns where decoding the SMBIOS tables gives different values than parsing the dmidecode output
+def check_smbios_matches_dmidecode(fixture: Fixture) -> List[str]:
+    if fixture.smbios_entry_point is None or fixture.smbios_table is None or fixture.dmidecode is None:
+        return []
+    smbios = SmbiosParse(fixture.smbios_entry_point, fixture.smbios_table)
+    dmi = DmiParse(fixture.dmidecode)
+    mismatches = []
+    for dmi_type, keys in _REPOSITORY_KEYS.items():
+        smbios_handles = {handle for handle, record in smbios.dmi_data.items() if record['DMIType'] == dmi_type}
+        dmi_handles = {handle for handle, record in dmi.dmi_data.items() if record['DMIType'] == dmi_type}
+        if smbios_handles != dmi_handles:
+            mismatches.append(f"{dmi_type.name}: handles {sorted(smbios_handles)} != {sorted(dmi_handles)}")
+        for handle in sorted(smbios_handles & dmi_handles):
+            for key in keys:
+                smbios_value = smbios.dmi_data[handle].get(key)
+                dmi_value = dmi.dmi_data[handle].get(key)
+                if smbios_value != dmi_value:
+                    mismatches.append(f"{dmi_type.name} {handle} {key}: {smbios_value!r} != {dmi_value!r}")
+    return mismatches
+
+
+@benchmark('dmidecode/parse', 'records')
+def parse(fixture: Fixture) -> Iterator[Optional[Case]]:
+    if fixture.dmidecode is None:
+        yield None
+        return
+    text = fixture.dmidecode
+    yield Case(lambda: DmiParse(text), text.count('\nHandle '))
+
+
+@benchmark('dmidecode/parse_memory_devices', 'records')
+def parse_memory_devices(fixture: Fixture) -> Iterator[Optional[Case]]:
+    # what DmiDecodeRepository does with the output: memory devices and processors
+    if fixture.dmidecode is None:
+        yield None
+        return
+    text = fixture.dmidecode
+
+    def run() -> None:
+        dmi = DmiParse(text, (DmiType.MEMORY_DEVICE, DmiType.PROCESSOR))
+        dmi.get_type(DmiType.MEMORY_DEVICE.value)
+        dmi.get_type(DmiType.PROCESSOR.value)
+
+    yield Case(run, text.count('\nHandle '))
+
+
+@benchmark('smbios/decode', 'structures')
+def decode_smbios(fixture: Fixture) -> Iterator[Optional[Case]]:
+    # the tables read from /sys/firmware/dmi/tables, instead of running dmidecode
+    if fixture.smbios_entry_point is None or fixture.smbios_table is None:
+        yield None
+        return
+    # a faster decoder is no use if it reads different values than dmidecode
+    mismatches = check_smbios_matches_dmidecode(fixture)
+    if mismatches:
+        raise AssertionError(f"SmbiosParse and DmiParse disagree on {fixture.name}:\n" + '\n'.join(mismatches))
+    entry_point, table = fixture.smbios_entry_point, fixture.smbios_table
+    yield Case(lambda: SmbiosParse(entry_point, table), len(SmbiosParse(entry_point, table).dmi_data))
+
+
+@benchmark('smbios/decode_memory_devices', 'structures')
+def decode_smbios_memory_devices(fixture: Fixture) -> Iterator[Optional[Case]]:
+    if fixture.smbios_entry_point is None or fixture.smbios_table is None:
+        yield None
+        return
+    entry_point, table = fixture.smbios_entry_point, fixture.smbios_table
+
+    def run() -> None:
+        dmi = SmbiosParse(entry_point, table, (DmiType.MEMORY_DEVICE, DmiType.PROCESSOR))
+        dmi.get_type(DmiType.MEMORY_DEVICE.value)
+        dmi.get_type(DmiType.PROCESSOR.value)
+
+    yield Case(run, len(SmbiosParse(entry_point, table).dmi_data))
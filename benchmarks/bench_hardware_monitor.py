@@ -0,0 +1,84 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from benchmarks.fixtures import Fixture
+from benchmarks.runner import Case, benchmark
+from gst.model.hardware_monitor import HardwareMonitor, HwMonitoredItemKey
+from gst.model.monitored_item import MonitoredItem
+from gst.util.sensors import FeatureType
+
+# (chip_name, item_id, item_name, feature_type, value)
+SensorsFeature = Tuple[str, str, str, FeatureType, Optional[float]]
+
+_SUBFEATURE_RE = re.compile(r'^([a-z]+)(\d+)_([a-z_]+)$')
+_FEATURE_TYPES = {
+    'in': FeatureType.IN,
+    'fan': FeatureType.FAN,
+    'temp': FeatureType.TEMP,
+    'power': FeatureType.POWER,
+    'energy': FeatureType.ENERGY,
+    'curr': FeatureType.CURR,
+    'humidity': FeatureType.HUMIDITY,
+    'cpu': FeatureType.VID,
+    'intrusion': FeatureType.INTRUSION,
+}
+
+
+def get_sensors_features(sensors: Dict[str, Any]) -> List[SensorsFeature]:
+    # turns the output of `sensors -j` into what LmSensorsRepository reads from libsensors
+    features: List[SensorsFeature] = []
+    for chip_name, chip in sensors.items():
+        for label, subfeatures in chip.items():
+            if not isinstance(subfeatures, dict) or not subfeatures:
+                continue
+            match = _SUBFEATURE_RE.match(next(iter(subfeatures)))
+            if match is None or match.group(1) not in _FEATURE_TYPES:
+                continue
+            item_id = match.group(1) + match.group(2)
+            value = subfeatures.get(f"{item_id}_input", subfeatures.get(f"{item_id}_average"))
+            features.append((chip_name, item_id, label, _FEATURE_TYPES[match.group(1)], value))
+    return features
+
+
+def update_hardware_monitor(hwmon: HardwareMonitor, features: List[SensorsFeature], delta: float) -> None:
+    present_keys: Set[HwMonitoredItemKey] = set()
+    for chip_name, item_id, item_name, feature_type, value in features:
+        hwmon.set_hw_monitored_item(
+            chip_name, MonitoredItem(item_id, item_name, None if value is None else value + delta, feature_type))
+        present_keys.add((chip_name, feature_type, item_id))
+    hwmon.remove_missing_hw_monitored_items(present_keys)
+
+
+@benchmark('hardware_monitor/update', 'items')
+def update(fixture: Fixture) -> Iterator[Optional[Case]]:
+    # the model side of LmSensorsRepository.refresh() and of the view update, without libsensors
+    if fixture.sensors is None:
+        yield None
+        return
+    features = get_sensors_features(fixture.sensors)
+    hwmon = HardwareMonitor()
+    deltas = [0.0, 1.0]
+
+    def run() -> None:
+        deltas.reverse()  # every value changes at every refresh
+        update_hardware_monitor(hwmon, features, deltas[0])
+        hwmon.pop_changes()
+        hwmon.pop_updated_items()
+
+    yield Case(run, len(features))
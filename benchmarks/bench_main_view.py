@@ -0,0 +1,102 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
+from typing import Iterator, Optional
+
+from benchmarks.bench_hardware_monitor import get_sensors_features, update_hardware_monitor
+from benchmarks.bench_proc_cpuinfo import load_system_info
+from benchmarks.fixtures import Fixture, write_sys_devices_cpu
+from benchmarks.gtk_stub import GObjectStub
+from benchmarks.runner import Case, benchmark
+from gst.di import SysRoot
+from gst.model.monitored_item import MonitoredItem
+from gst.model.system_info import SystemInfo
+from gst.repository.sys_devices_cache_repository import SysDevicesCacheRepository
+from gst.util.sensors import FeatureType
+from gst.view.main_view import MainView
+
+
+def _create_main_view(system_info: SystemInfo) -> MainView:
+    return MainView(presenter=GObjectStub(),
+                    preferences_view_provider=GObjectStub(),
+                    builder=GObjectStub(),
+                    settings_interactor=GObjectStub(),
+                    system_info=system_info)
+
+
+def _load_system_info(fixture: Fixture) -> SystemInfo:
+    system_info = load_system_info(fixture)
+    if fixture.cpu_cache is not None:
+        with tempfile.TemporaryDirectory() as root:
+            write_sys_devices_cpu(fixture, os.path.join(root, 'devices', 'system', 'cpu'))
+            SysDevicesCacheRepository(SysRoot(root)).refresh(system_info)
+    if fixture.sensors is not None:
+        update_hardware_monitor(system_info.hwmon, get_sensors_features(fixture.sensors), 0.0)
+    processor_count = fixture.get_processor_count()
+    system_info.cpu_usage.cores = [index % 100 for index in range(processor_count)]
+    for attr in ['user', 'nice', 'system', 'io_wait', 'irq', 'soft_irq', 'steal', 'guest', 'guest_nice']:
+        setattr(system_info.cpu_usage, attr, 1.5)
+    system_info.load_avg.load_avg_1 = system_info.load_avg.load_avg_5 = system_info.load_avg.load_avg_15 = 0.5
+    system_info.load_avg.cpu_count = processor_count
+    system_info.mem_usage.total = 32 * 1024 ** 3
+    system_info.mem_usage.available = 16 * 1024 ** 3
+    system_info.mem_usage.percent = 50.0
+    return system_info
+
+
+def _get_item_count(system_info: SystemInfo) -> int:
+    return sum(len(clocks) for clocks in system_info.cpu_info.clock_monitored_items.values()) + \
+           sum(len(items) for chip in system_info.hwmon.hw_monitored_items.values() for items in chip.values())
+
+
+@benchmark('main_view/init_system_info', 'items')
+def init_system_info(fixture: Fixture) -> Iterator[Optional[Case]]:
+    if fixture.proc_cpuinfo is None:
+        yield None
+        return
+    system_info = _load_system_info(fixture)
+    view = _create_main_view(system_info)
+    # pylint: disable=protected-access
+    yield Case(view._init_system_info, _get_item_count(system_info))
+
+
+@benchmark('main_view/refresh_system_info', 'items')
+def refresh_system_info(fixture: Fixture) -> Iterator[Optional[Case]]:
+    # every clock and sensor changes value, as it happens while a stress test is running
+    if fixture.proc_cpuinfo is None:
+        yield None
+        return
+    system_info = _load_system_info(fixture)
+    features = get_sensors_features(fixture.sensors) if fixture.sensors is not None else []
+    clocks = [(physical_package_id, item)
+              for physical_package_id, clocks in system_info.cpu_info.clock_monitored_items.items()
+              for item in clocks.values()]
+    view = _create_main_view(system_info)
+    view._init_system_info()  # pylint: disable=protected-access
+    deltas = [0.0, 1.0]
+
+    def run() -> None:
+        deltas.reverse()
+        for physical_package_id, item in clocks:
+            system_info.cpu_info.set_clock_monitored_item(
+                physical_package_id, MonitoredItem(item.item_id, item.name, item.value_min + deltas[0],
+                                                   FeatureType.CLOCK))
+        update_hardware_monitor(system_info.hwmon, features, deltas[0])
+        view._refresh_system_info()  # pylint: disable=protected-access
+
+    yield Case(run, _get_item_count(system_info))
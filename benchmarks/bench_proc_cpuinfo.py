@@ -0,0 +1,56 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
+from typing import Iterator, Optional
+
+from benchmarks.fixtures import Fixture
+from benchmarks.runner import Case, benchmark
+from gst.di import ProcRoot
+from gst.model.system_info import SystemInfo
+from gst.repository.proc_cpuinfo_repository import ProcCpuinfoRepository
+
+
+@benchmark('proc_cpuinfo/full_parse', 'processors')
+def full_parse(fixture: Fixture) -> Iterator[Optional[Case]]:
+    yield from _refresh(fixture, hotplug_events_enabled=False)
+
+
+@benchmark('proc_cpuinfo/steady_state_parse', 'processors')
+def steady_state_parse(fixture: Fixture) -> Iterator[Optional[Case]]:
+    # with hotplug events only topology and clocks are parsed after the first read
+    yield from _refresh(fixture, hotplug_events_enabled=True)
+
+
+def _refresh(fixture: Fixture, hotplug_events_enabled: bool) -> Iterator[Optional[Case]]:
+    if fixture.proc_cpuinfo is None:
+        yield None
+        return
+    with tempfile.TemporaryDirectory() as root:
+        with open(os.path.join(root, 'cpuinfo'), 'w') as file:
+            file.write(fixture.proc_cpuinfo)
+        repository = ProcCpuinfoRepository(ProcRoot(root))
+        repository.set_hotplug_events_enabled(hotplug_events_enabled)
+        system_info = SystemInfo()
+        yield Case(lambda: repository.refresh(system_info), fixture.get_processor_count())
+
+
+def load_system_info(fixture: Fixture) -> SystemInfo:
+    with full_parse(fixture) as case:
+        assert case is not None
+        system_info: SystemInfo = case.run()
+    return system_info
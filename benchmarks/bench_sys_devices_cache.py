@@ -0,0 +1,43 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
+from typing import Iterator, Optional
+
+from benchmarks.bench_proc_cpuinfo import load_system_info
+from benchmarks.fixtures import Fixture, write_sys_devices_cpu
+from benchmarks.runner import Case, benchmark
+from gst.di import SysRoot
+from gst.repository.sys_devices_cache_repository import SysDevicesCacheRepository
+
+
+@benchmark('sys_devices_cache/discovery', 'processors')
+def discovery(fixture: Fixture) -> Iterator[Optional[Case]]:
+    if fixture.proc_cpuinfo is None or fixture.cpu_cache is None:
+        yield None
+        return
+    # the cache discovery walks the processors found in /proc/cpuinfo
+    system_info = load_system_info(fixture)
+    with tempfile.TemporaryDirectory() as root:
+        write_sys_devices_cpu(fixture, os.path.join(root, 'devices', 'system', 'cpu'))
+        repository = SysDevicesCacheRepository(SysRoot(root))
+
+        def run() -> None:
+            repository.invalidate()
+            repository.refresh(system_info)
+
+        yield Case(run, fixture.get_processor_count())
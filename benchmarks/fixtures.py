@@ -0,0 +1,327 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+FIXTURES_PATH = Path(__file__).parent.joinpath('fixtures')
+FIXTURE_PROC_CPUINFO = 'proc_cpuinfo'
+FIXTURE_DMIDECODE = 'dmidecode.txt'
+FIXTURE_SENSORS = 'sensors.json'  # output of `sensors -j`
+FIXTURE_CPU_CACHE = 'cpu_cache.json'  # /sys/devices/system/cpu/cpu*/cache, see record_fixture.py
+FIXTURE_SMBIOS_ENTRY_POINT = 'smbios_entry_point'  # /sys/firmware/dmi/tables
+FIXTURE_SMBIOS_TABLE = 'DMI'
+FIXTURE_MACHINE = 'machine.json'
+CACHE_INFO_FILES = ['id', 'level', 'number_of_sets', 'size', 'type', 'ways_of_associativity']
+
+
+class Fixture:
+    def __init__(self, name: str, description: str, synthetic: bool) -> None:
+        self.name = name
+        self.description = description
+        self.synthetic = synthetic
+        self.proc_cpuinfo: Optional[str] = None
+        self.dmidecode: Optional[str] = None
+        self.sensors: Optional[Dict[str, Any]] = None
+        self.cpu_cache: Optional[Dict[str, Any]] = None
+        self.smbios_entry_point: Optional[bytes] = None
+        self.smbios_table: Optional[bytes] = None
+
+    def get_processor_count(self) -> int:
+        if self.proc_cpuinfo is None:
+            return 0
+        return sum(1 for line in self.proc_cpuinfo.splitlines() if line.startswith('processor'))
+
+
+def load_fixture(path: Path) -> Fixture:
+    machine: Dict[str, Any] = {}
+    if path.joinpath(FIXTURE_MACHINE).exists():
+        machine = json.loads(path.joinpath(FIXTURE_MACHINE).read_text())
+    fixture = Fixture(path.name, machine.get('description', path.name), False)
+    if path.joinpath(FIXTURE_PROC_CPUINFO).exists():
+        fixture.proc_cpuinfo = path.joinpath(FIXTURE_PROC_CPUINFO).read_text()
+    if path.joinpath(FIXTURE_DMIDECODE).exists():
+        fixture.dmidecode = path.joinpath(FIXTURE_DMIDECODE).read_text()
+    if path.joinpath(FIXTURE_SENSORS).exists():
+        fixture.sensors = json.loads(path.joinpath(FIXTURE_SENSORS).read_text())
+    if path.joinpath(FIXTURE_CPU_CACHE).exists():
+        fixture.cpu_cache = json.loads(path.joinpath(FIXTURE_CPU_CACHE).read_text())
+    if path.joinpath(FIXTURE_SMBIOS_ENTRY_POINT).exists() and path.joinpath(FIXTURE_SMBIOS_TABLE).exists():
+        fixture.smbios_entry_point = path.joinpath(FIXTURE_SMBIOS_ENTRY_POINT).read_bytes()
+        fixture.smbios_table = path.joinpath(FIXTURE_SMBIOS_TABLE).read_bytes()
+    return fixture
+
+
+def load_recorded_fixtures(path: Path = FIXTURES_PATH) -> List[Fixture]:
+    return [load_fixture(fixture_path) for fixture_path in sorted(path.iterdir()) if fixture_path.is_dir()]
+
+
+def write_sys_devices_cpu(fixture: Fixture, root: str) -> None:
+    assert fixture.cpu_cache is not None
+    for cpu_name, cpu in fixture.cpu_cache.items():
+        topology_path = os.path.join(root, cpu_name, 'topology')
+        os.makedirs(topology_path, exist_ok=True)
+        with open(os.path.join(topology_path, 'physical_package_id'), 'w') as file:
+            file.write(f"{cpu['physical_package_id']}\n")
+        for index_name, index in cpu['cache'].items():
+            index_path = os.path.join(root, cpu_name, 'cache', index_name)
+            os.makedirs(index_path, exist_ok=True)
+            for key, value in index.items():
+                with open(os.path.join(index_path, key), 'w') as file:
+                    file.write(f"{value}\n")
+
+
+# Synthetic machines, generated at runtime to cover sizes no recorded fixture has yet.
+# They follow the format of the real files but their content is made up.
+
+_SYNTHETIC_FLAGS = 'fpu vme de pse tsc msr pae mce cx8 apic sep mtrr pge mca cmov pat pse36 clflush mmx fxsr sse ' \
+                   'sse2 ht syscall nx mmxext fxsr_opt pdpe1gb rdtscp lm constant_tsc rep_good nopl nonstop_tsc ' \
+                   'cpuid extd_apicid aperfmperf pni pclmulqdq monitor ssse3 fma cx16 sse4_1 sse4_2 movbe popcnt ' \
+                   'aes xsave avx f16c rdrand lahf_lm cmp_legacy svm extapic cr8_legacy abm sse4a misalignsse ' \
+                   '3dnowprefetch osvw ibs skinit wdt tce topoext perfctr_core perfctr_nb bpext perfctr_llc mwaitx ' \
+                   'cpb cat_l3 cdp_l3 hw_pstate ssbd mba ibrs ibpb stibp vmmcall fsgsbase bmi1 avx2 smep bmi2 ' \
+                   'cqm rdt_a rdseed adx smap clflushopt clwb sha_ni xsaveopt xsavec xgetbv1 xsaves cqm_llc ' \
+                   'cqm_occup_llc cqm_mbm_total cqm_mbm_local clzero irperf xsaveerptr rdpru wbnoinvd arat npt ' \
+                   'lbrv svm_lock nrip_save tsc_scale vmcb_clean flushbyasid decodeassists pausefilter pfthreshold ' \
+                   'avic v_vmsave_vmload vgif umip rdpid overflow_recov succor smca sme sev sev_es'
+_SYNTHETIC_BUGS = 'sysret_ss_attrs spectre_v1 spectre_v2 spec_store_bypass retbleed smt_rsb'
+
+
+def synthesize_proc_cpuinfo(packages: int,
+                            cores: int,
+                            threads_per_core: int,
+                            core_speeds: Optional[List[float]] = None) -> str:
+    blocks = []
+    siblings = cores * threads_per_core
+    for thread in range(threads_per_core):
+        for package in range(packages):
+            for core in range(cores):
+                processor_id = (thread * packages + package) * cores + core
+                core_speed = core_speeds[processor_id] if core_speeds else 1500 + 13.7 * processor_id % 1900
+                blocks.append(
+                    f"processor\t: {processor_id}\n"
+                    "vendor_id\t: AuthenticAMD\n"
+                    "cpu family\t: 23\n"
+                    "model\t\t: 49\n"
+                    "model name\t: AMD EPYC 7742 64-Core Processor\n"
+                    "stepping\t: 0\n"
+                    "microcode\t: 0x830104d\n"
+                    f"cpu MHz\t\t: {core_speed:.3f}\n"
+                    "cache size\t: 512 KB\n"
+                    f"physical id\t: {package}\n"
+                    f"siblings\t: {siblings}\n"
+                    f"core id\t\t: {core}\n"
+                    f"cpu cores\t: {cores}\n"
+                    f"apicid\t\t: {(package * cores + core) * threads_per_core + thread}\n"
+                    "fpu\t\t: yes\n"
+                    "fpu_exception\t: yes\n"
+                    "cpuid level\t: 16\n"
+                    "wp\t\t: yes\n"
+                    f"flags\t\t: {_SYNTHETIC_FLAGS}\n"
+                    f"bugs\t\t: {_SYNTHETIC_BUGS}\n"
+                    "bogomips\t: 4491.55\n"
+                    "TLB size\t: 3072 4K pages\n"
+                    "clflush size\t: 64\n"
+                    "cache_alignment\t: 64\n"
+                    "address sizes\t: 43 bits physical, 48 bits virtual\n"
+                    "power management: ts ttp tm hwpstate cpb eff_freq_ro [13] [14]\n")
+    return '\n'.join(blocks)
+
+
+def synthesize_cpu_cache(packages: int, cores: int, threads_per_core: int) -> Dict[str, Any]:
+    cpu_cache: Dict[str, Any] = {}
+    for thread in range(threads_per_core):
+        for package in range(packages):
+            for core in range(cores):
+                processor_id = (thread * packages + package) * cores + core
+                core_index = package * cores + core
+                cpu_cache[f"cpu{processor_id}"] = {
+                    'physical_package_id': package,
+                    'cache': {
+                        'index0': dict(zip(CACHE_INFO_FILES, [core_index, 1, 64, '32K', 'Data', 8])),
+                        'index1': dict(zip(CACHE_INFO_FILES, [core_index, 1, 64, '32K', 'Instruction', 8])),
+                        'index2': dict(zip(CACHE_INFO_FILES, [core_index, 2, 1024, '512K', 'Unified', 8])),
+                        'index3': dict(zip(CACHE_INFO_FILES, [core_index // 4, 3, 16384, '16384K', 'Unified', 16])),
+                    }
+                }
+    return cpu_cache
+
+
+def _synthesize_dmidecode(packages: int, cores: int, threads_per_core: int, dimms: int) -> str:
+    records = ['# dmidecode 3.3\nGetting SMBIOS data from sysfs.\nSMBIOS 3.2.0 present.\n']
+    handle = 0
+
+    def add(dmi_type: int, size: int, lines: List[str]) -> None:
+        nonlocal handle
+        records.append(f"Handle 0x{handle:04X}, DMI type {dmi_type}, {size} bytes\n" + '\n'.join(lines) + '\n')
+        handle += 1
+
+    add(0, 26, ['BIOS Information', '\tVendor: American Megatrends Inc.', '\tVersion: 2.1',
+                '\tRelease Date: 02/21/2020', '\tROM Size: 32 MB', '\tCharacteristics:',
+                '\t\tPCI is supported', '\t\tBIOS is upgradeable', '\t\tBIOS shadowing is allowed',
+                '\t\tBoot from CD is supported', '\t\tSelectable boot is supported',
+                '\t\tACPI is supported', '\t\tUSB legacy is supported', '\t\tUEFI is supported',
+                '\tBIOS Revision: 5.14'])
+    add(1, 27, ['System Information', '\tManufacturer: Supermicro', '\tProduct Name: AS -2023US-TR4',
+                '\tVersion: 0123456789', '\tSerial Number: 0123456789', '\tWake-up Type: Power Switch',
+                '\tFamily: Server'])
+    add(2, 15, ['Base Board Information', '\tManufacturer: Supermicro', '\tProduct Name: H11DSU-iN',
+                '\tVersion: 1.02A', '\tSerial Number: ZM000000000', '\tFeatures:',
+                '\t\tBoard is a hosting board', '\t\tBoard is replaceable', '\tType: Motherboard'])
+    for package in range(packages):
+        add(4, 48, ['Processor Information', f"\tSocket Designation: CPU{package + 1}",
+                    '\tType: Central Processor', '\tFamily: Zen', '\tManufacturer: Advanced Micro Devices, Inc.',
+                    '\tID: 10 0F 83 00 FF FB 8B 17',
+                    '\tSignature: Family 23, Model 49, Stepping 0', '\tFlags:',
+                    '\t\tFPU (Floating-point unit on-chip)', '\t\tVME (Virtual mode extension)',
+                    '\t\tDE (Debugging extension)', '\t\tPSE (Page size extension)',
+                    '\tVersion: AMD EPYC 7742 64-Core Processor', '\tVoltage: 1.1 V',
+                    '\tExternal Clock: 100 MHz', '\tMax Speed: 3400 MHz', '\tCurrent Speed: 2250 MHz',
+                    '\tStatus: Populated, Enabled', '\tUpgrade: Socket SP3', f"\tCore Count: {cores}",
+                    f"\tCore Enabled: {cores}", f"\tThread Count: {cores * threads_per_core}", '\tCharacteristics:',
+                    '\t\t64-bit capable', '\t\tMulti-Core', '\t\tHardware Thread', '\t\tExecute Protection',
+                    '\t\tEnhanced Virtualization', '\t\tPower/Performance Control'])
+    array_handle = handle
+    add(16, 23, ['Physical Memory Array', '\tLocation: System Board Or Motherboard', '\tUse: System Memory',
+                 '\tError Correction Type: Multi-bit ECC', '\tMaximum Capacity: 4 TB',
+                 '\tError Information Handle: Not Provided', f"\tNumber Of Devices: {dimms}"])
+    dimms_per_package = max(1, dimms // packages)
+    for dimm in range(dimms):
+        package, slot = divmod(dimm, dimms_per_package)
+        populated = dimm % 4 != 3
+        add(17, 84, ['Memory Device', f"\tArray Handle: 0x{array_handle:04X}",
+                     '\tError Information Handle: Not Provided', '\tTotal Width: 72 bits',
+                     '\tData Width: 64 bits',
+                     '\tSize: 32 GB' if populated else '\tSize: No Module Installed',
+                     '\tForm Factor: DIMM', '\tSet: None',
+                     f"\tLocator: P{package + 1}-DIMM{chr(ord('A') + slot // 2)}{slot % 2 + 1}",
+                     f"\tBank Locator: P{package}_Node0_Channel{slot // 2}_Dimm{slot % 2}",
+                     '\tType: DDR4', '\tType Detail: Synchronous Registered (Buffered)',
+                     '\tSpeed: 3200 MT/s' if populated else '\tSpeed: Unknown',
+                     '\tManufacturer: Samsung' if populated else '\tManufacturer: NO DIMM',
+                     '\tSerial Number: 00000000', '\tAsset Tag: Not Specified',
+                     '\tPart Number: M393A4K40DB3-CWE' if populated else '\tPart Number: NO DIMM',
+                     '\tRank: 2' if populated else '\tRank: Unknown',
+                     '\tConfigured Memory Speed: 3200 MT/s' if populated else '\tConfigured Memory Speed: Unknown',
+                     '\tMinimum Voltage: 1.2 V', '\tMaximum Voltage: 1.2 V', '\tConfigured Voltage: 1.2 V'])
+    records.append('Handle 0xFFFF, DMI type 127, 4 bytes\nEnd Of Table\n')
+    return '\n'.join(records)
+
+
+def _synthesize_smbios(packages: int, cores: int, threads_per_core: int, dimms: int) -> Tuple[bytes, bytes]:
+    # the same machine as _synthesize_dmidecode, as the kernel exports it in /sys/firmware/dmi/tables
+    structures: List[bytes] = []
+
+    def add(dmi_type: int, formatted: bytes, strings: List[str]) -> int:
+        handle = len(structures)
+        header = struct.pack('<BBH', dmi_type, 4 + len(formatted), handle)
+        strings_area = b''.join(string.encode() + b'\0' for string in strings) if strings else b'\0'
+        structures.append(header + formatted + strings_area + b'\0')
+        return handle
+
+    add(0, struct.pack('<BBHBBQ', 1, 2, 0xF000, 3, 0xFF, 0x08), ['American Megatrends Inc.', '2.1', '02/21/2020'])
+    add(1, struct.pack('<BBBB16sBBB', 1, 2, 3, 4, bytes(16), 6, 0, 5),
+        ['Supermicro', 'AS -2023US-TR4', '0123456789', '0123456789', 'Server'])
+    add(2, struct.pack('<BBBBBBHBB', 1, 2, 3, 4, 0, 0x09, 0, 0x0A, 0), ['Supermicro', 'H11DSU-iN', '1.02A',
+                                                                        'ZM000000000'])
+    for package in range(packages):
+        add(4, struct.pack('<BBBBIIBBHHHBBHHHBBBBBBHHHHH', 1, 3, 0x6B, 2, 0x00830F10, 0x178BFBFF, 3, 0x8B, 100,
+                           3400, 2250, 0x41, 0x37, 0xFFFF, 0xFFFF, 0xFFFF, 0, 0, 0, min(cores, 0xFF),
+                           min(cores, 0xFF), min(cores * threads_per_core, 0xFF), 0xFC, 0x6B, cores, cores,
+                           cores * threads_per_core),
+            [f"CPU{package + 1}", 'Advanced Micro Devices, Inc.', 'AMD EPYC 7742 64-Core Processor'])
+    array_handle = add(16, struct.pack('<BBBIHHQ', 3, 3, 6, 0x80000000, 0xFFFE, dimms, 4 << 40), [])
+    dimms_per_package = max(1, dimms // packages)
+    for dimm in range(dimms):
+        package, slot = divmod(dimm, dimms_per_package)
+        populated = dimm % 4 != 3
+        add(17, struct.pack('<HHHHHBBBBBHHBBBBBIHHHH', array_handle, 0xFFFE, 72, 64, 0x7FFF if populated else 0,
+                            0x09, 0, 1, 2, 0x1A, 0x2080, 3200 if populated else 0, 3, 4, 5, 6,
+                            2 if populated else 0, 32 << 10 if populated else 0, 3200 if populated else 0, 1200, 1200, 1200),
+            [f"P{package + 1}-DIMM{chr(ord('A') + slot // 2)}{slot % 2 + 1}",
+             f"P{package}_Node0_Channel{slot // 2}_Dimm{slot % 2}",
+             'Samsung' if populated else 'NO DIMM', '00000000', 'Not Specified',
+             'M393A4K40DB3-CWE' if populated else 'NO DIMM'])
+    populated_size = 32 * (dimms - dimms // 4) << 20  # kB
+    add(19, struct.pack('<IIHB', 0, populated_size - 1, array_handle, dimms), [])
+    add(127, b'', [])
+    table = b''.join(structures)
+    entry_point = struct.pack('<5sBBBBBBBIQ', b'_SM3_', 0, 0x18, 3, 2, 0, 1, 0, len(table), 0)
+    return entry_point, table
+
+
+def _synthesize_sensors(packages: int, cores: int, fans: int) -> Dict[str, Any]:
+    sensors: Dict[str, Any] = {}
+    for package in range(packages):
+        chip: Dict[str, Any] = {'Adapter': 'PCI adapter',
+                                'Tctl': {'temp1_input': 45.0 + package},
+                                'Tdie': {'temp2_input': 45.0 + package}}
+        for ccd in range(cores // 8):
+            chip[f"Tccd{ccd + 1}"] = {f"temp{ccd + 3}_input": 40.0 + ccd}
+        sensors[f"k10temp-pci-00{0xc3 + package * 8:x}"] = chip
+    super_io: Dict[str, Any] = {'Adapter': 'ISA adapter'}
+    for index in range(16):
+        super_io[f"in{index}"] = {f"in{index}_input": 1.0 + index / 10,
+                                  f"in{index}_min": 0.0,
+                                  f"in{index}_max": 2.0 + index / 10,
+                                  f"in{index}_alarm": 0.0,
+                                  f"in{index}_beep": 0.0}
+    for index in range(1, fans + 1):
+        super_io[f"fan{index}"] = {f"fan{index}_input": 1000.0 + index * 50,
+                                   f"fan{index}_min": 0.0,
+                                   f"fan{index}_alarm": 0.0,
+                                   f"fan{index}_beep": 0.0,
+                                   f"fan{index}_pulses": 2.0}
+    for index in range(1, 7):
+        super_io[f"temp{index}"] = {f"temp{index}_input": 30.0 + index,
+                                    f"temp{index}_max": 80.0,
+                                    f"temp{index}_max_hyst": 75.0,
+                                    f"temp{index}_alarm": 0.0}
+    super_io['intrusion0'] = {'intrusion0_alarm': 1.0, 'intrusion0_beep': 0.0}
+    sensors['nct6779-isa-0290'] = super_io
+    return sensors
+
+
+def synthesize(name: str,
+               description: str,
+               packages: int,
+               cores: int,
+               threads_per_core: int,
+               dimms: int,
+               fans: int) -> Fixture:
+    fixture = Fixture(name, description, True)
+    fixture.proc_cpuinfo = synthesize_proc_cpuinfo(packages, cores, threads_per_core)
+    fixture.cpu_cache = synthesize_cpu_cache(packages, cores, threads_per_core)
+    fixture.dmidecode = _synthesize_dmidecode(packages, cores, threads_per_core, dimms)
+    fixture.smbios_entry_point, fixture.smbios_table = _synthesize_smbios(packages, cores, threads_per_core, dimms)
+    fixture.sensors = _synthesize_sensors(packages, cores, fans)
+    return fixture
+
+
+def get_synthetic_fixtures() -> List[Fixture]:
+    return [
+        synthesize('synthetic-desktop', '1 x 8 cores, 2 threads per core, 4 DIMM slots', 1, 8, 2, 4, 3),
+        synthesize('synthetic-workstation', '1 x 32 cores, 2 threads per core, 8 DIMM slots', 1, 32, 2, 8, 5),
+        synthesize('synthetic-server', '2 x 64 cores, 2 threads per core, 32 DIMM slots', 2, 64, 2, 32, 7),
+        synthesize('synthetic-server-4s', '4 x 24 cores, 2 threads per core, 48 DIMM slots', 4, 24, 2, 48, 7),
+    ]
+
+
+def get_fixtures() -> List[Fixture]:
+    return load_recorded_fixtures() + get_synthetic_fixtures()
@@ -0,0 +1,61 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+# A do-nothing replacement for gi.repository, so that the view code can be benchmarked without a display.
+# Unlike unittest.mock.MagicMock it does not record the calls, which would make every iteration slower
+# and allocate more than the previous one. What is measured is GST's own Python work around the GTK calls.
+import sys
+import types
+from typing import Any, Iterator
+
+
+class GObjectStub:
+    def __getattr__(self, name: str) -> 'GObjectStub':
+        return self
+
+    def __call__(self, *args: Any, **kwargs: Any) -> 'GObjectStub':
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+    def __int__(self) -> int:
+        return 0
+
+    def __index__(self) -> int:
+        return 0
+
+    def __bool__(self) -> bool:
+        return True
+
+
+def install() -> None:
+    if 'gi' in sys.modules:
+        if getattr(sys.modules['gi'], 'IS_STUB', False):
+            return
+        raise RuntimeError("the stub must be installed before gi is imported")
+    gi = types.ModuleType('gi')
+    repository = types.ModuleType('gi.repository')
+    for name in ['GLib', 'Gio', 'Gtk', 'Gdk']:
+        setattr(repository, name, GObjectStub())
+    setattr(gi, 'IS_STUB', True)
+    setattr(gi, 'repository', repository)
+    setattr(gi, 'require_version', lambda *_: None)
+    sys.modules['gi'] = gi
+    sys.modules['gi.repository'] = repository
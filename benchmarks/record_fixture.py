@@ -0,0 +1,190 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+# Records the files used by the benchmarks from the machine this script runs on:
+#
+#   python -m benchmarks.record_fixture my-machine --description "Ryzen 7 3700X, 2 DIMMs"
+#
+# dmidecode and the SMBIOS tables need root, run the script with sudo or pass a saved output with --dmidecode.
+# The serial numbers, asset tags and the system UUID are scrubbed from both, in the same way, and then the
+# script checks that the tables decode to the same values dmidecode printed.
+import argparse
+import datetime
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.bench_dmidecode import check_smbios_matches_dmidecode
+from benchmarks.fixtures import FIXTURES_PATH, FIXTURE_PROC_CPUINFO, FIXTURE_DMIDECODE, FIXTURE_SENSORS, \
+    FIXTURE_CPU_CACHE, FIXTURE_MACHINE, FIXTURE_SMBIOS_ENTRY_POINT, FIXTURE_SMBIOS_TABLE, CACHE_INFO_FILES, \
+    load_fixture
+from gst.util.smbios import SmbiosParseError, iter_structures
+
+_PATH_PROC_CPUINFO = '/proc/cpuinfo'
+_PATH_SYS_CPU = '/sys/devices/system/cpu'
+_PATH_SYS_DMI_TABLES = '/sys/firmware/dmi/tables'
+# the strings that identify the machine: SMBIOS type -> offset of the string index and dmidecode label
+_IDENTIFYING_STRINGS: Dict[int, List[Tuple[int, str]]] = {
+    1: [(0x07, 'Serial Number')],
+    2: [(0x07, 'Serial Number'), (0x08, 'Asset Tag')],
+    3: [(0x07, 'Serial Number'), (0x08, 'Asset Tag')],
+    4: [(0x20, 'Serial Number'), (0x21, 'Asset Tag')],
+    17: [(0x18, 'Serial Number'), (0x19, 'Asset Tag')],
+}
+# left alone: they identify nothing, and the same string is often used by other fields of the structure too
+_PLACEHOLDERS = {'', 'Not Specified', 'To Be Filled By O.E.M.', 'Default string', 'System Serial Number',
+                 'Chassis Serial Number', 'Base Board Serial Number', 'None', 'Unknown', 'N/A'}
+_TYPE_SYSTEM = 1
+_OFFSET_UUID = 0x08
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _record_cpu_cache() -> Dict[str, Any]:
+    cpu_cache: Dict[str, Any] = {}
+    cpu_paths = glob.glob(os.path.join(_PATH_SYS_CPU, 'cpu[0-9]*'))
+    for cpu_path in sorted(cpu_paths, key=lambda path: int(os.path.basename(path)[3:])):
+        indexes: Dict[str, Any] = {}
+        for index_path in sorted(glob.glob(os.path.join(cpu_path, 'cache', 'index[0-9]*'))):
+            indexes[os.path.basename(index_path)] = {
+                key: _read(os.path.join(index_path, key)) for key in CACHE_INFO_FILES
+            }
+        cpu_cache[os.path.basename(cpu_path)] = {
+            'physical_package_id': _read(os.path.join(cpu_path, 'topology', 'physical_package_id')),
+            'cache': indexes,
+        }
+    return cpu_cache
+
+
+def _run(cmd: list) -> Optional[str]:
+    if shutil.which(cmd[0]) is None:
+        print(f"{cmd[0]} not found, skipping", file=sys.stderr)
+        return None
+    process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if process.returncode != 0:
+        print(f"{' '.join(cmd)} failed, skipping: {process.stderr.strip()}", file=sys.stderr)
+        return None
+    return process.stdout
+
+
+def _get_handle_block(dmidecode: str, handle: int) -> Tuple[int, int]:
+    start = dmidecode.find(f"Handle 0x{handle:04X},")
+    if start < 0:
+        return 0, 0
+    end = dmidecode.find('\nHandle ', start)
+    return start, len(dmidecode) if end < 0 else end
+
+
+def _scrub(table: bytes, dmidecode: str) -> Tuple[bytes, str]:
+    # the values are replaced with as many Xs, so that the table keeps its layout
+    scrubbed = bytearray(table)
+    offset = 0
+    for structure in iter_structures(table):
+        length = len(structure.data)
+        block_start, block_end = _get_handle_block(dmidecode, structure.handle)
+        block = dmidecode[block_start:block_end]
+        for string_offset, label in _IDENTIFYING_STRINGS.get(structure.dmi_type, []):
+            if not structure.has(string_offset):
+                continue
+            index = structure.data[string_offset]
+            if not 1 <= index <= len(structure.strings) or structure.strings[index - 1].strip() in _PLACEHOLDERS:
+                continue
+            string = structure.strings[index - 1]
+            value = string.strip()
+            string_start = offset + length + sum(len(previous) + 1 for previous in structure.strings[:index - 1])
+            scrubbed_string = string.replace(value, 'X' * len(value))
+            scrubbed[string_start:string_start + len(string)] = scrubbed_string.encode('latin-1')
+            block = block.replace(f"\t{label}: {value}\n", f"\t{label}: {'X' * len(value)}\n")
+        if structure.dmi_type == _TYPE_SYSTEM and structure.has(_OFFSET_UUID, 16):
+            # dmidecode prints an all zero UUID as Not Settable
+            scrubbed[offset + _OFFSET_UUID:offset + _OFFSET_UUID + 16] = bytes(16)
+            lines = ['\tUUID: Not Settable' if line.startswith('\tUUID: ') else line for line in block.split('\n')]
+            block = '\n'.join(lines)
+        dmidecode = dmidecode[:block_start] + block + dmidecode[block_end:]
+        offset += length + (sum(len(string) + 1 for string in structure.strings) if structure.strings else 1) + 1
+    return bytes(scrubbed), dmidecode
+
+
+def _record_dmi(path: Path, dmidecode: Optional[str]) -> None:
+    try:
+        with open(os.path.join(_PATH_SYS_DMI_TABLES, FIXTURE_SMBIOS_ENTRY_POINT), 'rb') as file:
+            entry_point: Optional[bytes] = file.read()
+        with open(os.path.join(_PATH_SYS_DMI_TABLES, FIXTURE_SMBIOS_TABLE), 'rb') as file:
+            table: Optional[bytes] = file.read()
+    except OSError as err:
+        print(f"Unable to copy the SMBIOS tables, skipping: {err}", file=sys.stderr)
+        entry_point, table = None, None
+    if table is not None and dmidecode is not None:
+        try:
+            table, dmidecode = _scrub(table, dmidecode)
+        except SmbiosParseError as err:
+            print(f"Unable to scrub the SMBIOS tables, skipping them: {err}", file=sys.stderr)
+            entry_point, table = None, None
+    elif table is not None:
+        # without the dmidecode output to compare with, the tables are of no use to the benchmarks
+        print("No dmidecode output to scrub in the same way, skipping the SMBIOS tables", file=sys.stderr)
+        entry_point, table = None, None
+    if dmidecode is not None:
+        path.joinpath(FIXTURE_DMIDECODE).write_text(dmidecode)
+    if entry_point is not None and table is not None:
+        path.joinpath(FIXTURE_SMBIOS_ENTRY_POINT).write_bytes(entry_point)
+        path.joinpath(FIXTURE_SMBIOS_TABLE).write_bytes(table)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Record a benchmark fixture from this machine")
+    parser.add_argument('name', help="name of the fixture directory")
+    parser.add_argument('--description', default='', help="short description of the hardware")
+    parser.add_argument('--dmidecode', help="file with a saved dmidecode output, instead of running dmidecode")
+    parser.add_argument('--output', default=str(FIXTURES_PATH), help="directory containing the fixtures")
+    args = parser.parse_args()
+
+    path = Path(args.output).joinpath(args.name)
+    path.mkdir(parents=True, exist_ok=True)
+
+    proc_cpuinfo = _read(_PATH_PROC_CPUINFO)
+    if proc_cpuinfo is not None:
+        path.joinpath(FIXTURE_PROC_CPUINFO).write_text(proc_cpuinfo + '\n')
+    path.joinpath(FIXTURE_CPU_CACHE).write_text(json.dumps(_record_cpu_cache(), indent=1) + '\n')
+    _record_dmi(path, Path(args.dmidecode).read_text() if args.dmidecode else _run(['dmidecode']))
+    sensors = _run(['sensors', '-j'])
+    if sensors is not None:
+        path.joinpath(FIXTURE_SENSORS).write_text(json.dumps(json.loads(sensors), indent=1) + '\n')
+    path.joinpath(FIXTURE_MACHINE).write_text(json.dumps({
+        'description': args.description,
+        'recorded': datetime.date.today().isoformat(),
+    }, indent=1) + '\n')
+    mismatches = check_smbios_matches_dmidecode(load_fixture(path))
+    if mismatches:
+        print("The SMBIOS tables and the dmidecode output disagree, please report it:\n" + '\n'.join(mismatches),
+              file=sys.stderr)
+    print(f"Fixture recorded in {path}. Check the files for serial numbers before committing them.")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
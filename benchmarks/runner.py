@@ -0,0 +1,127 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import gc
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+from benchmarks.fixtures import Fixture
+
+_MIN_SAMPLE_SECONDS = 0.05
+
+
+class Case:
+    def __init__(self, run: Callable[[], Any], items: int) -> None:
+        self.run = run
+        # number of items (processors, DMI records, sensors...) processed by one run, used for the throughput
+        self.items = items
+
+
+# A setup receives a fixture and yields the Case to measure, or None when the fixture lacks the data it needs.
+# Everything the case patches must be restored when the context exits.
+Setup = Callable[[Fixture], ContextManager[Optional[Case]]]
+
+
+class Benchmark:
+    def __init__(self, name: str, unit: str, setup: Setup) -> None:
+        self.name = name
+        self.unit = unit
+        self.setup = setup
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, unit: str) -> Callable[[Callable[[Fixture], Iterator[Optional[Case]]]], Setup]:
+    def decorator(function: Callable[[Fixture], Iterator[Optional[Case]]]) -> Setup:
+        setup = contextmanager(function)
+        BENCHMARKS.append(Benchmark(name, unit, setup))
+        return setup
+
+    return decorator
+
+
+def _get_iterations(run: Callable[[], Any]) -> int:
+    # same idea as timeit.Timer.autorange()
+    iterations = 1
+    while True:
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        if time.perf_counter() - start_time >= _MIN_SAMPLE_SECONDS:
+            return iterations
+        iterations *= 2
+
+
+def _measure_allocations(run: Callable[[], Any]) -> Dict[str, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    statistics_diff = after.compare_to(before, 'filename')
+    return {
+        'peak_bytes': peak - baseline,
+        'allocated_blocks': sum(stat.count_diff for stat in statistics_diff if stat.count_diff > 0),
+        'retained_bytes': sum(stat.size_diff for stat in statistics_diff),
+    }
+
+
+def run_benchmark(benchmark_: Benchmark, fixture: Fixture, repeat: int) -> Optional[Dict[str, Any]]:
+    with benchmark_.setup(fixture) as case:
+        if case is None:
+            return None
+        case.run()  # warm up caches and lazy imports
+        iterations = _get_iterations(case.run)
+        timings = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                for _ in range(iterations):
+                    case.run()
+                timings.append((time.perf_counter() - start_time) / iterations)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        allocations = _measure_allocations(case.run)
+    median = statistics.median(timings)
+    result: Dict[str, Any] = {
+        'benchmark': benchmark_.name,
+        'fixture': fixture.name,
+        'synthetic': fixture.synthetic,
+        'unit': benchmark_.unit,
+        'items': case.items,
+        'iterations': iterations,
+        'repeat': repeat,
+        'min_seconds': min(timings),
+        'median_seconds': median,
+        'mean_seconds': statistics.mean(timings),
+        'stdev_seconds': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'items_per_second': case.items / median if median else None,
+    }
+    result.update(allocations)
+    return result
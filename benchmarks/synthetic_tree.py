@@ -0,0 +1,173 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+# Builds a fake procfs/sysfs tree for an arbitrary machine shape and optionally keeps its values changing,
+# to test and profile GST on hardware we do not have:
+#
+#   python -m benchmarks.synthetic_tree /tmp/epyc --sockets 4 --dies 2 --cores 64 --threads 2 \
+#       --hwmon-sensors 300 --update-interval 1
+#   GST_PROC_ROOT=/tmp/epyc/proc GST_SYS_ROOT=/tmp/epyc/sys python -m gst
+#
+# Only the files GST reads are generated. With a different sys root the sensors are read from
+# <root>/sys/class/hwmon instead of libsensors.
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from benchmarks.fixtures import Fixture, synthesize_proc_cpuinfo, synthesize_cpu_cache, write_sys_devices_cpu
+
+# (file name, label, initial value in sysfs units, maximum random change per update)
+_SENSOR_KINDS: List[Tuple[str, str, int, int]] = [
+    ('temp', 'Temp', 45000, 1500),
+    ('in', 'Voltage', 1200, 15),
+    ('fan', 'Fan', 1200, 40),
+    ('power', 'Power', 95000000, 5000000),
+    ('curr', 'Current', 12000, 800),
+]
+_SENSORS_PER_CHIP = 32
+_MEM_TOTAL_KIB = 256 * 1024 * 1024
+
+
+class SyntheticTree:
+    def __init__(self, root: str, sockets: int, dies: int, cores: int, threads: int, hwmon_sensors: int) -> None:
+        self.proc_root = os.path.join(root, 'proc')
+        self.sys_root = os.path.join(root, 'sys')
+        self.packages = sockets
+        # the die only matters for the L3 sharing, GST sees a package with dies * cores cores
+        self.cores_per_package = dies * cores
+        self.threads = threads
+        self.processor_count = sockets * dies * cores * threads
+        self._random = random.Random(0)
+        self._core_speeds = [2000.0] * self.processor_count
+        self._cpu_times = [[0] * 10 for _ in range(self.processor_count)]
+        self._sensors: Dict[str, int] = {}  # path -> value
+        self._sensor_steps: Dict[str, int] = {}
+        self._hwmon_sensors = hwmon_sensors
+
+    def create(self) -> None:
+        os.makedirs(self.proc_root, exist_ok=True)
+        cpu_path = os.path.join(self.sys_root, 'devices', 'system', 'cpu')
+        fixture = Fixture('synthetic-tree', '', True)
+        fixture.cpu_cache = synthesize_cpu_cache(self.packages, self.cores_per_package, self.threads)
+        write_sys_devices_cpu(fixture, cpu_path)
+        self._write(os.path.join(cpu_path, 'online'), f"0-{self.processor_count - 1}")
+        self._write(os.path.join(cpu_path, 'possible'), f"0-{self.processor_count - 1}")
+        dmi_path = os.path.join(self.sys_root, 'devices', 'virtual', 'dmi', 'id')
+        for name, value in {'bios_date': '01/01/2024', 'bios_vendor': 'Synthetic BIOS', 'bios_version': '1.0',
+                            'board_name': f"Synthetic {self.packages}S {self.processor_count}T",
+                            'board_vendor': 'GST', 'board_version': '1.0'}.items():
+            self._write(os.path.join(dmi_path, name), value)
+        self._create_hwmon()
+        self.update()
+
+    def _create_hwmon(self) -> None:
+        hwmon_path = os.path.join(self.sys_root, 'class', 'hwmon')
+        numbers: Dict[str, int] = {}
+        for index in range(self._hwmon_sensors):
+            chip_path = os.path.join(hwmon_path, f"hwmon{index // _SENSORS_PER_CHIP}")
+            if index % _SENSORS_PER_CHIP == 0:
+                self._write(os.path.join(chip_path, 'name'), f"synthetic{index // _SENSORS_PER_CHIP}")
+                numbers = {}
+            kind, label, value, step = _SENSOR_KINDS[index % len(_SENSOR_KINDS)]
+            # voltages are numbered from 0, everything else from 1
+            number = numbers[kind] = numbers[kind] + 1 if kind in numbers else (0 if kind == 'in' else 1)
+            self._write(os.path.join(chip_path, f"{kind}{number}_label"), f"{label} {number}")
+            path = os.path.join(chip_path, f"{kind}{number}_input")
+            self._sensors[path] = value
+            self._sensor_steps[path] = step
+
+    def update(self) -> None:
+        for path, value in self._sensors.items():
+            step = self._sensor_steps[path]
+            value = max(0, value + self._random.randint(-step, step))
+            self._sensors[path] = value
+            self._write(path, str(value))
+        self._core_speeds = [min(4500.0, max(1500.0, speed + self._random.uniform(-200, 200)))
+                             for speed in self._core_speeds]
+        self._write(os.path.join(self.proc_root, 'cpuinfo'),
+                    synthesize_proc_cpuinfo(self.packages, self.cores_per_package, self.threads, self._core_speeds))
+        self._write(os.path.join(self.proc_root, 'stat'), self._get_proc_stat())
+        mem_available = self._random.randint(_MEM_TOTAL_KIB // 4, _MEM_TOTAL_KIB // 2)
+        self._write(os.path.join(self.proc_root, 'meminfo'),
+                    f"MemTotal:       {_MEM_TOTAL_KIB} kB\n"
+                    f"MemFree:        {mem_available // 2} kB\n"
+                    f"MemAvailable:   {mem_available} kB\n"
+                    f"Buffers:        {_MEM_TOTAL_KIB // 100} kB\n"
+                    f"Cached:         {mem_available // 3} kB\n"
+                    "SwapCached:            0 kB\n"
+                    f"Active:         {_MEM_TOTAL_KIB // 3} kB\n"
+                    f"Inactive:       {_MEM_TOTAL_KIB // 6} kB\n"
+                    "SwapTotal:             0 kB\n"
+                    "SwapFree:              0 kB\n"
+                    f"Shmem:          {_MEM_TOTAL_KIB // 200} kB\n"
+                    f"SReclaimable:   {_MEM_TOTAL_KIB // 100} kB\n")
+
+    def _get_proc_stat(self) -> str:
+        # user nice system idle iowait irq softirq steal guest guest_nice, in USER_HZ
+        for cpu_times in self._cpu_times:
+            busy = self._random.randint(0, 100)
+            cpu_times[0] += busy
+            cpu_times[2] += busy // 10
+            cpu_times[3] += 100 - busy
+        total = [sum(column) for column in zip(*self._cpu_times)]
+        lines = ['cpu  ' + ' '.join(map(str, total))]
+        lines += [f"cpu{index} " + ' '.join(map(str, cpu_times)) for index, cpu_times in enumerate(self._cpu_times)]
+        lines += ['intr 0', 'ctxt 0', f"btime {int(time.time()) - 3600}", 'processes 1', 'procs_running 1',
+                  'procs_blocked 0', 'softirq 0']
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        # written aside and renamed, so that GST never reads a half written file
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            file.write(content if content.endswith('\n') else content + '\n')
+        os.replace(tmp_path, path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.synthetic_tree',
+                                     description="Create a fake procfs/sysfs tree for the given machine shape")
+    parser.add_argument('root', help="directory where proc/ and sys/ are created")
+    parser.add_argument('--sockets', type=int, default=1)
+    parser.add_argument('--dies', type=int, default=1, help="dies per socket")
+    parser.add_argument('--cores', type=int, default=8, help="cores per die")
+    parser.add_argument('--threads', type=int, default=2, help="threads per core")
+    parser.add_argument('--hwmon-sensors', type=int, default=20, help="total number of hwmon sensors")
+    parser.add_argument('--update-interval', type=float, default=0,
+                        help="keep changing the values every this many seconds, 0 to write them once")
+    args = parser.parse_args()
+
+    tree = SyntheticTree(args.root, args.sockets, args.dies, args.cores, args.threads, args.hwmon_sensors)
+    tree.create()
+    print(f"{tree.processor_count} processors, {args.hwmon_sensors} sensors\n"
+          f"GST_PROC_ROOT={tree.proc_root} GST_SYS_ROOT={tree.sys_root} python -m gst")
+    if args.update_interval > 0:
+        try:
+            while True:
+                time.sleep(args.update_interval)
+                tree.update()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
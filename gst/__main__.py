@@ -16,20 +16,37 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import sys
+
+from gst.util.startup_profiler import PROFILE_STARTUP_OPTION, enable_startup_profiler, mark_startup_phase
+
+# the profiler has to be enabled before the rest of the app graph is imported
+if f"--{PROFILE_STARTUP_OPTION}" in sys.argv:
+    enable_startup_profiler()
+
+# pylint: disable=wrong-import-position,wrong-import-order
 import signal
 import locale
 import gettext
 import logging
-import sys
 from types import TracebackType
-from typing import Type
+from typing import List, Type
 from os.path import abspath, join, dirname
-from peewee import SqliteDatabase
+from peewee import Model, SqliteDatabase
+from playhouse.migrate import SqliteMigrator, migrate
 from gi.repository import GLib
 from reactivex.disposable import CompositeDisposable
 
 from gst.conf import APP_PACKAGE_NAME
+from gst.interactor.settings_interactor import SettingsInteractor
+from gst.model.core_score_record import CoreScoreRecord
+from gst.model.sample import Sample
+from gst.model.sample_summary import SampleSummary
 from gst.model.setting import Setting
+from gst.model.stress_tests_record import StressTestsRecord
+from gst.model.stressor_record import StressorRecord
+from gst.repository.history_repository import HistoryRepository
+from gst.repository.privileged_helper_repository import PrivilegedHelperRepository
 from gst.repository.stress_ng_repository import StressNgRepository
 from gst.util.log import set_log_level
 from gst.di import INJECTOR
@@ -49,12 +66,17 @@ locale.bindtextdomain(APP_PACKAGE_NAME, LOCALE_DIR)
 gettext.bindtextdomain(APP_PACKAGE_NAME, LOCALE_DIR)
 gettext.textdomain(APP_PACKAGE_NAME)
 
+mark_startup_phase("imports")
+
 
 def _cleanup() -> None:
     try:
         _LOG.debug("cleanup")
         INJECTOR.get(StressNgRepository).terminate()
+        INJECTOR.get(PrivilegedHelperRepository).stop()
         INJECTOR.get(CompositeDisposable).dispose()
+        INJECTOR.get(SettingsInteractor).flush()
+        INJECTOR.get(HistoryRepository).close()
         INJECTOR.get(SqliteDatabase).close()
         # futures.thread._threads_queues.clear()
     except:
@@ -76,15 +98,39 @@ sys.excepthook = handle_exception
 
 def _init_database() -> None:
     database = INJECTOR.get(SqliteDatabase)
-    database.create_tables([
-        Setting
-    ])
+    models = [
+        Setting,
+        Sample,
+        SampleSummary,
+        StressTestsRecord,
+        StressorRecord,
+        CoreScoreRecord,
+    ]
+    database.create_tables(models)
+    _add_missing_columns(database, models)
+
+
+def _add_missing_columns(database: SqliteDatabase, models: List[Model]) -> None:
+    # create_tables() leaves alone the tables created by an older version, new nullable fields are added here
+    migrator = SqliteMigrator(database)
+    operations = []
+    for model in models:
+        table_name = model._meta.table_name  # pylint: disable=protected-access
+        columns = {column.name for column in database.get_columns(table_name)}
+        for field in model._meta.sorted_fields:  # pylint: disable=protected-access
+            if field.column_name not in columns:
+                _LOG.info(f"Adding column {field.column_name} to {table_name}")
+                operations.append(migrator.add_column(table_name, field.column_name, field))
+    if operations:
+        migrate(*operations)
 
 
 def main() -> int:
     _LOG.debug("main")
     _init_database()
+    mark_startup_phase("database")
     application: Application = INJECTOR.get(Application)
+    mark_startup_phase("dependency injection")
     GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGINT, application.quit)
     exit_status = application.run(sys.argv)
     _cleanup()
@@ -29,6 +29,8 @@ from gst.presenter.main_presenter import MainPresenter
 from gst.util.deployment import is_flatpak
 from gst.util.desktop_entry import set_autostart_entry, add_application_entry
 from gst.util.log import LOG_DEBUG_FORMAT
+from gst.util.startup_profiler import PROFILE_STARTUP_OPTION, is_startup_profiler_enabled, mark_startup_phase, \
+    print_startup_report
 from gst.util.view import build_glib_option
 from gst.view.main_view import MainView
 
@@ -64,14 +66,28 @@ class Application(Gtk.Application):
             self._window.set_application(self)
             self._window.show_all()
             self._view.show()
+            if is_startup_profiler_enabled():
+                mark_startup_phase("window")
+                GLib.idle_add(self._on_startup_profiler_idle, priority=GLib.PRIORITY_DEFAULT_IDLE)
         self._window.present()
         if self._start_hidden:
             self._window.hide()
             self._start_hidden = False
 
+    @staticmethod
+    def _on_startup_profiler_idle() -> bool:
+        # default idle priority runs after the first redraw, so this measures the first paint of the window
+        mark_startup_phase("first paint")
+        print_startup_report()
+        return False  # GLib.SOURCE_REMOVE
+
     def do_startup(self) -> None:
         Gtk.Application.do_startup(self)
 
+    def do_shutdown(self) -> None:
+        self._presenter.on_shutdown()
+        Gtk.Application.do_shutdown(self)
+
     def do_command_line(self, command_line: Gio.ApplicationCommandLine) -> int:
 
         start_app = True
@@ -105,6 +121,10 @@ class Application(Gtk.Application):
             set_autostart_entry(True)
             start_app = False
 
+        if _Options.PROFILE_STARTUP.value in options:
+            # the profiler itself is enabled in gst.__main__, before the app graph is imported
+            _LOG.debug(f"Option {_Options.PROFILE_STARTUP.value} selected")
+
         if _Options.CTRL_DISPLAY.value in options:
             param = options[_Options.CTRL_DISPLAY.value]
             _LOG.debug(f"Option {_Options.CTRL_DISPLAY.value} selected: {param}")
@@ -124,6 +144,8 @@ class Application(Gtk.Application):
                               description="Show the App version"),
             build_glib_option(_Options.HIDE_WINDOW.value,
                               description="Start with the main window hidden"),
+            build_glib_option(_Options.PROFILE_STARTUP.value,
+                              description="Print a per-phase and per-import breakdown of the startup time"),
             build_glib_option(_Options.CTRL_DISPLAY.value,
                               arg=GLib.OptionArg.STRING,
                               description="Specify the NV-CONTROL display (if you use Bumblebee, set this to \":8\" "
@@ -142,5 +164,6 @@ class _Options(Enum):
     VERSION = 'version'
     HIDE_WINDOW = 'hide-window'
     CTRL_DISPLAY = 'ctrl-display'
+    PROFILE_STARTUP = PROFILE_STARTUP_OPTION
     AUTOSTART_ON = 'autostart-on'
     AUTOSTART_OFF = 'autostart-off'
@@ -34,6 +34,14 @@ APP_AUTHOR_EMAIL = 'roberto@leinardi.com'
 SETTINGS_DEFAULTS: Dict[str, Any] = {
     'settings_check_new_version': False,
     'settings_refresh_interval': 2,
+    'settings_worker_threads': 4,
+    'settings_self_usage_budget': 5,
+    'settings_benchmark_runs': 1,
+    'settings_benchmark_cool_down': 10,  # seconds
+    'settings_benchmark_noise_threshold': 5,  # percentage of all the cores
+    'settings_benchmark_settle_timeout': 30,  # seconds
+    'settings_core_sweep_budget': 120,  # seconds
+    'settings_benchmark_baseline': '',  # timestamp of the StressTestsRecord the other runs are compared to
 }
 
 DESKTOP_ENTRY: Dict[str, str] = {
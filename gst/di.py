@@ -16,15 +16,18 @@
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
-from typing import NewType
+import os
+from typing import NewType, List
+from xml.etree import ElementTree
 
-from gi.repository import Gtk
+from gi.repository import Gtk, Gio
 from injector import Module, provider, singleton, Injector
 from peewee import SqliteDatabase
 from reactivex.disposable import CompositeDisposable
 from reactivex.subject import Subject
 
 from gst.conf import APP_PACKAGE_NAME, APP_MAIN_UI_NAME, APP_DB_NAME, APP_PREFERENCES_UI_NAME
+from gst.repository import PATH_PROC, PATH_SYS, ENV_PROC_ROOT, ENV_SYS_ROOT
 from gst.util.path import get_config_path
 
 _LOG = logging.getLogger(__name__)
@@ -34,8 +37,33 @@ EditFanProfileBuilder = NewType('EditFanProfileBuilder', Gtk.Builder)
 EditOverclockProfileBuilder = NewType('EditOverclockProfileBuilder', Gtk.Builder)
 HistoricalDataBuilder = NewType('HistoricalDataBuilder', Gtk.Builder)
 PreferencesBuilder = NewType('PreferencesBuilder', Gtk.Builder)
+SettingChangedSubject = NewType('SettingChangedSubject', Subject)
+StressNgProgressSubject = NewType('StressNgProgressSubject', Subject)
+ProcRoot = NewType('ProcRoot', str)
+SysRoot = NewType('SysRoot', str)
 
 _UI_RESOURCE_PATH = "/com/leinardi/gst/ui/{}"
+_DATABASE_PRAGMAS = {
+    'journal_mode': 'wal',  # readers on the UI thread are not blocked by the history writer
+    'synchronous': 'normal',  # safe with WAL, only the last transactions can be lost on power failure
+    'cache_size': -8 * 1024,  # KiB
+    'mmap_size': 64 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+# top level objects of the main UI that are only built the first time they are shown
+MAIN_BUILDER_LAZY_OBJECT_IDS = ['about_dialog', 'benchmark_history_dialog', 'core_sweep_dialog', 'cpu_bugs_dialog',
+                                'cpu_flags_dialog', 'diagnostics_dialog']
+
+
+def add_main_builder_objects(builder: MainBuilder, object_ids: List[str]) -> None:
+    _LOG.debug(f"add {object_ids} to Gtk.Builder")
+    builder.add_objects_from_resource(_UI_RESOURCE_PATH.format(APP_MAIN_UI_NAME), object_ids)
+
+
+def _get_top_level_object_ids(ui_name: str) -> List[str]:
+    data = Gio.resources_lookup_data(_UI_RESOURCE_PATH.format(ui_name), Gio.ResourceLookupFlags.NONE).get_data()
+    object_ids = (element.get('id') for element in ElementTree.fromstring(data).findall('object'))
+    return [object_id for object_id in object_ids if object_id is not None]
 
 
 # pylint: disable=no-self-use
@@ -46,7 +74,8 @@ class ProviderModule(Module):
         _LOG.debug("provide Gtk.Builder")
         builder = MainBuilder(Gtk.Builder())
         builder.set_translation_domain(APP_PACKAGE_NAME)
-        builder.add_from_resource(_UI_RESOURCE_PATH.format(APP_MAIN_UI_NAME))
+        add_main_builder_objects(builder, [object_id for object_id in _get_top_level_object_ids(APP_MAIN_UI_NAME)
+                                           if object_id not in MAIN_BUILDER_LAZY_OBJECT_IDS])
         return builder
 
     @singleton
@@ -64,11 +93,37 @@ class ProviderModule(Module):
         _LOG.debug("provide CompositeDisposable")
         return CompositeDisposable()
 
+    @singleton
+    @provider
+    def provide_setting_changed_subject(self) -> SettingChangedSubject:
+        _LOG.debug("provide SettingChangedSubject")
+        return SettingChangedSubject(Subject())
+
+    @singleton
+    @provider
+    def provide_stress_ng_progress_subject(self) -> StressNgProgressSubject:
+        _LOG.debug("provide StressNgProgressSubject")
+        return StressNgProgressSubject(Subject())
+
+    @singleton
+    @provider
+    def provide_proc_root(self) -> ProcRoot:
+        proc_root = os.environ.get(ENV_PROC_ROOT, PATH_PROC)
+        _LOG.debug(f"provide ProcRoot {proc_root}")
+        return ProcRoot(proc_root)
+
+    @singleton
+    @provider
+    def provide_sys_root(self) -> SysRoot:
+        sys_root = os.environ.get(ENV_SYS_ROOT, PATH_SYS)
+        _LOG.debug(f"provide SysRoot {sys_root}")
+        return SysRoot(sys_root)
+
     @singleton
     @provider
     def provide_database(self) -> SqliteDatabase:
         _LOG.debug("provide SqliteDatabase")
-        database = SqliteDatabase(get_config_path(APP_DB_NAME))
+        database = SqliteDatabase(get_config_path(APP_DB_NAME), pragmas=_DATABASE_PRAGMAS)
         database.connect()
         return database
 
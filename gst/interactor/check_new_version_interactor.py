@@ -17,16 +17,17 @@
 
 import json
 import logging
-from packaging.version import Version
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-import requests
 import reactivex
 from injector import singleton, inject
 from reactivex import Observable
 
 from gst.conf import APP_ID, APP_VERSION
 
+if TYPE_CHECKING:
+    from packaging.version import Version
+
 _LOG = logging.getLogger(__name__)
 
 
@@ -41,7 +42,9 @@ class CheckNewVersionInteractor:
     def execute(self) -> Observable:
         return reactivex.defer(lambda _: reactivex.just(self._check_new_version()))
 
-    def _check_new_version(self) -> Optional[Version]:
+    def _check_new_version(self) -> Optional['Version']:
+        import requests  # pylint: disable=import-outside-toplevel
+        from packaging.version import Version  # pylint: disable=import-outside-toplevel
         req = requests.get(self.URL_PATTERN.format(package=APP_ID))
         version = Version("0")
         if req.status_code == requests.codes.ok:
@@ -46,7 +46,14 @@ class GetStressorsInteractor:
                                  '--bsearch {0} --bsearch-size 1000000 '
                                  '--lsearch {0} --lsearch-size 4950 '
                                  '--qsort {0} --qsort-size 126000 '
-                                 '--sequential 0 '
+                                 '--sequential 0 ',
+        # the single core benchmark, pinned to every core in turn
+        'benchmark-core-sweep': '--cpu {0} --cpu-method ackermann '
+                                '--matrix {0} --matrix-size 375 --matrix-method prod '
+                                '--bsearch {0} --bsearch-size 1000000 '
+                                '--lsearch {0} --lsearch-size 4950 '
+                                '--qsort {0} --qsort-size 126000 '
+                                '--sequential 0 ',
     }
 
     @inject
@@ -55,3 +62,6 @@ class GetStressorsInteractor:
 
     def get(self, stressor_id: str) -> str:
         return self._stressors_dict[stressor_id]
+
+    def get_benchmark_timeout(self) -> int:
+        return int(self._benchmark_timeout)
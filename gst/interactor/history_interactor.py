@@ -0,0 +1,168 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import time
+from typing import Dict, List, Optional
+
+import reactivex
+from injector import singleton, inject
+from reactivex import Observable
+
+from gst.model.hardware_fingerprint import HardwareFingerprint
+from gst.model.stress_tests_comparison import COMPARABLE_FIELDS, StressTestsComparison, StressorComparison
+from gst.model.stress_tests_record import StressTestsRecord
+from gst.model.stress_tests_result import StressTestsResult
+from gst.model.system_info import SystemInfo
+from gst.repository.hardware_fingerprint_repository import HardwareFingerprintRepository
+from gst.repository.history_repository import HistoryRepository, SampleRow
+
+_LOG = logging.getLogger(__name__)
+_SAMPLES_RETENTION_SECONDS = 30 * 24 * 60 * 60
+# older samples are kept only as per minute min, average and max
+_RAW_SAMPLES_RETENTION_SECONDS = 24 * 60 * 60
+_SAMPLES_BUCKET_SECONDS = 60
+
+
+@singleton
+class HistoryInteractor:
+    @inject
+    def __init__(self,
+                 history_repository: HistoryRepository,
+                 hardware_fingerprint_repository: HardwareFingerprintRepository,
+                 ) -> None:
+        self._history_repository = history_repository
+        self._hardware_fingerprint_repository = hardware_fingerprint_repository
+
+    def record_samples(self, system_info: SystemInfo) -> None:
+        timestamp = time.time()
+        rows: List[SampleRow] = []
+        for chip_id, chip in list(system_info.hwmon.hw_monitored_items.items()):
+            for feature_type, feature_type_dict in list(chip.items()):
+                for item_id, item in list(feature_type_dict.items()):
+                    rows.append((timestamp, f"hwmon/{chip_id}/{feature_type.name}/{item_id}", item.value))
+        for physical_package_id, clocks in list(system_info.cpu_info.clock_monitored_items.items()):
+            for core_id, item in list(clocks.items()):
+                rows.append((timestamp, f"clock/{physical_package_id}/{core_id}", item.value))
+        for index, value in enumerate(system_info.cpu_usage.cores):
+            rows.append((timestamp, f"cpu_usage/{index}", value))
+        rows.append((timestamp, 'mem_usage', system_info.mem_usage.percent))
+        if system_info.self_usage.cpu_percent is not None:
+            rows.append((timestamp, 'self_usage/cpu', system_info.self_usage.cpu_percent))
+        self._history_repository.add_samples(rows)
+
+    def record_stress_tests_result(self,
+                                   stressor_id: str,
+                                   workers: int,
+                                   timeout: int,
+                                   verify: bool,
+                                   result: StressTestsResult,
+                                   system_info: SystemInfo) -> None:
+        # the stressor rows are joined to the run by its timestamp
+        timestamp = time.time()
+        fingerprint = self._hardware_fingerprint_repository.read(system_info)
+        self._history_repository.add_stress_tests_record({
+            'timestamp': timestamp,
+            'stressor': stressor_id,
+            'workers': workers,
+            'timeout': timeout,
+            'verify': verify,
+            'successful': result.successful,
+            'return_code': result.return_code,
+            'elapsed': result.elapsed,
+            'bogo_ops': result.bogo_ops,
+            'bopsust': result.bopsust,
+            'self_cpu_percent': result.self_cpu_percent,
+            'self_rss': result.self_rss,
+            'self_threads': result.self_threads,
+            'runs': None if result.statistics is None else result.statistics.get_runs(),
+            'bopsust_stddev': None if result.statistics is None else result.statistics.stddev,
+            'bopsust_ci95': None if result.statistics is None else result.statistics.ci95,
+            'noisy': result.noisy,
+            'noise_cpu_percent': None if result.noise is None else result.noise.cpu_percent,
+            **dict(fingerprint),
+        })
+        self._history_repository.add_stressor_records([{
+            'run_timestamp': timestamp,
+            'stressor': stressor.stressor,
+            'instances': stressor.instances,
+            'bogo_ops': stressor.bogo_ops,
+            'real_time': stressor.real_time,
+            'usr_time': stressor.usr_time,
+            'sys_time': stressor.sys_time,
+            'bogo_ops_per_second_real_time': stressor.bogo_ops_per_second_real_time,
+            'bogo_ops_per_second_usr_sys_time': stressor.bogo_ops_per_second_usr_sys_time,
+        } for stressor in result.stressors])
+        self._history_repository.add_core_score_records([{
+            'run_timestamp': timestamp,
+            'physical_package_id': core_score.physical_package_id,
+            'core_id': core_score.core_id,
+            'processor_id': core_score.processor_id,
+            'successful': core_score.successful,
+            'bopsust': core_score.bopsust,
+        } for core_score in result.core_scores])
+
+    def get_stress_tests_records(self) -> Observable:
+        return reactivex.defer(lambda _: reactivex.just(self._history_repository.get_stress_tests_records()))
+
+    def compare_stress_tests_runs(self, baseline_timestamp: float, timestamp: float) -> Observable:
+        return reactivex.defer(lambda _: reactivex.just(self._compare(baseline_timestamp, timestamp)))
+
+    def _compare(self, baseline_timestamp: float, timestamp: float) -> Optional[StressTestsComparison]:
+        baseline = self._history_repository.get_stress_tests_record(baseline_timestamp)
+        run = self._history_repository.get_stress_tests_record(timestamp)
+        if baseline is None or run is None:
+            return None
+        comparison = StressTestsComparison(baseline, run)
+        comparison.fingerprint_changes = self._get_fingerprint(baseline).get_changes(self._get_fingerprint(run))
+        comparison.mismatches = [field for field in COMPARABLE_FIELDS
+                                 if getattr(baseline, field) != getattr(run, field)]
+        if comparison.mismatches:
+            return comparison
+        stressors: Dict[str, StressorComparison] = {}
+        for record in self._history_repository.get_stressor_records(baseline_timestamp):
+            stressor = stressors.setdefault(record.stressor, StressorComparison(record.stressor))
+            stressor.baseline_real_time_rate = record.bogo_ops_per_second_real_time
+            stressor.baseline_usr_sys_time_rate = record.bogo_ops_per_second_usr_sys_time
+        for record in self._history_repository.get_stressor_records(timestamp):
+            stressor = stressors.setdefault(record.stressor, StressorComparison(record.stressor))
+            stressor.run_real_time_rate = record.bogo_ops_per_second_real_time
+            stressor.run_usr_sys_time_rate = record.bogo_ops_per_second_usr_sys_time
+        comparison.stressors = sorted(stressors.values(), key=lambda item: item.stressor)
+        if not comparison.stressors:
+            # runs recorded before the per-stressor metrics only have the total
+            total = StressorComparison(baseline.stressor)
+            total.baseline_usr_sys_time_rate = baseline.bopsust
+            total.run_usr_sys_time_rate = run.bopsust
+            comparison.stressors = [total]
+        return comparison
+
+    @staticmethod
+    def _get_fingerprint(record: StressTestsRecord) -> HardwareFingerprint:
+        fingerprint = HardwareFingerprint()
+        for attr, _ in fingerprint:
+            setattr(fingerprint, attr, getattr(record, attr))
+        return fingerprint
+
+    def prune_samples(self) -> Observable:
+        return reactivex.defer(lambda _: reactivex.just(self._prune_samples()))
+
+    def _prune_samples(self) -> int:
+        now = time.time()
+        deleted: int = self._history_repository.delete_samples_older_than(now - _SAMPLES_RETENTION_SECONDS)
+        downsampled: int = self._history_repository.downsample_samples_older_than(
+            now - _RAW_SAMPLES_RETENTION_SECONDS, _SAMPLES_BUCKET_SECONDS)
+        return deleted + downsampled
@@ -34,3 +34,6 @@ class LoadDmiDecodeInteractor:
 
     def execute(self, system_info: SystemInfo) -> Observable:
         return reactivex.defer(lambda _: reactivex.just(self._dmi_decode_repository.refresh(system_info)))
+
+    def load_cache(self, system_info: SystemInfo) -> Observable:
+        return reactivex.defer(lambda _: reactivex.just(self._dmi_decode_repository.load_cache(system_info)))
@@ -15,13 +15,18 @@
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 import logging
+from typing import Union
 
 import reactivex
 from injector import singleton, inject
 from reactivex import Observable
 
+from gst.di import SysRoot
 from gst.model.system_info import SystemInfo
+from gst.repository import PATH_SYS
 from gst.repository.lm_sensors_repository import LmSensorsRepository
+from gst.repository.sys_class_hwmon_repository import SysClassHwmonRepository
+from gst.util import sensors
 
 _LOG = logging.getLogger(__name__)
 
@@ -29,8 +34,18 @@ _LOG = logging.getLogger(__name__)
 @singleton
 class LoadLmSensorsInteractor:
     @inject
-    def __init__(self, lm_sensors_repository: LmSensorsRepository) -> None:
-        self._lm_sensors_repository = lm_sensors_repository
+    def __init__(self,
+                 lm_sensors_repository: LmSensorsRepository,
+                 sys_class_hwmon_repository: SysClassHwmonRepository,
+                 sys_root: SysRoot) -> None:
+        # libsensors always reads the real /sys, so another tree can only be read directly
+        self._repository: Union[LmSensorsRepository, SysClassHwmonRepository] = lm_sensors_repository
+        if sys_root != PATH_SYS:
+            _LOG.info(f"Reading the sensors from {sys_root}")
+            self._repository = sys_class_hwmon_repository
+        elif not sensors.is_available():
+            _LOG.warning("libsensors not found, reading the sensors from sysfs")
+            self._repository = sys_class_hwmon_repository
 
     def execute(self, system_info: SystemInfo) -> Observable:
-        return reactivex.defer(lambda _: reactivex.just(self._lm_sensors_repository.refresh(system_info)))
+        return reactivex.defer(lambda _: reactivex.just(self._repository.refresh(system_info)))
@@ -18,9 +18,11 @@ import logging
 from typing import Optional
 
 from injector import singleton, inject
+from reactivex import Observable
 
 from gst.conf import SETTINGS_DEFAULTS
-from gst.model.setting import Setting
+from gst.di import SettingChangedSubject
+from gst.repository.settings_repository import SettingsRepository
 
 _LOG = logging.getLogger(__name__)
 
@@ -28,60 +30,49 @@ _LOG = logging.getLogger(__name__)
 @singleton
 class SettingsInteractor:
     @inject
-    def __init__(self) -> None:
-        pass
+    def __init__(self,
+                 settings_repository: SettingsRepository,
+                 setting_changed_subject: SettingChangedSubject,
+                 ) -> None:
+        self._settings_repository = settings_repository
+        self._setting_changed_subject = setting_changed_subject
 
-    @staticmethod
-    def get_bool(key: str, default: Optional[bool] = None) -> bool:
+    def observe_changes(self) -> Observable:
+        return self._setting_changed_subject
+
+    def flush(self) -> None:
+        self._settings_repository.flush()
+
+    def get_bool(self, key: str, default: Optional[bool] = None) -> bool:
         if default is None:
             default = SETTINGS_DEFAULTS[key]
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            return bool(setting.value)
+        value = self._settings_repository.get(key)
+        if value is not None:
+            return bool(value)
         return bool(default)
 
-    @staticmethod
-    def set_bool(key: str, value: bool) -> None:
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            setting.value = value
-            setting.save()
-        else:
-            Setting.create(key=key, value=value)
+    def set_bool(self, key: str, value: bool) -> None:
+        self._settings_repository.set(key, value, value)
 
-    @staticmethod
-    def get_int(key: str, default: Optional[int] = None) -> int:
+    def get_int(self, key: str, default: Optional[int] = None) -> int:
         if default is None:
             default = SETTINGS_DEFAULTS[key]
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            return int(setting.value)
+        value = self._settings_repository.get(key)
+        if value is not None:
+            return int(value)
         assert default is not None
         return default
 
-    @staticmethod
-    def set_int(key: str, value: int) -> None:
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            setting.value = value
-            setting.save()
-        else:
-            Setting.create(key=key, value=value)
+    def set_int(self, key: str, value: int) -> None:
+        self._settings_repository.set(key, value, value)
 
-    @staticmethod
-    def get_str(key: str, default: Optional[str] = None) -> str:
+    def get_str(self, key: str, default: Optional[str] = None) -> str:
         if default is None:
             default = SETTINGS_DEFAULTS[key]
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            return str(setting.value.decode("utf-8"))
+        value = self._settings_repository.get(key)
+        if value is not None:
+            return str(value.decode("utf-8"))
         return str(default)
 
-    @staticmethod
-    def set_str(key: str, value: str) -> None:
-        setting: Setting = Setting.get_or_none(key=key)
-        if setting is not None:
-            setting.value = value.encode("utf-8")
-            setting.save()
-        else:
-            Setting.create(key=key, value=value.encode("utf-8"))
+    def set_str(self, key: str, value: str) -> None:
+        self._settings_repository.set(key, value, value.encode("utf-8"))
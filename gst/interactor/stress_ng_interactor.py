@@ -14,29 +14,216 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import copy
 import logging
+import statistics
+import threading
+import time
+from typing import Dict, List
 
 import reactivex
 from injector import singleton, inject
 from reactivex import Observable
 
+from gst.di import StressNgProgressSubject
+from gst.model.benchmark_statistics import BenchmarkStatistics
+from gst.model.core_score import CoreScore
+from gst.model.cpu_info import PhysicalCore
+from gst.model.stress_ng_progress import StressNgProgress
+from gst.model.stress_tests_result import StressTestsResult
+from gst.model.stressor_result import StressorResult
+from gst.model.system_noise import SystemNoise
+from gst.repository.ps_util_repository import PsUtilRepository
 from gst.repository.stress_ng_repository import StressNgRepository
 
 _LOG = logging.getLogger(__name__)
+# a repeated benchmark stops early once the 95% confidence interval is within this percentage of the mean
+_BENCHMARK_TARGET_RELATIVE_CI95 = 1.0
+_BENCHMARK_MIN_RUNS = 3
+_NOISE_SAMPLE_INTERVAL = 1.0  # seconds
+# seconds each stress-ng run takes on top of its stressors: starting, forking the workers and writing the report
+_STRESS_NG_RUN_OVERHEAD = 1
+_STRESSOR_METRICS = ['instances', 'bogo_ops', 'real_time', 'usr_time', 'sys_time', 'bogo_ops_per_second_real_time',
+                     'bogo_ops_per_second_usr_sys_time']
 
 
 @singleton
 class StressNgInteractor:
     @inject
-    def __init__(self, stress_ng_repository: StressNgRepository) -> None:
+    def __init__(self,
+                 stress_ng_repository: StressNgRepository,
+                 ps_util_repository: PsUtilRepository,
+                 progress_subject: StressNgProgressSubject) -> None:
         self._stress_ng_repository = stress_ng_repository
+        self._ps_util_repository = ps_util_repository
+        self._progress_subject = progress_subject
+        self._benchmark_stop_event = threading.Event()
+        self._benchmark_running = False
 
     def execute(self, stressor_command: str, workers: int, timeout: int, verify: bool) -> Observable:
         return reactivex.defer(
             lambda _: reactivex.just(self._stress_ng_repository.execute(stressor_command, workers, timeout, verify)))
 
+    def execute_benchmark(self, stressor_command: str, workers: int, timeout: int, runs: int, cool_down: int,
+                          noise_threshold: int, settle_timeout: int) -> Observable:
+        return reactivex.defer(lambda _: reactivex.just(self._execute_benchmark(
+            stressor_command, workers, timeout, runs, cool_down, noise_threshold, settle_timeout)))
+
+    def execute_core_sweep(self, stressor_command: str, cores: List[PhysicalCore], timeout: int, budget: int,
+                           noise_threshold: int, settle_timeout: int) -> Observable:
+        return reactivex.defer(lambda _: reactivex.just(self._execute_core_sweep(
+            stressor_command, cores, timeout, budget, noise_threshold, settle_timeout)))
+
     def is_running(self) -> bool:
-        return self._stress_ng_repository.is_running()
+        return self._benchmark_running or self._stress_ng_repository.is_running()
 
     def terminate(self) -> Observable:
+        self._benchmark_stop_event.set()
         return reactivex.defer(lambda _: reactivex.just(self._stress_ng_repository.terminate()))
+
+    def _execute_benchmark(self, stressor_command: str, workers: int, timeout: int, runs: int, cool_down: int,
+                           noise_threshold: int, settle_timeout: int) -> StressTestsResult:
+        # runs the benchmark up to runs times and reports the mean score of the runs left after the outliers
+        self._benchmark_stop_event.clear()
+        self._benchmark_running = True
+        try:
+            results: List[StressTestsResult] = []
+            benchmark_statistics = BenchmarkStatistics()
+            for run in range(1, runs + 1):
+                if run > 1 and not self._cool_down(cool_down, run, runs):
+                    break
+                noise = self._wait_for_quiet_system(noise_threshold, settle_timeout, run, runs)
+                if self._benchmark_stop_event.is_set():
+                    break
+                result = self._stress_ng_repository.execute(stressor_command, workers, timeout, False, run, runs)
+                result.noise = noise
+                result.noisy = noise.cpu_percent > noise_threshold
+                if result.noisy:
+                    _LOG.warning(f"Benchmark run {run} started with {noise.cpu_percent:.1f}% of the CPU in use: "
+                                 f"{noise.get_summary()}")
+                if runs == 1 or not result.successful or result.bopsust is None:
+                    # a single, failed or stopped run is reported as it is
+                    return result
+                results.append(result)
+                benchmark_statistics.add_sample(result.bopsust)
+                relative_ci95 = benchmark_statistics.get_relative_ci95()
+                if len(benchmark_statistics.samples) >= _BENCHMARK_MIN_RUNS and relative_ci95 is not None \
+                        and relative_ci95 <= _BENCHMARK_TARGET_RELATIVE_CI95:
+                    _LOG.info(f"Benchmark stopped after {run} runs, 95% CI = ±{relative_ci95:.2f}%")
+                    break
+            if not results:
+                # stopped before the first run, there is nothing to report
+                return StressTestsResult()
+            return self._aggregate_results(results, benchmark_statistics)
+        finally:
+            self._benchmark_running = False
+
+    def _execute_core_sweep(self, stressor_command: str, cores: List[PhysicalCore], timeout: int, budget: int,
+                            noise_threshold: int, settle_timeout: int) -> StressTestsResult:
+        # runs the single core benchmark pinned to each core, the budget is split among the cores so that the sweep
+        # takes at most max(budget, cores * (stressors + run overhead)) seconds plus the wait for the system to settle
+        self._benchmark_stop_event.clear()
+        self._benchmark_running = True
+        try:
+            core_timeout = self._get_core_timeout(stressor_command, len(cores), timeout, budget)
+            noise = self._wait_for_quiet_system(noise_threshold, settle_timeout, 1, len(cores))
+            aggregate = StressTestsResult()
+            aggregate.noise = noise
+            aggregate.noisy = noise.cpu_percent > noise_threshold
+            errors: List[str] = []
+            for run, (physical_package_id, core_id, processor_id) in enumerate(cores, start=1):
+                if self._benchmark_stop_event.is_set():
+                    break
+                result = self._stress_ng_repository.execute(f"{stressor_command} --taskset {processor_id}",
+                                                            1, core_timeout, False, run, len(cores))
+                if self._benchmark_stop_event.is_set():
+                    break
+                core_score = CoreScore(physical_package_id, core_id, processor_id)
+                core_score.successful = result.successful
+                core_score.bopsust = result.bopsust
+                aggregate.core_scores.append(core_score)
+                aggregate.elapsed = (aggregate.elapsed or 0) + (result.elapsed or 0)
+                if not result.successful:
+                    # a failing core must not hide the others
+                    _LOG.error(f"Core sweep failed on CPU {processor_id}: {result.error}")
+                    aggregate.return_code = aggregate.return_code or result.return_code
+                    errors.append(f"CPU {processor_id}: {result.error}")
+            if not aggregate.core_scores:
+                # stopped before the first core, there is nothing to report
+                return StressTestsResult()
+            scores = [core_score.bopsust for core_score in aggregate.core_scores if core_score.bopsust is not None]
+            aggregate.successful = all(core_score.successful for core_score in aggregate.core_scores)
+            aggregate.return_code = aggregate.return_code or 0
+            aggregate.error = '\n'.join(errors)
+            aggregate.bopsust = statistics.mean(scores) if scores else None
+            return aggregate
+        finally:
+            self._benchmark_running = False
+
+    @staticmethod
+    def _get_core_timeout(stressor_command: str, core_count: int, timeout: int, budget: int) -> int:
+        # with --sequential each stressor runs for the whole timeout, one after the other
+        args = stressor_command.split()
+        stressors = max(1, args.count('{0}')) if '--sequential' in args else 1
+        core_budget = budget // max(1, core_count) - _STRESS_NG_RUN_OVERHEAD
+        return max(1, min(timeout, core_budget // stressors))
+
+    def _wait_for_quiet_system(self, noise_threshold: int, settle_timeout: int, run: int, runs: int) -> SystemNoise:
+        # returns the last measure, either below the threshold or taken when the timeout expired
+        progress = StressNgProgress(settle_timeout, run, runs)
+        progress.settling = True
+        start = time.monotonic()
+        while True:
+            noise = self._ps_util_repository.read_noise(_NOISE_SAMPLE_INTERVAL)
+            progress.elapsed = time.monotonic() - start
+            if noise.cpu_percent <= noise_threshold or progress.elapsed >= settle_timeout \
+                    or self._benchmark_stop_event.is_set():
+                return noise
+            progress.last_message = f"{noise.cpu_percent:.0f}% of the CPU in use: {noise.get_summary()}"
+            self._progress_subject.on_next(copy.deepcopy(progress))
+
+    def _cool_down(self, cool_down: int, run: int, runs: int) -> bool:
+        # returns False if the benchmark has been stopped meanwhile
+        progress = StressNgProgress(cool_down, run, runs)
+        progress.cooling_down = True
+        for elapsed in range(cool_down):
+            progress.elapsed = elapsed
+            self._progress_subject.on_next(copy.deepcopy(progress))
+            if self._benchmark_stop_event.wait(1):
+                return False
+        return not self._benchmark_stop_event.is_set()
+
+    @staticmethod
+    def _aggregate_results(results: List[StressTestsResult],
+                           benchmark_statistics: BenchmarkStatistics) -> StressTestsResult:
+        kept = list(results)
+        for rejected in benchmark_statistics.rejected:
+            kept.remove(next(result for result in kept if result.bopsust == rejected))
+        aggregate = StressTestsResult()
+        aggregate.successful = True
+        aggregate.return_code = 0
+        aggregate.error = ''
+        aggregate.elapsed = sum(result.elapsed or 0 for result in results)
+        aggregate.bogo_ops = round(statistics.mean(result.bogo_ops or 0 for result in kept))
+        aggregate.bopsust = benchmark_statistics.mean
+        aggregate.statistics = benchmark_statistics
+        aggregate.noisy = any(result.noisy for result in results)
+        aggregate.noise = max((result.noise for result in results if result.noise is not None),
+                              key=lambda noise: noise.cpu_percent, default=None)
+        stressors: Dict[str, List[StressorResult]] = {}
+        for result in kept:
+            for stressor in result.stressors:
+                stressors.setdefault(stressor.stressor, []).append(stressor)
+        for name, stressor_results in stressors.items():
+            stressor = StressorResult(name)
+            for metric in _STRESSOR_METRICS:
+                values = [getattr(result, metric) for result in stressor_results if getattr(result, metric) is not None]
+                if values:
+                    value = statistics.mean(values)
+                    setattr(stressor, metric, round(value) if metric in ('instances', 'bogo_ops') else value)
+            aggregate.stressors.append(stressor)
+        return aggregate
+
+    def observe_progress(self) -> Observable:
+        # StressNgProgress of the running stress test, emitted from the thread running it
+        return self._progress_subject
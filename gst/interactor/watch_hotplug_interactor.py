@@ -0,0 +1,84 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+from typing import Any, Optional
+
+import reactivex
+from injector import singleton, inject
+from reactivex import Observable, abc
+from reactivex.disposable import Disposable
+
+from gst.repository.lm_sensors_repository import LmSensorsRepository
+from gst.repository.proc_cpuinfo_repository import ProcCpuinfoRepository
+from gst.repository.sys_class_hwmon_repository import SysClassHwmonRepository
+from gst.repository.sys_devices_cache_repository import SysDevicesCacheRepository
+from gst.util.uevent import UeventListener, Uevent
+
+_LOG = logging.getLogger(__name__)
+SUBSYSTEM_CPU = 'cpu'
+SUBSYSTEM_HWMON = 'hwmon'
+SUBSYSTEM_THERMAL = 'thermal'
+SUBSYSTEM_EDAC = 'edac'
+
+
+@singleton
+class WatchHotplugInteractor:
+    @inject
+    def __init__(self,
+                 proc_cpuinfo_repository: ProcCpuinfoRepository,
+                 sys_devices_cache_repository: SysDevicesCacheRepository,
+                 lm_sensors_repository: LmSensorsRepository,
+                 sys_class_hwmon_repository: SysClassHwmonRepository,
+                 ) -> None:
+        self._proc_cpuinfo_repository = proc_cpuinfo_repository
+        self._sys_devices_cache_repository = sys_devices_cache_repository
+        self._lm_sensors_repository = lm_sensors_repository
+        self._sys_class_hwmon_repository = sys_class_hwmon_repository
+
+    def execute(self) -> Observable:
+        return reactivex.create(self._subscribe)
+
+    def _subscribe(self, observer: abc.ObserverBase, _: Optional[Any] = None) -> abc.DisposableBase:
+        try:
+            listener = UeventListener([SUBSYSTEM_CPU, SUBSYSTEM_HWMON, SUBSYSTEM_THERMAL, SUBSYSTEM_EDAC],
+                                      lambda uevent: self._on_uevent(uevent, observer))
+        except OSError as ex:
+            _LOG.warning(f"Unable to listen for uevents, hardware changes will be polled: {str(ex)}")
+            observer.on_completed()
+            return Disposable()
+        self._set_hotplug_events_enabled(True)
+        listener.start()
+
+        def dispose() -> None:
+            listener.stop()
+            self._set_hotplug_events_enabled(False)
+
+        return Disposable(dispose)
+
+    def _set_hotplug_events_enabled(self, enabled: bool) -> None:
+        self._proc_cpuinfo_repository.set_hotplug_events_enabled(enabled)
+        self._lm_sensors_repository.set_hotplug_events_enabled(enabled)
+        self._sys_class_hwmon_repository.set_hotplug_events_enabled(enabled)
+
+    def _on_uevent(self, uevent: Uevent, observer: abc.ObserverBase) -> None:
+        if uevent.subsystem == SUBSYSTEM_CPU:
+            self._proc_cpuinfo_repository.invalidate()
+            self._sys_devices_cache_repository.invalidate()
+        elif uevent.subsystem in (SUBSYSTEM_HWMON, SUBSYSTEM_THERMAL):
+            self._lm_sensors_repository.invalidate()
+            self._sys_class_hwmon_repository.invalidate()
+        observer.on_next(uevent)
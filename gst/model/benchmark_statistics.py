@@ -0,0 +1,47 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import statistics
+from typing import List, Optional
+
+from gst.util.statistics import get_confidence_interval_95, reject_outliers
+
+
+# score of a benchmark repeated several times, computed on the samples left after the outlier rejection
+class BenchmarkStatistics:
+    def __init__(self) -> None:
+        self.samples: List[float] = []
+        self.rejected: List[float] = []
+        self.mean: Optional[float] = None
+        self.stddev: Optional[float] = None
+        self.ci95: Optional[float] = None  # half width
+
+    def add_sample(self, sample: float) -> None:
+        kept, rejected = reject_outliers(self.samples + self.rejected + [sample])
+        self.samples = kept
+        self.rejected = rejected
+        self.mean = statistics.mean(kept)
+        self.stddev = statistics.stdev(kept) if len(kept) > 1 else None
+        self.ci95 = get_confidence_interval_95(kept)
+
+    def get_runs(self) -> int:
+        return len(self.samples) + len(self.rejected)
+
+    def get_relative_ci95(self) -> Optional[float]:
+        # in percentage of the mean
+        if self.ci95 is None or not self.mean:
+            return None
+        return self.ci95 / self.mean * 100
@@ -0,0 +1,27 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import Optional
+
+
+# score of the single core benchmark pinned to one core
+class CoreScore:
+    def __init__(self, physical_package_id: int, core_id: int, processor_id: int) -> None:
+        self.physical_package_id = physical_package_id
+        self.core_id = core_id
+        self.processor_id = processor_id
+        self.successful: Optional[bool] = None
+        self.bopsust: Optional[float] = None
@@ -14,17 +14,27 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Set, Tuple
 
 from gst.model import SelectedProcessor
 from gst.model.monitored_item import MonitoredItem
+from gst.model.monitored_item_change import MonitoredItemChange
 from gst.model.processor import Processor, ProcessorDict
 
+ClockMonitoredItemKey = Tuple[int, int]  # (physical_package_id, core_id)
+PhysicalCore = Tuple[int, int, int]  # (physical_package_id, core_id, processor_id)
+
 
 class CpuInfo:
     def __init__(self) -> None:
         self.physical_package_id_list: List[ProcessorDict] = []
         self.clock_monitored_items: Dict[int, Dict[int, MonitoredItem]] = {}
+        self._updated_clocks_lock = threading.Lock()
+        self._updated_clocks: Set[ClockMonitoredItemKey] = set()
+        self._clock_changes: List[MonitoredItemChange] = []
+        # clocks of offline cores, kept to restore their history if they come back online
+        self._detached_clocks: Dict[ClockMonitoredItemKey, MonitoredItem] = {}
 
     def get_processor(self, selected_processor: SelectedProcessor) -> Processor:
         physical_package_id = selected_processor[0]
@@ -37,12 +47,23 @@ class CpuInfo:
             return self.physical_package_id_list[physical_package_id][processor_id]
         raise ValueError("selected_processor must not have None values")
 
+    def get_physical_cores(self) -> List[PhysicalCore]:
+        # the first logical processor of every core, the other SMT siblings share its execution units
+        cores: Dict[ClockMonitoredItemKey, int] = {}
+        for physical_package_id, physical_package in enumerate(self.physical_package_id_list):
+            for processor_id, processor in sorted(physical_package.items()):
+                key = (physical_package_id, processor.core_id if processor.core_id is not None else processor_id)
+                cores.setdefault(key, processor_id)
+        return [(physical_package_id, core_id, processor_id)
+                for (physical_package_id, core_id), processor_id in sorted(cores.items())]
+
     def get_clock_monitored_item(self, physical_package_id: int, core_id: int) -> Optional[MonitoredItem]:
         ppi = self.clock_monitored_items.get(physical_package_id)
         return None if ppi is None else ppi.get(core_id)
 
     def set_clock_monitored_item(self, physical_package_id: int, item: MonitoredItem) -> None:
         core_id = int(item.item_id)
+        key = (physical_package_id, core_id)
         old_item = self.get_clock_monitored_item(physical_package_id, core_id)
         if old_item is None:
             physical_package = self.clock_monitored_items.get(physical_package_id)
@@ -51,9 +72,46 @@ class CpuInfo:
                 self.clock_monitored_items[physical_package_id] = physical_package
             old_item = physical_package.get(core_id)
             if old_item is None:
+                detached_item = self._detached_clocks.pop(key, None)
+                if detached_item is not None:
+                    detached_item.update_value(item.value)
+                    item = detached_item
                 physical_package[core_id] = item
+                with self._updated_clocks_lock:
+                    self._clock_changes.append(MonitoredItemChange(key, item, MonitoredItemChange.ADD))
                 return
         if old_item.item_id != item.item_id:
             raise ValueError(f"Trying to update a Core with a different id: "
                              f"{old_item.item_id} != {item.item_id}")
-        old_item.update_value(item.value)
+        if old_item.update_value(item.value):
+            with self._updated_clocks_lock:
+                self._updated_clocks.add(key)
+
+    def remove_missing_clock_monitored_items(self, present_keys: Set[ClockMonitoredItemKey]) -> None:
+        for physical_package_id, physical_package in list(self.clock_monitored_items.items()):
+            for core_id, item in list(physical_package.items()):
+                key = (physical_package_id, core_id)
+                if key not in present_keys:
+                    del physical_package[core_id]
+                    self._detached_clocks[key] = item
+                    with self._updated_clocks_lock:
+                        self._clock_changes.append(MonitoredItemChange(key, item, MonitoredItemChange.REMOVE))
+            if not physical_package:
+                del self.clock_monitored_items[physical_package_id]
+
+    def pop_clock_changes(self) -> List[MonitoredItemChange]:
+        with self._updated_clocks_lock:
+            changes = self._clock_changes
+            self._clock_changes = []
+        return changes
+
+    def pop_updated_clock_monitored_items(self) -> List[Tuple[ClockMonitoredItemKey, MonitoredItem]]:
+        with self._updated_clocks_lock:
+            updated_clocks = self._updated_clocks
+            self._updated_clocks = set()
+        result = []
+        for key in updated_clocks:
+            item = self.get_clock_monitored_item(*key)
+            if item is not None:
+                result.append((key, item))
+        return result
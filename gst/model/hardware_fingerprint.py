@@ -0,0 +1,34 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import Iterator, List, Optional
+
+
+# what a benchmark result depends on besides the code of the stressors
+class HardwareFingerprint:
+    def __init__(self) -> None:
+        self.cpu_model: Optional[str] = None
+        self.microcode: Optional[str] = None
+        self.bios_version: Optional[str] = None
+        self.kernel: Optional[str] = None
+        self.governor: Optional[str] = None
+
+    def __iter__(self) -> Iterator:
+        for attr, value in self.__dict__.items():
+            yield attr, value
+
+    def get_changes(self, other: 'HardwareFingerprint') -> List[str]:
+        return [attr for attr, value in self if value != getattr(other, attr)]
@@ -14,15 +14,24 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Set, Tuple, List
 
 from gst.model.monitored_item import MonitoredItem
+from gst.model.monitored_item_change import MonitoredItemChange
 from gst.util.sensors import FeatureType
 
+HwMonitoredItemKey = Tuple[str, FeatureType, str]  # (chip_id, feature_type, item_id)
+
 
 class HardwareMonitor:
     def __init__(self) -> None:
         self.hw_monitored_items: Dict[str, Dict[FeatureType, Dict[str, MonitoredItem]]] = {}
+        self._updated_items_lock = threading.Lock()
+        self._updated_items: Set[HwMonitoredItemKey] = set()
+        self._changes: List[MonitoredItemChange] = []
+        # items of unplugged sensors, kept to restore their history if they come back
+        self._detached_items: Dict[HwMonitoredItemKey, MonitoredItem] = {}
 
     def get_hw_monitored_item(self,
                               chip_id: str,
@@ -39,6 +48,7 @@ class HardwareMonitor:
     def set_hw_monitored_item(self, chip_id: str, item: MonitoredItem) -> None:
         item_id = item.item_id
         feature_type = item.value_type
+        key = (chip_id, feature_type, item_id)
         old_item = self.get_hw_monitored_item(chip_id, feature_type, item_id)
         if old_item is None:
             chip = self.hw_monitored_items.get(chip_id)
@@ -51,9 +61,50 @@ class HardwareMonitor:
                 chip[feature_type] = feature_type_dict
             old_item = feature_type_dict.get(item_id)
             if old_item is None:
+                detached_item = self._detached_items.pop(key, None)
+                if detached_item is not None:
+                    detached_item.name = item.name
+                    detached_item.update_value(item.value)
+                    item = detached_item
                 feature_type_dict[item_id] = item
+                with self._updated_items_lock:
+                    self._changes.append(MonitoredItemChange(key, item, MonitoredItemChange.ADD))
                 return
         if old_item.item_id != item.item_id:
             raise ValueError(f"Trying to update a Core with a different id: "
                              f"{old_item.item_id} != {item.item_id}")
-        old_item.update_value(item.value)
+        if old_item.update_value(item.value):
+            with self._updated_items_lock:
+                self._updated_items.add(key)
+
+    def remove_missing_hw_monitored_items(self, present_keys: Set[HwMonitoredItemKey]) -> None:
+        for chip_id, chip in list(self.hw_monitored_items.items()):
+            for feature_type, feature_type_dict in list(chip.items()):
+                for item_id, item in list(feature_type_dict.items()):
+                    key = (chip_id, feature_type, item_id)
+                    if key not in present_keys:
+                        del feature_type_dict[item_id]
+                        self._detached_items[key] = item
+                        with self._updated_items_lock:
+                            self._changes.append(MonitoredItemChange(key, item, MonitoredItemChange.REMOVE))
+                if not feature_type_dict:
+                    del chip[feature_type]
+            if not chip:
+                del self.hw_monitored_items[chip_id]
+
+    def pop_changes(self) -> List[MonitoredItemChange]:
+        with self._updated_items_lock:
+            changes = self._changes
+            self._changes = []
+        return changes
+
+    def pop_updated_items(self) -> List[Tuple[HwMonitoredItemKey, MonitoredItem]]:
+        with self._updated_items_lock:
+            updated_items = self._updated_items
+            self._updated_items = set()
+        result = []
+        for key in updated_items:
+            item = self.get_hw_monitored_item(*key)
+            if item is not None:
+                result.append((key, item))
+        return result
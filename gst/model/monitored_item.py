@@ -28,8 +28,10 @@ class MonitoredItem:
         self.value_min = value
         self.value_max = value
 
-    def update_value(self, value: Optional[float]) -> None:
+    def update_value(self, value: Optional[float]) -> bool:
+        old_values = (self.value, self.value_min, self.value_max)
         self.value = value
         if value is not None:
             self.value_min = min(self.value_min, value) if self.value_min is not None else value
             self.value_max = max(self.value_max, value) if self.value_max is not None else value
+        return old_values != (self.value, self.value_min, self.value_max)
@@ -0,0 +1,37 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from peewee import CharField, DoubleField, IntegerField, SqliteDatabase
+from playhouse.signals import Model
+
+from gst.di import INJECTOR
+
+
+# the min, average and max of the Sample rows of one key in a bucket, timestamp is the start of the bucket
+class SampleSummary(Model):
+    timestamp = DoubleField(index=True)
+    key = CharField()
+    min_value = DoubleField(null=True)
+    avg_value = DoubleField(null=True)
+    max_value = DoubleField(null=True)
+    sample_count = IntegerField()
+
+    class Meta:
+        legacy_table_names = False
+        database = INJECTOR.get(SqliteDatabase)
+        indexes = (
+            (('key', 'timestamp'), False),
+        )
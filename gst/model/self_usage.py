@@ -0,0 +1,34 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import Optional
+
+
+class SelfUsage:
+    def __init__(self) -> None:
+        self.timestamp: Optional[float] = None
+        self.cpu_time: Optional[float] = None
+        # percentage of one core used since the previous sample
+        self.cpu_percent: Optional[float] = None
+        self.rss: Optional[int] = None
+        self.threads: Optional[int] = None
+
+    def get_cpu_percent_since(self, previous: 'SelfUsage') -> Optional[float]:
+        if self.timestamp is None or self.cpu_time is None \
+                or previous.timestamp is None or previous.cpu_time is None \
+                or self.timestamp <= previous.timestamp:
+            return None
+        return (self.cpu_time - previous.cpu_time) / (self.timestamp - previous.timestamp) * 100
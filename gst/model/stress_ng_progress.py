@@ -0,0 +1,38 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import List, Optional
+
+
+class StressNgProgress:
+    def __init__(self, timeout: int, run: int = 1, runs: int = 1) -> None:
+        self.timeout = timeout  # 0 means forever
+        # position of this run when a benchmark is repeated
+        self.run = run
+        self.runs = runs
+        self.cooling_down = False  # waiting before the next run, nothing is running
+        self.settling = False  # waiting for the other processes to quiet down, nothing is running
+        self.elapsed: float = 0.0
+        self.running_workers: int = 0
+        # summed over all the workers, a percentage of one core
+        self.cpu_percent: float = 0.0
+        self.failures: List[str] = []
+        self.last_message: Optional[str] = None
+
+    def get_fraction(self) -> Optional[float]:
+        if self.timeout <= 0:
+            return None
+        return min(1.0, self.elapsed / self.timeout)
@@ -0,0 +1,66 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import List, Optional
+
+from gst.model.stress_tests_record import StressTestsRecord
+
+# a slowdown bigger than this is reported as a regression
+REGRESSION_THRESHOLD_PERCENT = 3.0
+# runs that differ in any of these are not compared, their scores measure different work
+COMPARABLE_FIELDS = ['stressor', 'workers']
+
+
+class StressorComparison:
+    def __init__(self, stressor: str) -> None:
+        self.stressor = stressor
+        self.baseline_real_time_rate: Optional[float] = None
+        self.run_real_time_rate: Optional[float] = None
+        self.baseline_usr_sys_time_rate: Optional[float] = None
+        self.run_usr_sys_time_rate: Optional[float] = None
+
+    def get_real_time_delta_percent(self) -> Optional[float]:
+        return self._get_delta_percent(self.baseline_real_time_rate, self.run_real_time_rate)
+
+    def get_usr_sys_time_delta_percent(self) -> Optional[float]:
+        return self._get_delta_percent(self.baseline_usr_sys_time_rate, self.run_usr_sys_time_rate)
+
+    def is_regression(self) -> bool:
+        return any(delta is not None and delta < -REGRESSION_THRESHOLD_PERCENT
+                   for delta in (self.get_real_time_delta_percent(), self.get_usr_sys_time_delta_percent()))
+
+    @staticmethod
+    def _get_delta_percent(baseline: Optional[float], run: Optional[float]) -> Optional[float]:
+        if not baseline or run is None:
+            return None
+        return (run - baseline) / baseline * 100
+
+
+class StressTestsComparison:
+    def __init__(self, baseline: StressTestsRecord, run: StressTestsRecord) -> None:
+        self.baseline = baseline
+        self.run = run
+        self.stressors: List[StressorComparison] = []
+        # names of the HardwareFingerprint fields that differ between the two runs
+        self.fingerprint_changes: List[str] = []
+        # names of the COMPARABLE_FIELDS that differ, when not empty stressors is left empty
+        self.mismatches: List[str] = []
+
+    def is_comparable(self) -> bool:
+        return not self.mismatches
+
+    def has_regressions(self) -> bool:
+        return any(stressor.is_regression() for stressor in self.stressors)
@@ -0,0 +1,50 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from peewee import CharField, DoubleField, SqliteDatabase, IntegerField, BooleanField
+from playhouse.signals import Model
+
+from gst.di import INJECTOR
+
+
+class StressTestsRecord(Model):
+    timestamp = DoubleField(index=True)
+    stressor = CharField()
+    workers = IntegerField()
+    timeout = IntegerField()
+    verify = BooleanField()
+    successful = BooleanField(null=True)
+    return_code = IntegerField(null=True)
+    elapsed = DoubleField(null=True)
+    bogo_ops = IntegerField(null=True)
+    bopsust = DoubleField(null=True)
+    self_cpu_percent = DoubleField(null=True)
+    self_rss = IntegerField(null=True)
+    self_threads = IntegerField(null=True)
+    cpu_model = CharField(null=True)
+    microcode = CharField(null=True)
+    bios_version = CharField(null=True)
+    kernel = CharField(null=True)
+    governor = CharField(null=True)
+    runs = IntegerField(null=True)
+    bopsust_stddev = DoubleField(null=True)
+    bopsust_ci95 = DoubleField(null=True)
+    noisy = BooleanField(null=True)
+    noise_cpu_percent = DoubleField(null=True)
+
+    class Meta:
+        legacy_table_names = False
+        database = INJECTOR.get(SqliteDatabase)
@@ -14,7 +14,12 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
-from typing import Optional
+from typing import List, Optional
+
+from gst.model.benchmark_statistics import BenchmarkStatistics
+from gst.model.core_score import CoreScore
+from gst.model.stressor_result import StressorResult
+from gst.model.system_noise import SystemNoise
 
 
 class StressTestsResult:
@@ -25,3 +30,15 @@ class StressTestsResult:
         self.bopsust: Optional[float] = None
         self.error: Optional[str] = None
         self.return_code: Optional[int] = None
+        self.stressors: List[StressorResult] = []
+        # only set when the benchmark was repeated, bopsust is then the mean of the runs
+        self.statistics: Optional[BenchmarkStatistics] = None
+        # only checked before the benchmarks, noisy means that the system did not settle below the threshold
+        self.noisy: Optional[bool] = None
+        self.noise: Optional[SystemNoise] = None
+        # only set by the core sweep, bopsust is then the mean of the cores
+        self.core_scores: List[CoreScore] = []
+        # GST's own usage while the stress test was running, CPU is a percentage of one core
+        self.self_cpu_percent: Optional[float] = None
+        self.self_rss: Optional[int] = None
+        self.self_threads: Optional[int] = None
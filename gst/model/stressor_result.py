@@ -0,0 +1,29 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import Optional
+
+
+class StressorResult:
+    def __init__(self, stressor: str) -> None:
+        self.stressor = stressor
+        self.instances: Optional[int] = None
+        self.bogo_ops: Optional[int] = None
+        self.real_time: Optional[float] = None
+        self.usr_time: Optional[float] = None
+        self.sys_time: Optional[float] = None
+        self.bogo_ops_per_second_real_time: Optional[float] = None
+        self.bogo_ops_per_second_usr_sys_time: Optional[float] = None
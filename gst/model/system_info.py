@@ -25,6 +25,7 @@ from gst.model.load_avg import LoadAvg
 from gst.model.mem_usage import MemUsage
 from gst.model.memory_bank_info import MemoryBankInfo
 from gst.model.mobo_info import MoboInfo
+from gst.model.self_usage import SelfUsage
 
 
 @singleton
@@ -38,3 +39,4 @@ class SystemInfo:
         self.mem_usage: MemUsage = MemUsage()
         self.load_avg: LoadAvg = LoadAvg()
         self.hwmon: HardwareMonitor = HardwareMonitor()
+        self.self_usage: SelfUsage = SelfUsage()
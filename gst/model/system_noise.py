@@ -0,0 +1,35 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+from typing import List
+
+
+class NoisyProcess:
+    def __init__(self, pid: int, name: str, cpu_percent: float) -> None:
+        self.pid = pid
+        self.name = name
+        self.cpu_percent = cpu_percent  # of one core
+
+
+# CPU used by the processes other than GST and its children, measured before a benchmark run
+class SystemNoise:
+    def __init__(self) -> None:
+        self.cpu_percent: float = 0.0  # of all the cores
+        self.processes: List[NoisyProcess] = []  # the busiest first
+
+    def get_summary(self, limit: int = 3) -> str:
+        return ', '.join(f"{process.name} ({process.pid}) {process.cpu_percent:.0f}%"
+                         for process in self.processes[:limit])
@@ -16,21 +16,21 @@
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 import datetime
 import logging
-import multiprocessing
 import time
-from typing import Optional, Any, Tuple
+from typing import Optional, Any, Tuple, Callable, List
 
 import reactivex
 from gi.repository import GLib
 from injector import inject, singleton
 from reactivex import Observable, operators
+from reactivex.abc import DisposableBase
 from reactivex.disposable import CompositeDisposable
-from reactivex.scheduler import ThreadPoolScheduler
 from reactivex.scheduler.mainloop import GtkScheduler
 
 from gst.conf import APP_NAME, APP_SOURCE_URL, APP_VERSION, APP_ID
 from gst.interactor.check_new_version_interactor import CheckNewVersionInteractor
 from gst.interactor.get_stressors_interactor import GetStressorsInteractor
+from gst.interactor.history_interactor import HistoryInteractor
 from gst.interactor.load_dmi_decode_interactor import LoadDmiDecodeInteractor
 from gst.interactor.load_lm_sensors_interactor import LoadLmSensorsInteractor
 from gst.interactor.load_proc_cpuinfo_interactor import LoadProcCpuinfoInteractor
@@ -38,16 +38,41 @@ from gst.interactor.load_ps_util_interactor import LoadPsUtilInteractor
 from gst.interactor.load_sys_devices_cache_interactor import LoadSysDevicesCacheInteractor
 from gst.interactor.load_sys_devices_dmi_interactor import LoadSysDevicesDmiInteractor
 from gst.interactor.notification_interactor import NotificationInteractor
+from gst.interactor.self_usage_interactor import SelfUsageInteractor
 from gst.interactor.settings_interactor import SettingsInteractor
 from gst.interactor.stress_ng_interactor import StressNgInteractor
+from gst.interactor.watch_hotplug_interactor import WatchHotplugInteractor
+from gst.model.core_score import CoreScore
+from gst.model.self_usage import SelfUsage
+from gst.model.setting_change import SettingChange
+from gst.model.stress_ng_progress import StressNgProgress
+from gst.model.stress_tests_comparison import StressTestsComparison
+from gst.model.stress_tests_record import StressTestsRecord
 from gst.model.stress_tests_result import StressTestsResult
 from gst.model.system_info import SystemInfo
 from gst.presenter.preferences_presenter import PreferencesPresenter
 from gst.repository.dmi_decode_repository import DmiDecodeRepositoryResult
+from gst.util.lane_executor import LaneExecutor
+from gst.util.metrics import METRICS, LatencyHistogram
 from gst.util.view import open_uri, get_default_application
 
 _LOG = logging.getLogger(__name__)
 _ADD_NEW_PROFILE_INDEX = -10
+_HOTPLUG_DEBOUNCE_SECONDS = 0.5
+# every repository has its own serial lane on the shared worker pool
+_LANE_PROC_CPUINFO = 'proc_cpuinfo'
+_LANE_SYS_DEVICES_CACHE = 'sys_devices_cache'
+_LANE_SYS_DEVICES_DMI = 'sys_devices_dmi'
+_LANE_LM_SENSORS = 'lm_sensors'
+_LANE_DMI_DECODE = 'dmi_decode'
+_LANE_PSUTIL = 'psutil'
+_LANE_SELF_USAGE = 'self_usage'
+_LANE_STRESS_NG = 'stress_ng'
+_LANE_STRESS_NG_CONTROL = 'stress_ng_control'  # must not queue behind a running stress test
+_LANE_HISTORY = 'history'
+_LANE_NETWORK = 'network'
+_LANE_REFRESH = 'refresh'
+_LANE_HOTPLUG = 'hotplug'
 
 
 class MainViewInterface:
@@ -57,9 +82,30 @@ class MainViewInterface:
     def refresh_system_info(self) -> None:
         raise NotImplementedError()
 
+    def init_cpu_info(self) -> None:
+        raise NotImplementedError()
+
+    def init_cpu_cache(self) -> None:
+        raise NotImplementedError()
+
+    def init_mobo_info(self) -> None:
+        raise NotImplementedError()
+
+    def init_memory(self) -> None:
+        raise NotImplementedError()
+
+    def init_hwmon(self) -> None:
+        raise NotImplementedError()
+
+    def init_cpu_usage(self) -> None:
+        raise NotImplementedError()
+
     def select_physical_package(self, physical_package_id: int) -> None:
         raise NotImplementedError()
 
+    def init_preferences_view(self) -> None:
+        raise NotImplementedError()
+
     def select_mem_bank(self, mem_bank_id: int) -> None:
         raise NotImplementedError()
 
@@ -90,12 +136,33 @@ class MainViewInterface:
     def update_stress_tests_result(self, result: StressTestsResult) -> None:
         raise NotImplementedError()
 
+    def update_stress_tests_progress(self, progress: Optional[StressNgProgress]) -> None:
+        raise NotImplementedError()
+
     def get_stress_test_config(self) -> Tuple[str, int, int]:
         raise NotImplementedError()
 
     def show_error_message_dialog(self, title: str, message: str) -> None:
         raise NotImplementedError()
 
+    def show_diagnostics(self, histograms: List[LatencyHistogram]) -> None:
+        raise NotImplementedError()
+
+    def choose_diagnostics_file(self) -> Optional[str]:
+        raise NotImplementedError()
+
+    def show_benchmark_history(self, records: List[StressTestsRecord], baseline_timestamp: Optional[float]) -> None:
+        raise NotImplementedError()
+
+    def get_selected_benchmark_run(self) -> Optional[float]:
+        raise NotImplementedError()
+
+    def show_benchmark_comparison(self, comparison: Optional[StressTestsComparison]) -> None:
+        raise NotImplementedError()
+
+    def show_core_sweep(self, core_scores: List[CoreScore]) -> None:
+        raise NotImplementedError()
+
 
 @singleton
 class MainPresenter:
@@ -114,13 +181,19 @@ class MainPresenter:
                  notify_interactor: NotificationInteractor,
                  settings_interactor: SettingsInteractor,
                  check_new_version_interactor: CheckNewVersionInteractor,
+                 watch_hotplug_interactor: WatchHotplugInteractor,
+                 history_interactor: HistoryInteractor,
+                 self_usage_interactor: SelfUsageInteractor,
                  composite_disposable: CompositeDisposable,
                  ) -> None:
         _LOG.debug("init MainPresenter ")
         self.main_view: MainViewInterface = MainViewInterface()
         self._system_info: SystemInfo = system_info
         self._preferences_presenter = preferences_presenter
-        self._scheduler = ThreadPoolScheduler(multiprocessing.cpu_count())
+        # a stress test and the dmidecode password prompt can take minutes, the Stop button must never wait for them
+        self._executor = LaneExecutor(settings_interactor.get_int('settings_worker_threads'),
+                                      [_LANE_STRESS_NG, _LANE_STRESS_NG_CONTROL, _LANE_DMI_DECODE, _LANE_NETWORK])
+        self._main_scheduler = GtkScheduler(GLib)
         self._load_proc_cpuinfo_interactor: LoadProcCpuinfoInteractor = load_proc_cpuinfo_interactor
         self._load_sys_devices_cache_interactor: LoadSysDevicesCacheInteractor = load_sys_devices_cache_interactor
         self._load_sys_devices_dmi_interactor: LoadSysDevicesDmiInteractor = load_sys_devices_dmi_interactor
@@ -132,26 +205,58 @@ class MainPresenter:
         self._notify_interactor = notify_interactor
         self._settings_interactor = settings_interactor
         self._check_new_version_interactor = check_new_version_interactor
+        self._watch_hotplug_interactor = watch_hotplug_interactor
+        self._history_interactor = history_interactor
+        self._self_usage_interactor = self_usage_interactor
         self._composite_disposable: CompositeDisposable = composite_disposable
+        self._refresh_disposable: Optional[DisposableBase] = None
         self._chronometer_tag: Optional[int] = None
         self._chronometer_start_time: Optional[float] = None
         self._chronometer_stop_time: Optional[float] = None
+        self._stress_tests_self_usage: Optional[SelfUsage] = None
+        self._self_usage_warning_shown = False
+        self._stress_tests_failures_shown = 0
 
     def on_start(self) -> None:
         if self._settings_interactor.get_int('settings_check_new_version'):
             self._check_new_version()
-        self._composite_disposable.add(reactivex.just(self._system_info).pipe(
-            operators.subscribe_on(self._scheduler),
-            operators.flat_map(self._load_psutil),
-            operators.flat_map(self._load_proc_cpuinfo),
-            operators.flat_map(self._load_sys_devices_cache),
-            operators.flat_map(self._load_sys_devices_dmi),
-            operators.flat_map(self._load_lm_sensors),
-            operators.observe_on(GtkScheduler(GLib)),
-        ).subscribe(on_next=lambda _: (self.main_view.init_system_info(), self._start_refresh()),
+        self.main_view.init_memory()
+        self._prune_history()
+        self._watch_stress_tests_progress()
+        # every source loads in parallel and paints its own section as soon as it completes
+        self._composite_disposable.add(reactivex.merge(
+            self._load_section(self._load_psutil, self.main_view.init_cpu_usage),
+            self._load_section(self._load_proc_cpuinfo, self.main_view.init_cpu_info).pipe(
+                operators.flat_map(self._load_sys_devices_cache),
+                operators.observe_on(self._main_scheduler),
+                operators.do_action(on_next=lambda _: self.main_view.init_cpu_cache()),
+                # the cached memory banks and processor packages need the processors from /proc/cpuinfo
+                operators.flat_map(lambda _: self._load_dmi_decode_cache(self._system_info)),
+                operators.observe_on(self._main_scheduler),
+                operators.do_action(on_next=self._handle_dmi_decode_cache_result),
+            ),
+            self._load_section(self._load_sys_devices_dmi, self.main_view.init_mobo_info),
+            self._load_section(self._load_lm_sensors, self.main_view.init_hwmon),
+        ).subscribe(on_completed=lambda: (self._start_refresh(),
+                                          self._watch_refresh_interval(),
+                                          self._watch_hotplug()),
                     on_error=lambda e: _LOG.exception(f"Refresh error: {str(e)}")))
 
+    def on_shutdown(self) -> None:
+        # the tasks already running are not waited for, stress-ng is terminated by the cleanup in __main__
+        self._executor.shutdown()
+
+    def _load_section(self,
+                      load_source: Callable[[SystemInfo], Observable],
+                      init_section: Callable[[], None]) -> Observable:
+        return reactivex.just(self._system_info).pipe(
+            operators.flat_map(load_source),
+            operators.observe_on(self._main_scheduler),
+            operators.do_action(on_next=lambda _: init_section()),
+        )
+
     def on_menu_settings_clicked(self, *_: Any) -> None:
+        self.main_view.init_preferences_view()
         self._preferences_presenter.show()
 
     def on_menu_changelog_clicked(self, *_: Any) -> None:
@@ -160,46 +265,151 @@ class MainPresenter:
     def on_menu_about_clicked(self, *_: Any) -> None:
         self.main_view.show_about_dialog()
 
+    def on_menu_diagnostics_clicked(self, *_: Any) -> None:
+        self.main_view.show_diagnostics(METRICS.get_histograms())
+
+    def on_diagnostics_refresh_button_clicked(self, *_: Any) -> None:
+        self.main_view.show_diagnostics(METRICS.get_histograms())
+
+    def on_diagnostics_reset_button_clicked(self, *_: Any) -> None:
+        METRICS.reset()
+        self.main_view.show_diagnostics(METRICS.get_histograms())
+
+    def on_diagnostics_save_button_clicked(self, *_: Any) -> None:
+        filename = self.main_view.choose_diagnostics_file()
+        if filename:
+            lanes = {name: metrics.__dict__ for name, metrics in self._executor.get_metrics().items()}
+            try:
+                with open(filename, 'w') as file:
+                    file.write(METRICS.to_json({'lanes': lanes}))
+                self.main_view.set_statusbar_text(f"Diagnostics saved to {filename}")
+            except OSError as err:
+                _LOG.exception("Unable to save diagnostics")
+                self.main_view.show_error_message_dialog("Unable to save diagnostics", str(err))
+
+    def on_menu_benchmark_history_clicked(self, *_: Any) -> None:
+        self._load_benchmark_history()
+
+    def on_benchmark_history_refresh_button_clicked(self, *_: Any) -> None:
+        self._load_benchmark_history()
+
+    def on_benchmark_history_baseline_button_clicked(self, *_: Any) -> None:
+        timestamp = self.main_view.get_selected_benchmark_run()
+        if timestamp is not None:
+            self._settings_interactor.set_str('settings_benchmark_baseline', repr(timestamp))
+            self._load_benchmark_history()
+
+    def on_benchmark_run_selected(self, *_: Any) -> None:
+        timestamp = self.main_view.get_selected_benchmark_run()
+        baseline_timestamp = self._get_benchmark_baseline()
+        if timestamp is None or baseline_timestamp is None:
+            self.main_view.show_benchmark_comparison(None)
+            return
+        self._composite_disposable.add(
+            self._history_interactor.compare_stress_tests_runs(baseline_timestamp, timestamp).pipe(
+                operators.subscribe_on(self._executor.get_scheduler(_LANE_HISTORY)),
+                operators.observe_on(self._main_scheduler),
+            ).subscribe(on_next=self.main_view.show_benchmark_comparison,
+                        on_error=lambda e: _LOG.exception(f"Benchmark comparison error: {str(e)}")))
+
+    def _load_benchmark_history(self) -> None:
+        self._composite_disposable.add(self._history_interactor.get_stress_tests_records().pipe(
+            operators.subscribe_on(self._executor.get_scheduler(_LANE_HISTORY)),
+            operators.observe_on(self._main_scheduler),
+        ).subscribe(on_next=lambda records: self.main_view.show_benchmark_history(records,
+                                                                                  self._get_benchmark_baseline()),
+                    on_error=lambda e: _LOG.exception(f"Benchmark history error: {str(e)}")))
+
+    def _get_benchmark_baseline(self) -> Optional[float]:
+        baseline = self._settings_interactor.get_str('settings_benchmark_baseline')
+        return float(baseline) if baseline else None
+
     @staticmethod
     def on_quit_clicked(*_: Any) -> None:
         get_default_application().quit()
 
     def on_read_all_button_clicked(self, *_: Any) -> None:
         self._composite_disposable.add(reactivex.just(self._system_info).pipe(
-            operators.subscribe_on(self._scheduler),
             operators.flat_map(self._load_dmi_decode),
-            operators.observe_on(GtkScheduler(GLib)),
+            operators.observe_on(self._main_scheduler),
         ).subscribe(on_next=self._handle_read_all_result,
                     on_error=lambda e: _LOG.exception(f"Refresh error: {str(e)}")))
 
     def on_stress_tests_toggle_button_clicked(self, *_: Any) -> None:
         if self._stress_ng_interactor.is_running():
             self._composite_disposable.add(self._stress_ng_interactor.terminate().pipe(
-                operators.subscribe_on(self._scheduler),
-                operators.observe_on(GtkScheduler(GLib)),
+                operators.subscribe_on(self._executor.get_scheduler(_LANE_STRESS_NG_CONTROL)),
+                operators.observe_on(self._main_scheduler),
                 operators.finally_action(self._refresh_stress_tests_toggle_button)
             ).subscribe(on_error=lambda e: _LOG.exception(f"Stop stress test error: {str(e)}")))
         else:
             self._toggle_chronometer(True)
             self.main_view.toggle_stress_tests_button(True)
+            self._stress_tests_self_usage = self._self_usage_interactor.read()
+            self._self_usage_warning_shown = False
+            self._stress_tests_failures_shown = 0
             stressor_id, workers, timeout = self.main_view.get_stress_test_config()
             stressor_cmd = self._get_stressors_interactor.get(stressor_id)
             verify = True
-            if 'benchmark' in stressor_id:
+            if stressor_id == 'benchmark-core-sweep':
+                verify = False
+                timeout = self._get_stressors_interactor.get_benchmark_timeout()
+                workers = 1
+                execution = self._stress_ng_interactor.execute_core_sweep(
+                    stressor_cmd, self._system_info.cpu_info.get_physical_cores(), timeout,
+                    self._settings_interactor.get_int('settings_core_sweep_budget'),
+                    self._settings_interactor.get_int('settings_benchmark_noise_threshold'),
+                    self._settings_interactor.get_int('settings_benchmark_settle_timeout'))
+            elif 'benchmark' in stressor_id:
                 verify = False
-                timeout = 8
+                timeout = self._get_stressors_interactor.get_benchmark_timeout()
                 workers = 1 if 'single' in stressor_id else 0
+                execution = self._stress_ng_interactor.execute_benchmark(
+                    stressor_cmd, workers, timeout,
+                    self._settings_interactor.get_int('settings_benchmark_runs'),
+                    self._settings_interactor.get_int('settings_benchmark_cool_down'),
+                    self._settings_interactor.get_int('settings_benchmark_noise_threshold'),
+                    self._settings_interactor.get_int('settings_benchmark_settle_timeout'))
+            else:
+                execution = self._stress_ng_interactor.execute(stressor_cmd, workers, timeout, verify)
 
             self._composite_disposable.add(
-                self._stress_ng_interactor.execute(stressor_cmd, workers, timeout, verify).pipe(
-                    operators.subscribe_on(self._scheduler),
-                    operators.observe_on(GtkScheduler(GLib)),
+                execution.pipe(
+                    operators.subscribe_on(self._executor.get_scheduler(_LANE_STRESS_NG)),
+                    operators.do_action(on_next=self._add_self_usage),
+                    operators.do_action(on_next=lambda result: self._record_stress_tests_result(
+                        stressor_id, workers, timeout, verify, result)),
+                    operators.observe_on(self._main_scheduler),
                     operators.finally_action(self._refresh_stress_tests_toggle_button)
                 ).subscribe(on_next=self._on_stress_tests_result,
                             on_error=lambda e: _LOG.exception(f"Start stress test error: {str(e)}")))
 
+    def _add_self_usage(self, result: StressTestsResult) -> None:
+        self_usage = self._self_usage_interactor.read()
+        if self._stress_tests_self_usage is not None:
+            result.self_cpu_percent = self_usage.get_cpu_percent_since(self._stress_tests_self_usage)
+        result.self_rss = self_usage.rss
+        result.self_threads = self_usage.threads
+
+    def _record_stress_tests_result(self,
+                                    stressor_id: str,
+                                    workers: int,
+                                    timeout: int,
+                                    verify: bool,
+                                    result: StressTestsResult) -> None:
+        # a benchmark stopped while waiting to start has no result
+        if result.return_code is not None:
+            self._history_interactor.record_stress_tests_result(
+                stressor_id, workers, timeout, verify, result, self._system_info)
+
     def _on_stress_tests_result(self, result: StressTestsResult) -> None:
         self.main_view.update_stress_tests_result(result)
+        if result.core_scores:
+            self.main_view.show_core_sweep(result.core_scores)
+        if result.noisy and result.noise is not None:
+            self.main_view.show_main_infobar_message(
+                f"The benchmark ran while other processes were using {result.noise.cpu_percent:.0f}% of the CPU, "
+                f"the score is not reliable. Busiest processes: {result.noise.get_summary()}")
         if result.successful is not None:
             if result.successful:
                 self._notify_interactor.show("✔ Successful run completed️")
@@ -208,16 +418,85 @@ class MainPresenter:
 
     def _start_refresh(self) -> None:
         _LOG.debug("start refresh")
+        if self._refresh_disposable is not None:
+            self._composite_disposable.remove(self._refresh_disposable)
         refresh_interval = self._settings_interactor.get_int('settings_refresh_interval')
-        self._composite_disposable.add(reactivex.interval(refresh_interval, scheduler=self._scheduler).pipe(
+        self._refresh_disposable = reactivex.interval(
+            refresh_interval, scheduler=self._executor.get_scheduler(_LANE_REFRESH)
+        ).pipe(
+            operators.map(lambda _: self._system_info),
+            operators.flat_map(lambda system_info: reactivex.fork_join(
+                self._load_proc_cpuinfo(system_info),
+                self._load_lm_sensors(system_info),
+                self._load_psutil(system_info),
+                self._load_self_usage(system_info),
+            )),
+            operators.map(lambda _: self._system_info),
+            operators.do_action(on_next=self._record_samples),
+            operators.observe_on(self._main_scheduler),
+        ).subscribe(on_next=self._on_system_info_refreshed,
+                    on_error=lambda e: _LOG.exception(f"Refresh error: {str(e)}"))
+        self._composite_disposable.add(self._refresh_disposable)
+
+    def _on_system_info_refreshed(self, system_info: SystemInfo) -> None:
+        self.main_view.refresh_system_info()
+        cpu_percent = system_info.self_usage.cpu_percent
+        budget = self._settings_interactor.get_int('settings_self_usage_budget')
+        if cpu_percent is not None and cpu_percent > budget and not self._self_usage_warning_shown \
+                and self._stress_ng_interactor.is_running():
+            self._self_usage_warning_shown = True
+            _LOG.warning(f"{APP_NAME} is using {cpu_percent:.1f}% of a core, above the {budget}% budget")
+            self.main_view.show_main_infobar_message(
+                f"{APP_NAME} itself is using {cpu_percent:.1f}% of a CPU core (budget {budget}%), "
+                f"the stress test results may be affected. Consider increasing the refresh interval.")
+
+    def _record_samples(self, system_info: SystemInfo) -> None:
+        # the history is only kept while a stress test is running, that is when it is worth looking at it later
+        if self._stress_ng_interactor.is_running():
+            self._history_interactor.record_samples(system_info)
+
+    def _prune_history(self) -> None:
+        self._composite_disposable.add(self._history_interactor.prune_samples().pipe(
+            operators.subscribe_on(self._executor.get_scheduler(_LANE_HISTORY)),
+        ).subscribe(on_next=lambda count: _LOG.debug(f"Pruned or downsampled {count} history samples"),
+                    on_error=lambda e: _LOG.exception(f"Prune history error: {str(e)}")))
+
+    def _watch_stress_tests_progress(self) -> None:
+        self._composite_disposable.add(self._stress_ng_interactor.observe_progress().pipe(
+            operators.observe_on(self._main_scheduler),
+        ).subscribe(on_next=self._on_stress_tests_progress,
+                    on_error=lambda e: _LOG.exception(f"Stress tests progress error: {str(e)}")))
+
+    def _on_stress_tests_progress(self, progress: StressNgProgress) -> None:
+        if not self._stress_ng_interactor.is_running():
+            return  # queued before the run ended
+        self.main_view.update_stress_tests_progress(progress)
+        if len(progress.failures) > self._stress_tests_failures_shown:
+            self.main_view.set_statusbar_text(progress.failures[-1])
+            self._stress_tests_failures_shown = len(progress.failures)
+
+    def _watch_refresh_interval(self) -> None:
+        self._composite_disposable.add(self._settings_interactor.observe_changes().pipe(
+            operators.filter(lambda change: change.key == 'settings_refresh_interval'),
+            operators.observe_on(self._main_scheduler),
+        ).subscribe(on_next=self._on_refresh_interval_changed,
+                    on_error=lambda e: _LOG.exception(f"Refresh interval error: {str(e)}")))
+
+    def _on_refresh_interval_changed(self, change: SettingChange) -> None:
+        _LOG.debug(f"refresh interval changed to {change.value}s")
+        self._start_refresh()
+
+    def _watch_hotplug(self) -> None:
+        # repositories invalidated by the event rediscover their hardware, the others return their cached data
+        self._composite_disposable.add(self._watch_hotplug_interactor.execute().pipe(
+            operators.debounce(_HOTPLUG_DEBOUNCE_SECONDS, scheduler=self._executor.get_scheduler(_LANE_HOTPLUG)),
             operators.map(lambda _: self._system_info),
-            operators.subscribe_on(self._scheduler),
             operators.flat_map(self._load_proc_cpuinfo),
+            operators.flat_map(self._load_sys_devices_cache),
             operators.flat_map(self._load_lm_sensors),
-            operators.flat_map(self._load_psutil),
-            operators.observe_on(GtkScheduler(GLib)),
+            operators.observe_on(self._main_scheduler),
         ).subscribe(on_next=lambda _: self.main_view.refresh_system_info(),
-                    on_error=lambda e: _LOG.exception(f"Refresh error: {str(e)}")))
+                    on_error=lambda e: _LOG.exception(f"Hotplug error: {str(e)}")))
 
     def on_physical_package_selected(self, widget: Any, *_: Any) -> None:
         index = widget.get_active()
@@ -242,35 +521,49 @@ class MainPresenter:
         assert isinstance(observable, Observable)
         return observable
 
-    def _execute_stream_interactor(self, system_info: SystemInfo, interactor: Any) -> Observable:
+    def _execute_stream_interactor(self, system_info: SystemInfo, interactor: Any, lane: str) -> Observable:
         observable = interactor.execute(system_info).pipe(
+            operators.subscribe_on(self._executor.get_scheduler(lane)),
             operators.catch(self._log_exception_return_system_info_observable)
         )
         assert isinstance(observable, Observable)
         return observable
 
     def _load_proc_cpuinfo(self, system_info: SystemInfo) -> Observable:
-        return self._execute_stream_interactor(system_info, self._load_proc_cpuinfo_interactor)
+        return self._execute_stream_interactor(system_info, self._load_proc_cpuinfo_interactor, _LANE_PROC_CPUINFO)
 
     def _load_sys_devices_cache(self, system_info: SystemInfo) -> Observable:
-        return self._execute_stream_interactor(system_info, self._load_sys_devices_cache_interactor)
+        return self._execute_stream_interactor(system_info, self._load_sys_devices_cache_interactor,
+                                               _LANE_SYS_DEVICES_CACHE)
 
     def _load_sys_devices_dmi(self, system_info: SystemInfo) -> Observable:
-        return self._execute_stream_interactor(system_info, self._load_sys_devices_dmi_interactor)
+        return self._execute_stream_interactor(system_info, self._load_sys_devices_dmi_interactor,
+                                               _LANE_SYS_DEVICES_DMI)
 
     def _load_lm_sensors(self, system_info: SystemInfo) -> Observable:
-        return self._execute_stream_interactor(system_info, self._load_lm_sensors_interactor)
+        return self._execute_stream_interactor(system_info, self._load_lm_sensors_interactor, _LANE_LM_SENSORS)
 
     def _load_dmi_decode(self, system_info: SystemInfo) -> Observable:
-        return self._execute_stream_interactor(system_info, self._load_dmi_decode_interactor)
+        return self._execute_stream_interactor(system_info, self._load_dmi_decode_interactor, _LANE_DMI_DECODE)
+
+    def _load_dmi_decode_cache(self, system_info: SystemInfo) -> Observable:
+        return self._load_dmi_decode_interactor.load_cache(system_info).pipe(
+            operators.subscribe_on(self._executor.get_scheduler(_LANE_DMI_DECODE)),
+            operators.catch(self._log_exception_return_system_info_observable)
+        )
 
     def _load_psutil(self, system_info: SystemInfo) -> Observable:
-        return self._execute_stream_interactor(system_info, self._load_psutil_interactor)
+        return self._execute_stream_interactor(system_info, self._load_psutil_interactor, _LANE_PSUTIL)
+
+    def _load_self_usage(self, system_info: SystemInfo) -> Observable:
+        return self._execute_stream_interactor(system_info, self._self_usage_interactor, _LANE_SELF_USAGE)
 
     def _refresh_stress_tests_toggle_button(self) -> None:
         is_running = self._stress_ng_interactor.is_running()
         self._toggle_chronometer(is_running)
         self.main_view.toggle_stress_tests_button(is_running)
+        if not is_running:
+            self.main_view.update_stress_tests_progress(None)
 
     def _toggle_chronometer(self, should_run: bool) -> None:
         if should_run:
@@ -294,18 +587,21 @@ class MainPresenter:
 
     def _check_new_version(self) -> None:
         self._composite_disposable.add(self._check_new_version_interactor.execute().pipe(
-            operators.subscribe_on(self._scheduler),
-            operators.observe_on(GtkScheduler(GLib)),
+            operators.subscribe_on(self._executor.get_scheduler(_LANE_NETWORK)),
+            operators.observe_on(self._main_scheduler),
         ).subscribe(on_next=self._handle_new_version_response,
                     on_error=lambda e: _LOG.exception(f"Check new version error: {str(e)}")))
 
+    def _handle_dmi_decode_cache_result(self, result: Any) -> None:
+        if result is True:
+            self.main_view.init_cpu_info()
+            self.main_view.init_memory()
+            self._select_first_populated_mem_bank()
+
     def _handle_read_all_result(self, result: DmiDecodeRepositoryResult) -> None:
         if result == DmiDecodeRepositoryResult.SUCCESS:
             self.main_view.init_system_info()
-            for index, bank_info in enumerate(self._system_info.memory_bank_info_list):
-                if bank_info.size and bank_info.size[0].isdigit():
-                    self.main_view.select_mem_bank(index)
-                    break
+            self._select_first_populated_mem_bank()
             self.main_view.set_statusbar_text("Memory section updated")
 
         elif result == DmiDecodeRepositoryResult.ERROR_DMI_DECODE_NOT_AVAILABLE:
@@ -321,6 +617,12 @@ class MainPresenter:
                 "Something went wrong while trying to run dmidecode. Check the console output for details."
             )
 
+    def _select_first_populated_mem_bank(self) -> None:
+        for index, bank_info in enumerate(self._system_info.memory_bank_info_list):
+            if bank_info.size and bank_info.size[0].isdigit():
+                self.main_view.select_mem_bank(index)
+                break
+
     def _handle_generic_set_result(self, result: Any, name: str) -> bool:
         if not isinstance(result, bool):
             _LOG.exception(f"Set overclock error: {str(result)}")
@@ -15,4 +15,9 @@
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 
-PATH_SYS_SYSTEM = "/sys/devices/system"
+PATH_PROC = "/proc"
+PATH_SYS = "/sys"
+PATH_SYS_SYSTEM = PATH_SYS + "/devices/system"
+# read the system information from another tree instead, e.g. one made by benchmarks/synthetic_tree.py
+ENV_PROC_ROOT = 'GST_PROC_ROOT'
+ENV_SYS_ROOT = 'GST_SYS_ROOT'
@@ -14,20 +14,45 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
+import json
 import logging
+import os
 import threading
+from contextlib import suppress
 from enum import Enum, auto
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 
 from injector import singleton, inject
 
+from gst.di import ProcRoot, SysRoot
 from gst.model.system_info import SystemInfo, MemoryBankInfo
+from gst.repository import PATH_SYS
+from gst.repository.privileged_helper_repository import PrivilegedHelperRepository, PrivilegedHelperError
 from gst.util.concurrency import synchronized_with_attr
-from gst.util.dmidecode import DmiParse, DmiType
-from gst.util.linux import is_root
-from gst.util.subprocess import run_on_host_and_get_stdout, check_if_command_is_available
+from gst.util.dmidecode import DmiParse, DmiRecord, DmiType
+from gst.util.metrics import timed
+from gst.util.path import get_cache_path
+from gst.util.privileged_helper import STATUS_NOT_FOUND
+from gst.util.smbios import SmbiosParse, SmbiosParseError
 
 _LOG = logging.getLogger(__name__)
+_DMI_TYPES = (DmiType.MEMORY_DEVICE, DmiType.PROCESSOR)
+_CACHE_FILE_NAME = 'dmi_decode.json'
+_CACHE_VERSION = 2
+_CACHE_EXCLUDED_KEYS = {'Serial Number', 'Asset Tag'}  # not shown, no reason to keep them on disk
+_FINGERPRINT_KEYS = ['bios_vendor', 'bios_date', 'bios_version']
+_FINGERPRINT_ROOT_ONLY_KEYS = ['board_serial', 'tables']
+_FINGERPRINT_MEMORY_KEY = 'memory'
+_MEM_TOTAL_ROUNDING_KIB = 256 * 1024  # MemTotal moves a little between kernels, adding or removing a DIMM does not
+
+
+class _CachedDmi:
+    def __init__(self, records: Dict[int, List[DmiRecord]]) -> None:
+        self._records = records
+
+    def get_type(self, dmi_type: int) -> List[DmiRecord]:
+        return self._records.get(dmi_type, [])
 
 
 class DmiDecodeRepositoryResult(Enum):
@@ -39,26 +64,153 @@ class DmiDecodeRepositoryResult(Enum):
 @singleton
 class DmiDecodeRepository:
     @inject
-    def __init__(self) -> None:
+    def __init__(self,
+                 sys_root: SysRoot,
+                 proc_root: ProcRoot,
+                 privileged_helper_repository: PrivilegedHelperRepository) -> None:
         self._lock = threading.RLock()
+        self._privileged_helper_repository = privileged_helper_repository
+        self._path_dmi_tables = os.path.join(sys_root, 'firmware', 'dmi', 'tables')
+        self._path_sys_virtual_dmi = os.path.join(sys_root, 'devices', 'virtual', 'dmi', 'id')
+        self._path_sys_memory = os.path.join(sys_root, 'devices', 'system', 'memory')
+        self._path_proc_meminfo = os.path.join(proc_root, 'meminfo')
+        self._path_cache = get_cache_path(_CACHE_FILE_NAME)
 
     @synchronized_with_attr("_lock")
+    @timed("repository/dmi_decode")
     def refresh(self, system_info: SystemInfo) -> DmiDecodeRepositoryResult:
-        cmd = ['dmidecode']
+        # the tables exported by the kernel are readable only by root, everyone else goes through the helper
+        dmi: Optional[Union[SmbiosParse, DmiParse]] = self._read_dmi_tables()
+        if dmi is None:
+            result = self._read_with_privileged_helper()
+            if isinstance(result, DmiDecodeRepositoryResult):
+                return result
+            dmi = result
+        self._update_system_info(dmi, system_info)
+        self._write_cache(dmi)
+        return DmiDecodeRepositoryResult.SUCCESS
+
+    # DIMMs and firmware rarely change between boots: the last result is kept on disk and used until the
+    # firmware fingerprint changes, so that the memory banks can be shown without asking for a password
+    @synchronized_with_attr("_lock")
+    @timed("repository/dmi_decode_cache")
+    def load_cache(self, system_info: SystemInfo) -> bool:
+        try:
+            with open(self._path_cache, 'r') as file:
+                cache = json.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            _LOG.exception(f"Unable to read {self._path_cache}")
+            return False
+        if cache.get('version') != _CACHE_VERSION \
+                or not self._is_fingerprint_matching(cache.get('fingerprint', {}), self._get_fingerprint()):
+            _LOG.info("Firmware changed, ignoring the cached dmidecode result")
+            return False
+        self._update_system_info(_CachedDmi({int(t): records for t, records in cache['records'].items()}),
+                                 system_info)
+        return True
+
+    def _write_cache(self, dmi: Union[SmbiosParse, DmiParse]) -> None:
+        records = {
+            int(dmi_type): [{key: value for key, value in record.items() if key not in _CACHE_EXCLUDED_KEYS}
+                            for record in dmi.get_type(dmi_type)]
+            for dmi_type in _DMI_TYPES
+        }
+        cache = {'version': _CACHE_VERSION, 'fingerprint': self._get_fingerprint(), 'records': records}
+        try:
+            with open(self._path_cache + '.tmp', 'w') as file:
+                json.dump(cache, file, indent=1)
+            os.replace(self._path_cache + '.tmp', self._path_cache)
+        except OSError:
+            _LOG.exception(f"Unable to write {self._path_cache}")
 
-        if not check_if_command_is_available(cmd[0], True):
-            return DmiDecodeRepositoryResult.ERROR_DMI_DECODE_NOT_AVAILABLE
+    def _get_fingerprint(self) -> Dict[str, Optional[str]]:
+        fingerprint: Dict[str, Optional[str]] = {}
+        for key in _FINGERPRINT_KEYS:
+            content = self._read_bytes(os.path.join(self._path_sys_virtual_dmi, key))
+            fingerprint[key] = None if content is None else content.decode(errors='replace').strip()
+        # readable only by root, hashed to keep the serial number out of the cache file
+        for key, path in zip(_FINGERPRINT_ROOT_ONLY_KEYS, [os.path.join(self._path_sys_virtual_dmi, 'board_serial'),
+                                                          os.path.join(self._path_dmi_tables, 'DMI')]):
+            content = self._read_bytes(path)
+            fingerprint[key] = None if content is None else hashlib.sha256(content).hexdigest()
+        # the BIOS keys stay the same when DIMMs are added or removed, the amount of memory does not
+        fingerprint[_FINGERPRINT_MEMORY_KEY] = self._get_memory_fingerprint()
+        return fingerprint
 
-        if not is_root():
-            cmd.insert(0, 'pkexec')
-        result = run_on_host_and_get_stdout(cmd)
-        _LOG.debug(f"Exit code: {result[0]}. {result[1]}\n{result[2]}")
+    def _get_memory_fingerprint(self) -> Optional[str]:
+        # the memory blocks cover all the installed memory, even the blocks that are offline
+        block_size = self._read_bytes(os.path.join(self._path_sys_memory, 'block_size_bytes'))
+        if block_size is not None:
+            with suppress(OSError):
+                blocks = sum(1 for name in os.listdir(self._path_sys_memory)
+                             if name.startswith('memory') and name[len('memory'):].isdigit())
+                return f"{blocks} blocks of 0x{block_size.decode(errors='replace').strip()} bytes"
+        meminfo = self._read_bytes(self._path_proc_meminfo)
+        if meminfo is not None:
+            for line in meminfo.decode(errors='replace').splitlines():
+                if line.startswith('MemTotal:'):
+                    mem_total_kib = int(line.split()[1])
+                    return f"{round(mem_total_kib / _MEM_TOTAL_ROUNDING_KIB) * _MEM_TOTAL_ROUNDING_KIB} kB"
+        return None
 
-        if result[0] != 0:
-            _LOG.error(f"Error executing dmidecode (exit code {result[0]}): {result[2]}")
+    @staticmethod
+    def _is_fingerprint_matching(cached: Dict[str, Optional[str]], current: Dict[str, Optional[str]]) -> bool:
+        if all(current[key] is None for key in _FINGERPRINT_KEYS) \
+                or any(cached.get(key) != current[key] for key in _FINGERPRINT_KEYS) \
+                or cached.get(_FINGERPRINT_MEMORY_KEY) != current[_FINGERPRINT_MEMORY_KEY]:
+            return False
+        # the root only values can be compared only if they could be read both times
+        return all(cached.get(key) is None or current[key] is None or cached.get(key) == current[key]
+                   for key in _FINGERPRINT_ROOT_ONLY_KEYS)
+
+    @staticmethod
+    def _read_bytes(path: str) -> Optional[bytes]:
+        try:
+            with open(path, 'rb') as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _read_dmi_tables(self) -> Optional[SmbiosParse]:
+        path_entry_point = os.path.join(self._path_dmi_tables, 'smbios_entry_point')
+        path_table = os.path.join(self._path_dmi_tables, 'DMI')
+        if not os.access(path_entry_point, os.R_OK) or not os.access(path_table, os.R_OK):
+            return None
+        try:
+            with open(path_entry_point, 'rb') as file:
+                entry_point = file.read()
+            with open(path_table, 'rb') as file:
+                table = file.read()
+            return SmbiosParse(entry_point, table, _DMI_TYPES)
+        except (OSError, SmbiosParseError):
+            _LOG.exception(f"Unable to decode the SMBIOS tables in {self._path_dmi_tables}")
+            return None
+
+    def _read_with_privileged_helper(self) -> Union[SmbiosParse, DmiParse, DmiDecodeRepositoryResult]:
+        try:
+            # the helper reads the real /sys, not a custom root
+            if self._path_dmi_tables == os.path.join(PATH_SYS, 'firmware', 'dmi', 'tables'):
+                try:
+                    entry_point = self._privileged_helper_repository.read_file(
+                        os.path.join(self._path_dmi_tables, 'smbios_entry_point'))
+                    table = self._privileged_helper_repository.read_file(os.path.join(self._path_dmi_tables, 'DMI'))
+                    return SmbiosParse(entry_point, table, _DMI_TYPES)
+                except SmbiosParseError:
+                    _LOG.exception("Unable to decode the SMBIOS tables, running dmidecode")
+                except PrivilegedHelperError as err:
+                    if err.status is None:
+                        raise
+                    _LOG.warning(f"Unable to read the SMBIOS tables, running dmidecode: {err}")
+            return DmiParse(self._privileged_helper_repository.run_dmidecode(), _DMI_TYPES)
+        except PrivilegedHelperError as err:
+            if err.status == STATUS_NOT_FOUND:
+                return DmiDecodeRepositoryResult.ERROR_DMI_DECODE_NOT_AVAILABLE
+            _LOG.error(f"Error reading the DMI data with the privileged helper: {err}")
             return DmiDecodeRepositoryResult.ERROR_GENERIC
 
-        dmi = DmiParse(result[1])
+    def _update_system_info(self, dmi: Union[SmbiosParse, DmiParse], system_info: SystemInfo) -> None:
         dmi_entry_list = dmi.get_type(DmiType.MEMORY_DEVICE.value)
         memory_bank_info_list = []
         for entry in dmi_entry_list:
@@ -100,7 +252,6 @@ class DmiDecodeRepository:
                                     and processor.model == model \
                                     and processor.stepping == stepping:
                                 processor.package = package
-        return DmiDecodeRepositoryResult.SUCCESS
 
     @staticmethod
     def _get_entry_value(key: str, entry: Dict) -> Optional[str]:
@@ -0,0 +1,61 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import glob
+import logging
+import os
+from typing import Optional, Set
+
+from injector import singleton, inject
+
+from gst.di import SysRoot
+from gst.model.hardware_fingerprint import HardwareFingerprint
+from gst.model.system_info import SystemInfo
+from gst.util.metrics import timed
+
+_LOG = logging.getLogger(__name__)
+
+
+@singleton
+class HardwareFingerprintRepository:
+    @inject
+    def __init__(self, sys_root: SysRoot) -> None:
+        self._path_sys_cpu = os.path.join(sys_root, 'devices', 'system', 'cpu')
+
+    @timed("repository/hardware_fingerprint")
+    def read(self, system_info: SystemInfo) -> HardwareFingerprint:
+        fingerprint = HardwareFingerprint()
+        for physical_package in system_info.cpu_info.physical_package_id_list:
+            processor = next(iter(physical_package.values()), None)
+            if processor is not None:
+                fingerprint.cpu_model = processor.name
+                fingerprint.microcode = processor.microcode
+                break
+        fingerprint.bios_version = system_info.mobo_info.bios_version
+        fingerprint.kernel = os.uname().release
+        fingerprint.governor = self._read_governors()
+        return fingerprint
+
+    def _read_governors(self) -> Optional[str]:
+        # normally all the cores use the same governor, a mix is reported as a comma separated list
+        governors: Set[str] = set()
+        for path in glob.glob(os.path.join(self._path_sys_cpu, 'cpu[0-9]*', 'cpufreq', 'scaling_governor')):
+            try:
+                with open(path) as file:
+                    governors.add(file.read().strip())
+            except OSError:
+                _LOG.debug(f"Unable to read {path}")
+        return ','.join(sorted(governors)) or None
@@ -0,0 +1,175 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from injector import singleton, inject
+from peewee import SqliteDatabase, chunked, fn, Field, Model
+
+from gst.model.core_score_record import CoreScoreRecord
+from gst.model.sample import Sample
+from gst.model.sample_summary import SampleSummary
+from gst.model.stress_tests_record import StressTestsRecord
+from gst.model.stressor_record import StressorRecord
+from gst.util.concurrency import synchronized_with_attr
+
+_LOG = logging.getLogger(__name__)
+# keeps each INSERT below the default SQLITE_MAX_VARIABLE_NUMBER of older SQLite versions (999)
+_INSERT_CHUNK_ROWS = 300
+_WRITER_MAX_BATCH_ROWS = 50000
+_SAMPLE_FIELDS = [Sample.timestamp, Sample.key, Sample.value]
+
+SampleRow = Tuple[float, str, Optional[float]]  # (timestamp, key, value)
+
+
+class _WriteRequest:
+    def __init__(self, model: Any, fields: List[Field], rows: Sequence[Sequence[Any]]) -> None:
+        self.model = model
+        self.fields = fields
+        self.rows = rows
+
+
+@singleton
+class HistoryRepository:
+    @inject
+    def __init__(self, database: SqliteDatabase) -> None:
+        self._lock = threading.RLock()
+        self._database = database
+        self._write_queue: 'queue.Queue[Optional[_WriteRequest]]' = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    def insert_samples(self, rows: Sequence[SampleRow]) -> None:
+        with self._database.atomic():
+            self._insert_many(Sample, _SAMPLE_FIELDS, rows)
+
+    # the add_* methods only queue the rows for the background writer, they never block on SQLite
+    def add_samples(self, rows: Sequence[SampleRow]) -> None:
+        self._enqueue(_WriteRequest(Sample, _SAMPLE_FIELDS, rows))
+
+    def add_stress_tests_record(self, record: Dict[str, Any]) -> None:
+        fields = [getattr(StressTestsRecord, name) for name in record]
+        self._enqueue(_WriteRequest(StressTestsRecord, fields, [tuple(record.values())]))
+
+    def add_stressor_records(self, records: Sequence[Dict[str, Any]]) -> None:
+        if records:
+            fields = [getattr(StressorRecord, name) for name in records[0]]
+            self._enqueue(_WriteRequest(StressorRecord, fields, [tuple(record.values()) for record in records]))
+
+    def add_core_score_records(self, records: Sequence[Dict[str, Any]]) -> None:
+        if records:
+            fields = [getattr(CoreScoreRecord, name) for name in records[0]]
+            self._enqueue(_WriteRequest(CoreScoreRecord, fields, [tuple(record.values()) for record in records]))
+
+    def get_samples(self, key: str, start: float, end: Optional[float] = None) -> List[Tuple[float, Optional[float]]]:
+        # the downsampled part of the range has one average per bucket, the rest the raw samples
+        summary_query = SampleSummary.select(SampleSummary.timestamp, SampleSummary.avg_value).where(
+            (SampleSummary.key == key) & (SampleSummary.timestamp >= start))
+        query = Sample.select(Sample.timestamp, Sample.value).where((Sample.key == key) & (Sample.timestamp >= start))
+        if end is not None:
+            summary_query = summary_query.where(SampleSummary.timestamp < end)
+            query = query.where(Sample.timestamp < end)
+        return list(summary_query.order_by(SampleSummary.timestamp).tuples()) + \
+            list(query.order_by(Sample.timestamp).tuples())
+
+    def get_stress_tests_records(self, limit: int = 100) -> List[StressTestsRecord]:
+        return list(StressTestsRecord.select().order_by(StressTestsRecord.timestamp.desc()).limit(limit))
+
+    def get_stress_tests_record(self, timestamp: float) -> Optional[StressTestsRecord]:
+        return StressTestsRecord.get_or_none(StressTestsRecord.timestamp == timestamp)
+
+    def get_stressor_records(self, run_timestamp: float) -> List[StressorRecord]:
+        return list(StressorRecord.select()
+                    .where(StressorRecord.run_timestamp == run_timestamp)
+                    .order_by(StressorRecord.stressor))
+
+    def get_core_score_records(self, run_timestamp: float) -> List[CoreScoreRecord]:
+        return list(CoreScoreRecord.select()
+                    .where(CoreScoreRecord.run_timestamp == run_timestamp)
+                    .order_by(CoreScoreRecord.physical_package_id, CoreScoreRecord.core_id))
+
+    def downsample_samples_older_than(self, timestamp: float, bucket_seconds: int) -> int:
+        # the cutoff is aligned to a bucket, so that no bucket is summarized twice
+        cutoff = timestamp - timestamp % bucket_seconds
+        bucket = (Sample.timestamp / bucket_seconds).cast('INTEGER') * bucket_seconds
+        query = (Sample
+                 .select(bucket, Sample.key, fn.MIN(Sample.value), fn.AVG(Sample.value), fn.MAX(Sample.value),
+                         fn.COUNT(Sample.id))
+                 .where(Sample.timestamp < cutoff)
+                 .group_by(Sample.key, bucket))
+        with self._database.atomic():
+            SampleSummary.insert_from(query, fields=[SampleSummary.timestamp, SampleSummary.key,
+                                                     SampleSummary.min_value, SampleSummary.avg_value,
+                                                     SampleSummary.max_value, SampleSummary.sample_count]).execute()
+            return int(Sample.delete().where(Sample.timestamp < cutoff).execute())
+
+    def delete_samples_older_than(self, timestamp: float) -> int:
+        with self._database.atomic():
+            SampleSummary.delete().where(SampleSummary.timestamp < timestamp).execute()
+            return int(Sample.delete().where(Sample.timestamp < timestamp).execute())
+
+    @synchronized_with_attr("_lock")
+    def close(self) -> None:
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    @synchronized_with_attr("_lock")
+    def _enqueue(self, request: _WriteRequest) -> None:
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name='gst-history-writer', daemon=True)
+            self._writer.start()
+        self._write_queue.put(request)
+
+    def _write_loop(self) -> None:
+        running = True
+        try:
+            while running:
+                pending = [self._write_queue.get()]
+                # drain whatever piled up meanwhile, so that a burst is written in a single transaction
+                row_count = 0
+                while row_count < _WRITER_MAX_BATCH_ROWS:
+                    try:
+                        request = self._write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    pending.append(request)
+                    if request is not None:
+                        row_count += len(request.rows)
+                # None is the sentinel queued by close()
+                running = None not in pending
+                requests: List[_WriteRequest] = [request for request in pending if request is not None]
+                try:
+                    self._write(requests)
+                except Exception:  # pylint: disable=broad-except
+                    _LOG.exception("Unable to write history")
+        finally:
+            self._database.close()
+
+    def _write(self, requests: List[_WriteRequest]) -> None:
+        if not requests:
+            return
+        with self._database.atomic():
+            for request in requests:
+                self._insert_many(request.model, request.fields, request.rows)
+
+    @staticmethod
+    def _insert_many(model: Model, fields: List[Field], rows: Sequence[Sequence[Any]]) -> None:
+        for batch in chunked(rows, _INSERT_CHUNK_ROWS):
+            model.insert_many(batch, fields=fields).execute()
@@ -16,14 +16,16 @@
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 import logging
 import threading
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from injector import singleton, inject
 
+from gst.model.hardware_monitor import HwMonitoredItemKey
 from gst.model.monitored_item import MonitoredItem
 from gst.model.system_info import SystemInfo
 from gst.util import sensors
 from gst.util.concurrency import synchronized_with_attr
+from gst.util.metrics import timed
 from gst.util.sensors import FeatureType
 
 _LOG = logging.getLogger(__name__)
@@ -33,55 +35,110 @@ _SENSOR_MIN_TEMP = -127
 _SENSOR_MAX_TEMP = 215
 
 
+class _DiscoveredFeature:
+    def __init__(self,
+                 chip: sensors.ChipName,
+                 chip_name: str,
+                 feature: sensors.Feature,
+                 subfeatures: List[sensors.Subfeature]) -> None:
+        self.chip = chip
+        self.chip_name = chip_name
+        self.subfeatures = subfeatures
+        self.skipname = len(feature.name) + 1  # skip common prefix
+        self.item_id = feature.name.decode("utf-8")
+        self.item_name = sensors.get_label(chip, feature)
+        self.item_type = sensors.FeatureType(feature.type)
+
+
 @singleton
 class LmSensorsRepository:
     @inject
     def __init__(self) -> None:
         self._lock = threading.RLock()
+        self._sensors_initialized = False
+        self._discovery_needed = True
+        self._hotplug_events_enabled = False
+        self._discovered_features: List[_DiscoveredFeature] = []
+
+    def invalidate(self) -> None:
+        self._discovery_needed = True
+
+    def set_hotplug_events_enabled(self, enabled: bool) -> None:
+        self._hotplug_events_enabled = enabled
+        self._discovery_needed = True
 
     @synchronized_with_attr("_lock")
+    @timed("repository/lm_sensors")
     def refresh(self, system_info: SystemInfo) -> SystemInfo:
+        # without hotplug events the only way to notice new or removed chips is to enumerate them every time
+        discovery = self._discovery_needed or not self._hotplug_events_enabled
+        # cleared before discovering, so that an invalidate() arriving meanwhile is not lost
+        self._discovery_needed = False
+        if discovery:
+            self._discover_or_retry()
+        present_keys: Set[HwMonitoredItemKey] = set()
+        for discovered_feature in self._discovered_features:
+            item = self._read_feature(discovered_feature)
+            system_info.hwmon.set_hw_monitored_item(discovered_feature.chip_name, item)
+            present_keys.add((discovered_feature.chip_name, item.value_type, item.item_id))
+        if discovery:
+            system_info.hwmon.remove_missing_hw_monitored_items(present_keys)
+        return system_info
+
+    def _discover_or_retry(self) -> None:
+        try:
+            self._discover()
+        except Exception:
+            self._discovery_needed = True
+            raise
+
+    def _discover(self) -> None:
+        _LOG.debug("discovering lm-sensors chips")
+        self._discovered_features = []
+        if self._sensors_initialized:
+            sensors.cleanup()
+        self._sensors_initialized = False
         sensors.init()
+        self._sensors_initialized = True
         for chip in sensors.ChipIterator():
             chip_name = sensors.chip_snprintf_name(chip)
             for feature in sensors.FeatureIterator(chip):
                 subfeatures = list(sensors.SubFeatureIterator(chip, feature))  # get a list of all subfeatures
+                self._discovered_features.append(_DiscoveredFeature(chip, chip_name, feature, subfeatures))
 
-                item_id = feature.name.decode("utf-8")
-                item_name = sensors.get_label(chip, feature)
-                item_value: Optional[float] = None
-                item_average_value: Optional[float] = None
-                item_type = sensors.FeatureType(feature.type)
-
-                skipname = len(feature.name) + 1  # skip common prefix
-                additional_values: List[str] = []
-                for subfeature in subfeatures:
-                    short_name = subfeature.name[skipname:].decode("utf-8")
-                    try:
-                        value = sensors.get_value(chip, subfeature.number)
-                    except Exception:
-                        _LOG.warning(
-                            f"Unable to read "
-                            f"{chip.path.decode('utf-8')}/{subfeature.name.decode('utf-8')} ({chip_name})")
-                        value = None
-                    if short_name == _SHORT_NAME_INPUT:
-                        item_value = self._filter_value(item_type, item_value, value)
-                    elif short_name == _SHORT_NAME_AVERAGE:
-                        item_average_value = self._filter_value(item_type, item_average_value, value)
-                    else:
-                        self._add_additional_value(additional_values, short_name, value)
-
-                if item_value is None:
-                    item_value = item_average_value
-                elif item_average_value is not None:
-                    self._add_additional_value(additional_values, _SHORT_NAME_AVERAGE, item_average_value)
-
-                if additional_values:
-                    item_name = "{} ({})".format(item_name, ", ".join(additional_values))
-                item = MonitoredItem(item_id, item_name, item_value, item_type)
-                system_info.hwmon.set_hw_monitored_item(chip_name, item)
-        sensors.cleanup()
-        return system_info
+    def _read_feature(self, discovered_feature: _DiscoveredFeature) -> MonitoredItem:
+        chip = discovered_feature.chip
+        item_name = discovered_feature.item_name
+        item_type = discovered_feature.item_type
+        item_value: Optional[float] = None
+        item_average_value: Optional[float] = None
+
+        additional_values: List[str] = []
+        for subfeature in discovered_feature.subfeatures:
+            short_name = subfeature.name[discovered_feature.skipname:].decode("utf-8")
+            try:
+                value = sensors.get_value(chip, subfeature.number)
+            except Exception:
+                _LOG.warning(
+                    f"Unable to read "
+                    f"{chip.path.decode('utf-8')}/{subfeature.name.decode('utf-8')} "
+                    f"({discovered_feature.chip_name})")
+                value = None
+            if short_name == _SHORT_NAME_INPUT:
+                item_value = self._filter_value(item_type, item_value, value)
+            elif short_name == _SHORT_NAME_AVERAGE:
+                item_average_value = self._filter_value(item_type, item_average_value, value)
+            else:
+                self._add_additional_value(additional_values, short_name, value)
+
+        if item_value is None:
+            item_value = item_average_value
+        elif item_average_value is not None:
+            self._add_additional_value(additional_values, _SHORT_NAME_AVERAGE, item_average_value)
+
+        if additional_values:
+            item_name = "{} ({})".format(item_name, ", ".join(additional_values))
+        return MonitoredItem(discovered_feature.item_id, item_name, item_value, item_type)
 
     @staticmethod
     def _filter_value(feature_type: FeatureType, item: Optional[float], value: Optional[float]) -> Optional[float]:
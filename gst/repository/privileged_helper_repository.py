@@ -0,0 +1,161 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import os
+import socket
+import subprocess
+import threading
+from typing import Optional, Tuple
+
+from injector import singleton, inject
+
+from gst.util.concurrency import synchronized_with_attr
+from gst.util.deployment import is_flatpak
+from gst.util.linux import is_root
+from gst.util.metrics import timed
+from gst.util.privileged_helper import HEADER, HELPER_PATH, OP_PING, OP_READ_FILE, OP_RUN_DMIDECODE, STATUS_DENIED, \
+    STATUS_ERROR, STATUS_NOT_FOUND, STATUS_OK
+from gst.util.subprocess import find_command, get_host_command
+
+_LOG = logging.getLogger(__name__)
+_REQUEST_TIMEOUT = 30  # seconds, the first request has none because it waits for the authentication
+
+
+class PrivilegedHelperError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@singleton
+class PrivilegedHelperRepository:
+    # Starts the privileged helper the first time it is needed, so that the user authenticates once per
+    # session, and then sends it the requests over a Unix socket. See gst/util/privileged_helper.py.
+    @inject
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._process: Optional[subprocess.Popen] = None
+        self._socket: Optional[socket.socket] = None
+
+    @synchronized_with_attr("_lock")
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    @synchronized_with_attr("_lock")
+    @timed("repository/privileged_helper")
+    def read_file(self, path: str) -> bytes:
+        if is_flatpak():
+            raise PrivilegedHelperError("The privileged helper is not available in Flatpak", STATUS_DENIED)
+        if not self._is_helper_installed():
+            raise PrivilegedHelperError(f"{HELPER_PATH} is not installed", STATUS_DENIED)
+        return self._request(OP_READ_FILE, path.encode())
+
+    @synchronized_with_attr("_lock")
+    @timed("repository/privileged_helper")
+    def run_dmidecode(self) -> str:
+        if is_flatpak() or not self._is_helper_installed():
+            return self._run_dmidecode_once()
+        return self._request(OP_RUN_DMIDECODE, b'').decode(errors='replace')
+
+    @synchronized_with_attr("_lock")
+    def stop(self) -> None:
+        if self._socket is not None:
+            self._socket.close()  # the helper exits when its input is closed
+            self._socket = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                _LOG.warning("The privileged helper did not exit")
+            self._process = None
+
+    def _request(self, opcode: int, argument: bytes) -> bytes:
+        if not self.is_running():
+            self._start()
+        status, result = self._exchange(opcode, argument)
+        if status != STATUS_OK:
+            raise PrivilegedHelperError(result.decode(errors='replace'), status)
+        return result
+
+    def _start(self) -> None:
+        self.stop()
+        # only the installed helper is started, pkexec authorizes it with the action in com.leinardi.gst.policy
+        if not self._is_helper_installed():
+            raise PrivilegedHelperError(f"{HELPER_PATH} is not installed")
+        cmd = [HELPER_PATH]
+        if not is_root():
+            pkexec = find_command('pkexec')
+            if pkexec is None:
+                raise PrivilegedHelperError("pkexec not found")
+            cmd.insert(0, pkexec)
+        parent_socket, child_socket = socket.socketpair()
+        try:
+            self._process = subprocess.Popen(cmd, stdin=child_socket.fileno(), stdout=child_socket.fileno())
+        except OSError as err:
+            parent_socket.close()
+            raise PrivilegedHelperError(f"Unable to start the privileged helper: {err}") from err
+        finally:
+            child_socket.close()
+        self._socket = parent_socket
+        self._exchange(OP_PING, b'')
+        self._socket.settimeout(_REQUEST_TIMEOUT)
+        _LOG.info("Privileged helper started")
+
+    @staticmethod
+    def _is_helper_installed() -> bool:
+        return os.access(HELPER_PATH, os.X_OK)
+
+    # without the helper (Flatpak, or a prefix other than /usr) dmidecode is run through pkexec once per request,
+    # on the host under Flatpak since the helper cannot be installed there from the sandbox
+    @staticmethod
+    def _run_dmidecode_once() -> str:
+        dmidecode = find_command('dmidecode', on_host=True)
+        if dmidecode is None:
+            raise PrivilegedHelperError("dmidecode not found", STATUS_NOT_FOUND)
+        cmd = [dmidecode]
+        if not is_root():
+            pkexec = find_command('pkexec', on_host=True)
+            if pkexec is None:
+                raise PrivilegedHelperError("pkexec not found")
+            cmd.insert(0, pkexec)
+        process = subprocess.run(get_host_command(cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                 stdin=subprocess.DEVNULL, check=False)
+        if process.returncode != 0:
+            raise PrivilegedHelperError(f"dmidecode exited with {process.returncode}: "
+                                        f"{process.stderr.decode(errors='replace').strip()}", STATUS_ERROR)
+        return process.stdout.decode(errors='replace')
+
+    def _exchange(self, opcode: int, argument: bytes) -> Tuple[int, bytes]:
+        assert self._socket is not None
+        try:
+            self._socket.sendall(HEADER.pack(opcode, len(argument)) + argument)
+            status, length = HEADER.unpack(self._receive(HEADER.size))
+            return status, self._receive(length)
+        except (OSError, EOFError) as err:
+            # authentication dismissed, helper killed or timed out: start again on the next request
+            self.stop()
+            raise PrivilegedHelperError("The privileged helper is not running") from err
+
+    def _receive(self, size: int) -> bytes:
+        assert self._socket is not None
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._socket.recv(min(size - len(data), 1 << 20))
+            if not chunk:
+                raise EOFError()
+            data += chunk
+        return bytes(data)
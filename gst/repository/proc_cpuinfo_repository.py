@@ -18,31 +18,38 @@ import logging
 import os
 import re
 import threading
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set
 
 from injector import singleton, inject
 
+from gst.di import ProcRoot
+from gst.model.cpu_info import ClockMonitoredItemKey
 from gst.model.monitored_item import MonitoredItem
 from gst.model.processor import Processor
 from gst.model.system_info import SystemInfo
 from gst.util.concurrency import synchronized_with_attr
+from gst.util.metrics import timed
 from gst.util.sensors import FeatureType
 
 _LOG = logging.getLogger(__name__)
-PATH_PROC_CPUINFO = '/proc/cpuinfo'
 CLEAN_CPU_STRING_REGEX = r"chipset|company|components|computing|computer|corporation|communications|electronics|" \
                          r"electrical|electric|gmbh|group|incorporation|industrial|international|\bnee\b|revision" \
                          r"|semiconductor|software|technologies|technology|ltd\.|<ltd>|\bltd\b|inc\.|<inc>|\binc\b" \
                          r"|intl\.|co\.|<co>|corp\.|<corp>|\(tm\)|\(r\)|®|\(rev ..\)|\'|\"|\sinc\s*$|@|cpu |cpu deca" \
                          r"|([0-9]+|single|dual|two|triple|three|tri|quad|four|penta|five|hepta|six|hexa|seven|octa" \
                          r"|eight|multi)[ -]core|ennea|genuine|multi|processor|single|triple|[0-9\.]+ *[MmGg][Hh][Zz]"
+# fields that can change between two reads: topology (for hotplugged cores) and clocks
+_STEADY_STATE_NAMES = {'processor_id', 'core_speed', 'physical_package_id', 'core_id'}
 
 
 @singleton
 class ProcCpuinfoRepository:
     @inject
-    def __init__(self) -> None:
+    def __init__(self, proc_root: ProcRoot) -> None:
         self._lock = threading.RLock()
+        self._path_proc_cpuinfo = os.path.join(proc_root, 'cpuinfo')
+        self._discovery_needed = True
+        self._hotplug_events_enabled = False
 
     cpu_info_mapping = {
         'processor_id': [int, 'processor'],
@@ -61,20 +68,37 @@ class ProcCpuinfoRepository:
         'bugs': [str, 'bugs'],
         'bogomips': [float, 'bogomips'],
     }
+    _full_label_mapping = {label: name for name, labels in cpu_info_mapping.items() for label in labels[1:]}
+    _steady_state_label_mapping = {label: name for label, name in _full_label_mapping.items()
+                                   if name in _STEADY_STATE_NAMES}
+
+    def invalidate(self) -> None:
+        self._discovery_needed = True
+
+    def set_hotplug_events_enabled(self, enabled: bool) -> None:
+        self._hotplug_events_enabled = enabled
+        self._discovery_needed = True
 
     @synchronized_with_attr("_lock")
+    @timed("repository/proc_cpuinfo")
     def refresh(self, system_info: SystemInfo) -> SystemInfo:
-        if not os.path.exists(PATH_PROC_CPUINFO):
-            _LOG.warning("%s not found", PATH_PROC_CPUINFO)
+        if not os.path.exists(self._path_proc_cpuinfo):
+            _LOG.warning("%s not found", self._path_proc_cpuinfo)
             return system_info
 
         try:
-            with open(PATH_PROC_CPUINFO, 'r') as file:
+            with open(self._path_proc_cpuinfo, 'r') as file:
                 output = file.read()
         except IOError:
-            _LOG.exception("Error while reading %s", PATH_PROC_CPUINFO)
+            _LOG.exception("Error while reading %s", self._path_proc_cpuinfo)
             return system_info
 
+        # static fields are parsed again only when the CPU topology may have changed
+        full_parse = self._discovery_needed or not self._hotplug_events_enabled
+        # cleared before parsing, so that an invalidate() arriving meanwhile is not lost
+        self._discovery_needed = False
+        label_mapping = self._full_label_mapping if full_parse else self._steady_state_label_mapping
+
         # load data on a temp variable
         temp_processor_list: List[Processor] = []
         tmp_proc: Optional[Processor] = None
@@ -82,14 +106,18 @@ class ProcCpuinfoRepository:
             if ':' in line:
                 label, value = line.split(':', 1)
                 label = label.strip()
+                if label not in label_mapping:
+                    continue
                 value = value.strip()
-                if label in self.cpu_info_mapping['processor_id'][1:]:
+                name = label_mapping[label]
+                if name == 'processor_id':
                     tmp_proc = Processor()
                     temp_processor_list.append(tmp_proc)
-                self._parse_data(label, tmp_proc, value)
+                self._parse_data(name, tmp_proc, value)
 
         # needed to avoid adding twice cpus with same core_id (Hyperthreading/SMT)
         clock_dict: Dict[int, Dict[int, bool]] = {}
+        present_clock_keys: Set[ClockMonitoredItemKey] = set()
 
         for tmp_proc in temp_processor_list:
             # get final variable
@@ -109,26 +137,28 @@ class ProcCpuinfoRepository:
                         FeatureType.CLOCK
                     )
                     system_info.cpu_info.set_clock_monitored_item(tmp_proc.physical_package_id, item)
+                    present_clock_keys.add((tmp_proc.physical_package_id, tmp_proc.core_id))
             for attr, value in tmp_proc.__dict__.items():
                 if value is not None:
                     processor.__setattr__(attr, value)
 
+        # cores that went offline disappear from /proc/cpuinfo
+        system_info.cpu_info.remove_missing_clock_monitored_items(present_clock_keys)
         return system_info
 
-    def _parse_data(self, label: str, temp_processor: Processor, value: str) -> None:
-        for name, labels in self.cpu_info_mapping.items():
-            if label in labels[1:] and value:
-                if name == 'core_speed':
-                    temp_processor.core_speed = float(value) * 1000 * 1000
-                elif name == 'flags':
-                    temp_processor.flags = sorted(value.strip().split())
-                elif name == 'bugs':
-                    temp_processor.bugs = sorted(value.strip().split())
-                else:
-                    if name == 'specification':
-                        temp_processor.name = self.clean_cpu_string(value)
-                    value = labels[0](value)
-                    temp_processor.__setattr__(name, value)
+    def _parse_data(self, name: str, temp_processor: Processor, value: str) -> None:
+        if not value:
+            return
+        if name == 'core_speed':
+            temp_processor.core_speed = float(value) * 1000 * 1000
+        elif name == 'flags':
+            temp_processor.flags = sorted(value.strip().split())
+        elif name == 'bugs':
+            temp_processor.bugs = sorted(value.strip().split())
+        else:
+            if name == 'specification':
+                temp_processor.name = self.clean_cpu_string(value)
+            temp_processor.__setattr__(name, self.cpu_info_mapping[name][0](value))
 
     @staticmethod
     def clean_cpu_string(specification: str) -> str:
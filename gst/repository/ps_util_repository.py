@@ -14,23 +14,53 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import threading
+import time
+from contextlib import contextmanager, suppress
+from typing import Iterator
 
-import psutil
 from injector import singleton, inject
 
+from gst.di import ProcRoot
+from gst.repository import PATH_PROC
 from gst.model.system_info import SystemInfo
+from gst.model.system_noise import NoisyProcess, SystemNoise
 from gst.util.concurrency import synchronized_with_attr
+from gst.util.metrics import timed
+
+_NOISY_PROCESS_MIN_CPU_PERCENT = 1.0
 
 
 @singleton
 class PsUtilRepository:
     @inject
-    def __init__(self) -> None:
+    def __init__(self, proc_root: ProcRoot) -> None:
+        import psutil  # pylint: disable=import-outside-toplevel
         self._lock = threading.RLock()
+        self._proc_root = proc_root
+        # set once: the system wide statistics are read from the injected root, which can be a synthetic tree
+        psutil.PROCFS_PATH = proc_root
+
+    # processes are looked up in the real /proc, a synthetic tree has none of the processes GST starts.
+    # psutil.Process keeps the procfs path it was created with, so only the lookup needs to be in here
+    @contextmanager
+    def real_processes(self) -> Iterator[None]:
+        if self._proc_root == PATH_PROC:
+            yield
+            return
+        import psutil  # pylint: disable=import-outside-toplevel
+        with self._lock:
+            psutil.PROCFS_PATH = PATH_PROC
+            try:
+                yield
+            finally:
+                psutil.PROCFS_PATH = self._proc_root
 
     @synchronized_with_attr("_lock")
+    @timed("repository/psutil")
     def refresh(self, system_info: SystemInfo) -> SystemInfo:
+        import psutil  # pylint: disable=import-outside-toplevel
         system_info.cpu_usage.cores = psutil.cpu_percent(percpu=True)
         cpu_times_percent = psutil.cpu_times_percent()
         system_info.cpu_usage.user = cpu_times_percent.user
@@ -49,4 +79,28 @@ class PsUtilRepository:
         system_info.mem_usage.total = virtual_memory.total
         system_info.mem_usage.available = virtual_memory.available
         system_info.mem_usage.percent = virtual_memory.percent
-        return system_info
\ No newline at end of file
+        return system_info
+
+    # not synchronized, it sleeps for interval and does not touch the system info
+    def read_noise(self, interval: float) -> SystemNoise:
+        import psutil  # pylint: disable=import-outside-toplevel
+        with self.real_processes():
+            own_pids = {os.getpid()}
+            with suppress(psutil.Error):
+                own_pids.update(child.pid for child in psutil.Process().children(recursive=True))
+            processes = [process for process in psutil.process_iter(['name']) if process.pid not in own_pids]
+        for process in processes:
+            with suppress(psutil.Error):
+                process.cpu_percent()
+        time.sleep(interval)
+        noise = SystemNoise()
+        total_cpu_percent = 0.0
+        for process in processes:
+            with suppress(psutil.Error):
+                cpu_percent = process.cpu_percent()
+                total_cpu_percent += cpu_percent
+                if cpu_percent >= _NOISY_PROCESS_MIN_CPU_PERCENT:
+                    noise.processes.append(NoisyProcess(process.pid, process.info['name'], cpu_percent))
+        noise.cpu_percent = total_cpu_percent / (psutil.cpu_count() or 1)
+        noise.processes.sort(key=lambda item: item.cpu_percent, reverse=True)
+        return noise
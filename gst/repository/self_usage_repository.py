@@ -0,0 +1,68 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import os
+import threading
+import time
+
+from injector import singleton, inject
+
+from gst.model.self_usage import SelfUsage
+from gst.model.system_info import SystemInfo
+from gst.util.concurrency import synchronized_with_attr
+from gst.util.metrics import timed
+
+_LOG = logging.getLogger(__name__)
+_PATH_PROC_SELF_STAT = '/proc/self/stat'
+# field offsets in /proc/self/stat counted after the process name, see proc(5)
+_STAT_UTIME = 11
+_STAT_STIME = 12
+_STAT_NUM_THREADS = 17
+_STAT_RSS = 21
+
+
+@singleton
+class SelfUsageRepository:
+    @inject
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._clock_ticks = os.sysconf('SC_CLK_TCK')
+        self._page_size = os.sysconf('SC_PAGE_SIZE')
+
+    def read(self) -> SelfUsage:
+        self_usage = SelfUsage()
+        try:
+            with open(_PATH_PROC_SELF_STAT) as file:
+                stat = file.read()
+        except OSError:
+            _LOG.exception(f"Unable to read {_PATH_PROC_SELF_STAT}")
+            return self_usage
+        self_usage.timestamp = time.monotonic()
+        # the process name can contain spaces and parenthesis, so split after the last one
+        fields = stat[stat.rindex(')') + 2:].split()
+        self_usage.cpu_time = (int(fields[_STAT_UTIME]) + int(fields[_STAT_STIME])) / self._clock_ticks
+        self_usage.threads = int(fields[_STAT_NUM_THREADS])
+        self_usage.rss = int(fields[_STAT_RSS]) * self._page_size
+        return self_usage
+
+    @synchronized_with_attr("_lock")
+    @timed("repository/self_usage")
+    def refresh(self, system_info: SystemInfo) -> SystemInfo:
+        self_usage = self.read()
+        self_usage.cpu_percent = self_usage.get_cpu_percent_since(system_info.self_usage)
+        system_info.self_usage = self_usage
+        return system_info
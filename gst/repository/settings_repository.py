@@ -0,0 +1,90 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from injector import singleton, inject
+from peewee import PeeweeException, SqliteDatabase
+
+from gst.di import SettingChangedSubject
+from gst.model.setting import Setting
+from gst.model.setting_change import SettingChange
+from gst.util.concurrency import synchronized_with_attr
+
+_LOG = logging.getLogger(__name__)
+_WRITE_BEHIND_DELAY_SECONDS = 1.0
+
+
+@singleton
+class SettingsRepository:
+    @inject
+    def __init__(self,
+                 database: SqliteDatabase,
+                 setting_changed_subject: SettingChangedSubject,
+                 ) -> None:
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._database = database
+        self._setting_changed_subject = setting_changed_subject
+        self._cache: Optional[Dict[str, Any]] = None
+        self._pending_writes: Dict[str, Any] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+
+    @synchronized_with_attr("_lock")
+    def get(self, key: str) -> Optional[Any]:
+        return self._get_cache().get(key)
+
+    def set(self, key: str, value: Any, db_value: Any) -> None:
+        with self._lock:
+            cache = self._get_cache()
+            if key in cache and cache[key] == db_value:
+                return
+            cache[key] = db_value
+            self._pending_writes[key] = db_value
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(_WRITE_BEHIND_DELAY_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        self._setting_changed_subject.on_next(SettingChange(key, value))
+
+    @synchronized_with_attr("_flush_lock")
+    def flush(self) -> None:
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending_writes = self._pending_writes
+            self._pending_writes = {}
+        if pending_writes:
+            _LOG.debug(f"write {len(pending_writes)} settings")
+            try:
+                with self._database.connection_context(), self._database.atomic():
+                    Setting.insert_many([{'key': key, 'value': value} for key, value in pending_writes.items()]) \
+                        .on_conflict_replace() \
+                        .execute()
+            except PeeweeException:
+                _LOG.exception(f"Unable to write {len(pending_writes)} settings, retrying with the next flush")
+                with self._lock:
+                    # a value set meanwhile is newer than the one that failed
+                    for key, value in pending_writes.items():
+                        self._pending_writes.setdefault(key, value)
+
+    def _get_cache(self) -> Dict[str, Any]:
+        if self._cache is None:
+            self._cache = {setting.key: setting.value for setting in Setting.select()}
+        return self._cache
@@ -14,41 +14,67 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import copy
 import logging
 import os
+import re
 import signal
-import subprocess
 import tempfile
+import time
+from collections import deque
 from contextlib import suppress
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Deque, Dict, Optional, List, Tuple
 
-import yaml
 from injector import singleton, inject
 
 from gst.conf import APP_PACKAGE_NAME
+from gst.di import StressNgProgressSubject
+from gst.model.stress_ng_progress import StressNgProgress
 from gst.model.stress_tests_result import StressTestsResult
+from gst.model.stressor_result import StressorResult
 from gst.repository import PATH_SYS_SYSTEM
+from gst.repository.ps_util_repository import PsUtilRepository
+from gst.util.subprocess import StreamingProcess, find_command
 
 _LOG = logging.getLogger(__name__)
 PATH_SYS_CPU = PATH_SYS_SYSTEM + "/cpu"
+_PROGRESS_INTERVAL = 1.0  # seconds
+_MAX_OUTPUT_LINES = 500  # per stream, a long run with a failing stressor can print a lot
+_FAILURE_RE = re.compile(r'^stress-ng: (fail|error):')
+# e.g. "stress-ng: info:  [1234] dispatching hogs: 4 cpu, 4 matrix"
+_DISPATCHING_RE = re.compile(r'dispatching hogs: (.+)$')
 
 
 # https://github.com/endlessm/plainbox-provider-checkbox/blob/master/bin/cpu_stress
 @singleton
 class StressNgRepository:
     @inject
-    def __init__(self) -> None:
+    def __init__(self, progress_subject: StressNgProgressSubject, ps_util_repository: PsUtilRepository) -> None:
         self._pid: Optional[int] = None
+        self._progress_subject = progress_subject
+        self._ps_util_repository = ps_util_repository
 
-    def execute(self, stressor_command: str, workers: int, timeout: int, verify: bool) -> StressTestsResult:
+    def execute(self,
+                stressor_command: str,
+                workers: int,
+                timeout: int,
+                verify: bool,
+                run: int = 1,
+                runs: int = 1) -> StressTestsResult:
+        import yaml  # pylint: disable=import-outside-toplevel
         self.terminate()
         result = StressTestsResult()
+        stress_ng = find_command('stress-ng')
+        if stress_ng is None:
+            result.successful = False
+            result.error = "stress-ng not found"
+            return result
         with tempfile.TemporaryDirectory() as tmp_dir_name:
             stress_ng_output = Path(tmp_dir_name, APP_PACKAGE_NAME).with_suffix('.yaml')
 
             cmd: List[str] = [
-                'stress-ng',
+                stress_ng,
                 '--yaml',
                 str(stress_ng_output),
                 '--metrics',
@@ -57,7 +83,9 @@ class StressNgRepository:
                 '--temp-path',
                 tmp_dir_name,
                 '--timeout',
-                str(timeout)
+                str(timeout),
+                # a failing stressor stops the run instead of letting the others go on until the timeout
+                '--abort',
             ]
 
             if verify:
@@ -66,19 +94,16 @@ class StressNgRepository:
             cmd.extend(stressor_command.format(workers).split())
             _LOG.debug(f"stress-ng command = {cmd}")
 
-            process = subprocess.Popen(cmd,
-                                       stdout=subprocess.PIPE,
-                                       stderr=subprocess.PIPE,
-                                       stdin=subprocess.PIPE,
-                                       preexec_fn=os.setpgrp)
+            process = StreamingProcess(cmd, new_process_group=True)
             self._pid = process.pid
-            output, error = process.communicate()
+            instances: Dict[str, int] = {}
+            output, error = self._follow(process, StressNgProgress(timeout, run, runs), instances)
 
             result.return_code = process.returncode
             result.successful = process.returncode == 0
-            result.error = error.decode(encoding='UTF-8').strip()
+            result.error = '\n'.join(error).strip()
             log_message = f"ret code = {process.returncode};\n" \
-                          f"output = {output.decode(encoding='UTF-8').strip()};\n" \
+                          f"output = {os.linesep.join(output).strip()};\n" \
                           f"error = {result.error}"
             if process.returncode == 0:
                 _LOG.debug(log_message)
@@ -97,12 +122,84 @@ class StressNgRepository:
                             result.elapsed += stressor['wall-clock-time']
                             result.bogo_ops += stressor['bogo-ops']
                             result.bopsust += stressor['bogo-ops-per-second-usr-sys-time']
+                            result.stressors.append(self._get_stressor_result(stressor, instances))
                 except yaml.YAMLError as exc:
                     _LOG.exception(exc)
 
             self._pid = None
         return result
 
+    @staticmethod
+    def _get_stressor_result(metrics: Dict[str, Any], instances: Dict[str, int]) -> StressorResult:
+        stressor = StressorResult(str(metrics['stressor']))
+        # newer stress-ng versions report the instances in the YAML, older ones only in the output
+        stressor.instances = metrics.get('instances', instances.get(stressor.stressor))
+        stressor.bogo_ops = metrics.get('bogo-ops')
+        stressor.real_time = metrics.get('wall-clock-time')
+        stressor.usr_time = metrics.get('user-time')
+        stressor.sys_time = metrics.get('system-time')
+        stressor.bogo_ops_per_second_real_time = metrics.get('bogo-ops-per-second-real-time')
+        stressor.bogo_ops_per_second_usr_sys_time = metrics.get('bogo-ops-per-second-usr-sys-time')
+        return stressor
+
+    def _follow(self,
+                process: StreamingProcess,
+                progress: StressNgProgress,
+                instances: Dict[str, int]) -> Tuple[List[str], List[str]]:
+        # reads the output while stress-ng runs and publishes the progress every second and on every failure,
+        # the instances of every stressor are collected here since the line can be dropped from the capped output
+        output: Deque[str] = deque(maxlen=_MAX_OUTPUT_LINES)
+        error: Deque[str] = deque(maxlen=_MAX_OUTPUT_LINES)
+        workers: Dict[int, Any] = {}
+        start = time.monotonic()
+        next_update = start
+        for item in process.iter_lines(timeout=_PROGRESS_INTERVAL):
+            failed = False
+            if item is not None:
+                is_stderr, line = item
+                (error if is_stderr else output).append(line)
+                progress.last_message = line.strip() or progress.last_message
+                self._parse_dispatching(line, instances)
+                if _FAILURE_RE.match(line):
+                    progress.failures.append(line.strip())
+                    failed = True
+            now = time.monotonic()
+            if failed or now >= next_update:
+                progress.elapsed = now - start
+                progress.running_workers, progress.cpu_percent = self._get_workers_usage(process.pid, workers)
+                self._progress_subject.on_next(copy.deepcopy(progress))
+                next_update = now + _PROGRESS_INTERVAL
+        process.wait()
+        return list(output), list(error)
+
+    @staticmethod
+    def _parse_dispatching(line: str, instances: Dict[str, int]) -> None:
+        match = _DISPATCHING_RE.search(line)
+        if match:
+            for hog in match.group(1).split(','):
+                count, _, name = hog.strip().partition(' ')
+                if count.isdigit() and name:
+                    instances[name] = int(count)
+
+    def _get_workers_usage(self, pid: int, workers: Dict[int, Any]) -> Tuple[int, float]:
+        # the Process objects are kept between calls, cpu_percent() measures since the previous call
+        import psutil  # pylint: disable=import-outside-toplevel
+        try:
+            with self._ps_util_repository.real_processes():
+                children = psutil.Process(pid).children(recursive=True)
+        except psutil.Error:
+            return 0, 0.0
+        cpu_percent = 0.0
+        running = set()
+        for child in children:
+            worker = workers.setdefault(child.pid, child)
+            with suppress(psutil.Error):
+                cpu_percent += worker.cpu_percent()
+                running.add(child.pid)
+        for gone in set(workers) - running:
+            del workers[gone]
+        return len(running), cpu_percent
+
     def is_running(self) -> bool:
         return self._pid is not None
 
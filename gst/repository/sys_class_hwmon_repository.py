@@ -0,0 +1,155 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import glob
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from injector import singleton, inject
+
+from gst.di import SysRoot
+from gst.model.hardware_monitor import HwMonitoredItemKey
+from gst.model.monitored_item import MonitoredItem
+from gst.model.system_info import SystemInfo
+from gst.util.concurrency import synchronized_with_attr
+from gst.util.metrics import timed
+from gst.util.sensors import FeatureType
+
+_LOG = logging.getLogger(__name__)
+_SENSOR_MIN_TEMP = -127
+_SENSOR_MAX_TEMP = 215
+_INPUT_FILE_RE = re.compile(r'^(in|fan|temp|power|energy|curr|humidity|intrusion)(\d+)_(input|average|alarm)$')
+# sysfs unit -> libsensors unit, see https://www.kernel.org/doc/html/latest/hwmon/sysfs-interface.html
+_FEATURE_TYPES = {
+    'in': (FeatureType.IN, 1000),  # mV
+    'fan': (FeatureType.FAN, 1),  # RPM
+    'temp': (FeatureType.TEMP, 1000),  # m°C
+    'power': (FeatureType.POWER, 1000 * 1000),  # µW
+    'energy': (FeatureType.ENERGY, 1000 * 1000),  # µJ
+    'curr': (FeatureType.CURR, 1000),  # mA
+    'humidity': (FeatureType.HUMIDITY, 1000),  # m%RH
+    'intrusion': (FeatureType.INTRUSION, 1),
+}
+# the file read for each feature type, the first one found wins
+_INPUT_SUFFIXES = ['input', 'average', 'alarm']
+
+
+class _DiscoveredFeature:
+    def __init__(self, chip_name: str, item_id: str, item_name: str, item_type: FeatureType, path: str,
+                 scale: int) -> None:
+        self.chip_name = chip_name
+        self.item_id = item_id
+        self.item_name = item_name
+        self.item_type = item_type
+        self.path = path
+        self.scale = scale
+
+
+# Reads the sensors straight from /sys/class/hwmon, used instead of libsensors when it is missing or when the
+# system information comes from another tree (libsensors always reads the real /sys).
+# Unlike libsensors it applies no sensors.conf and reports only the input value of every feature.
+@singleton
+class SysClassHwmonRepository:
+    @inject
+    def __init__(self, sys_root: SysRoot) -> None:
+        self._lock = threading.RLock()
+        self._path_sys_class_hwmon = os.path.join(sys_root, 'class', 'hwmon')
+        self._discovery_needed = True
+        self._hotplug_events_enabled = False
+        self._discovered_features: List[_DiscoveredFeature] = []
+
+    def invalidate(self) -> None:
+        self._discovery_needed = True
+
+    def set_hotplug_events_enabled(self, enabled: bool) -> None:
+        self._hotplug_events_enabled = enabled
+        self._discovery_needed = True
+
+    @synchronized_with_attr("_lock")
+    @timed("repository/sys_class_hwmon")
+    def refresh(self, system_info: SystemInfo) -> SystemInfo:
+        discovery = self._discovery_needed or not self._hotplug_events_enabled
+        # cleared before discovering, so that an invalidate() arriving meanwhile is not lost
+        self._discovery_needed = False
+        if discovery:
+            self._discover_or_retry()
+        present_keys: Set[HwMonitoredItemKey] = set()
+        for feature in self._discovered_features:
+            item = MonitoredItem(feature.item_id, feature.item_name, self._read_value(feature), feature.item_type)
+            system_info.hwmon.set_hw_monitored_item(feature.chip_name, item)
+            present_keys.add((feature.chip_name, item.value_type, item.item_id))
+        if discovery:
+            system_info.hwmon.remove_missing_hw_monitored_items(present_keys)
+        return system_info
+
+    def _discover_or_retry(self) -> None:
+        try:
+            self._discover()
+        except Exception:
+            self._discovery_needed = True
+            raise
+
+    def _discover(self) -> None:
+        _LOG.debug(f"discovering {self._path_sys_class_hwmon} chips")
+        self._discovered_features = []
+        hwmon_paths = glob.glob(os.path.join(self._path_sys_class_hwmon, 'hwmon[0-9]*'))
+        for hwmon_path in sorted(hwmon_paths, key=lambda path: int(os.path.basename(path)[5:])):
+            hwmon_name = os.path.basename(hwmon_path)
+            # old drivers put their attributes in the device directory
+            if not os.path.exists(os.path.join(hwmon_path, 'name')):
+                hwmon_path = os.path.join(hwmon_path, 'device')
+            chip_name = f"{self._read_text(os.path.join(hwmon_path, 'name')) or 'hwmon'}-{hwmon_name}"
+            try:
+                file_names = set(os.listdir(hwmon_path))
+            except OSError:
+                _LOG.exception(f"Unable to list {hwmon_path}")
+                continue
+            features: Dict[Tuple[str, int], str] = {}  # (type, number) -> item_id
+            for file_name in file_names:
+                match = _INPUT_FILE_RE.match(file_name)
+                if match is not None:
+                    features[(match.group(1), int(match.group(2)))] = match.group(1) + match.group(2)
+            for (feature_type, _), item_id in sorted(features.items()):
+                suffix = next(suffix for suffix in _INPUT_SUFFIXES if f"{item_id}_{suffix}" in file_names)
+                item_type, scale = _FEATURE_TYPES[feature_type]
+                item_name = self._read_text(os.path.join(hwmon_path, f"{item_id}_label")) \
+                    if f"{item_id}_label" in file_names else None
+                self._discovered_features.append(_DiscoveredFeature(
+                    chip_name, item_id, item_name or item_id, item_type,
+                    os.path.join(hwmon_path, f"{item_id}_{suffix}"), scale))
+
+    @staticmethod
+    def _read_text(path: str) -> Optional[str]:
+        try:
+            with open(path, 'r') as file:
+                return file.read().strip()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_value(feature: _DiscoveredFeature) -> Optional[float]:
+        try:
+            with open(feature.path, 'r') as file:
+                value = int(file.read()) / feature.scale
+        except (OSError, ValueError):
+            # many drivers return an error while a sensor is not available
+            return None
+        if feature.item_type == FeatureType.TEMP and not _SENSOR_MIN_TEMP < value < _SENSOR_MAX_TEMP:
+            return None
+        return value
@@ -19,38 +19,45 @@ import os
 import threading
 from typing import List
 
-import humanfriendly
 from injector import singleton, inject
 
+from gst.di import SysRoot
 from gst.model.cache import Cache
 from gst.model.system_info import SystemInfo
-from gst.repository.stress_ng_repository import PATH_SYS_SYSTEM
 from gst.util.concurrency import synchronized_with_attr
+from gst.util.metrics import timed
 
-PATH_SYS_CPU = PATH_SYS_SYSTEM + "/cpu"
 _LOG = logging.getLogger(__name__)
 
 
 @singleton
 class SysDevicesCacheRepository:
     @inject
-    def __init__(self) -> None:
+    def __init__(self, sys_root: SysRoot) -> None:
         self._lock = threading.RLock()
+        self._path_sys_cpu = os.path.join(sys_root, 'devices', 'system', 'cpu')
+        self._discovery_needed = True
 
-    @staticmethod
-    def _has_sys_devices_cache() -> bool:
-        return os.path.exists(os.path.join(PATH_SYS_CPU, "cpu0", "cache"))
+    def invalidate(self) -> None:
+        self._discovery_needed = True
+
+    def _has_sys_devices_cache(self) -> bool:
+        return os.path.exists(os.path.join(self._path_sys_cpu, "cpu0", "cache"))
 
     @synchronized_with_attr("_lock")
+    @timed("repository/sys_devices_cache")
     def refresh(self, system_info: SystemInfo) -> SystemInfo:
+        if not self._discovery_needed:
+            return system_info
+
         if not self._has_sys_devices_cache():
-            _LOG.warning("%s not found", os.path.join(PATH_SYS_CPU, "cpu0", "cache"))
+            _LOG.warning("%s not found", os.path.join(self._path_sys_cpu, "cpu0", "cache"))
             return system_info
 
         for physical in system_info.cpu_info.physical_package_id_list:
             cache_list: List[Cache] = []
             for _, processor in physical.items():
-                cache_path = os.path.join(PATH_SYS_CPU, "cpu%s" % processor.processor_id, "cache")
+                cache_path = os.path.join(self._path_sys_cpu, "cpu%s" % processor.processor_id, "cache")
                 n_caches = 0
                 while os.path.exists(
                         os.path.join(cache_path, "index%d" % n_caches)):
@@ -68,10 +75,12 @@ class SysDevicesCacheRepository:
                 processor.cache_l1_inst = cache_l1_inst
                 processor.cache_l2 = cache_l2
                 processor.cache_l3 = cache_l3
+        self._discovery_needed = False
         return system_info
 
     @staticmethod
     def _read_cache_info(cache_list, cache_path, n_caches):
+        import humanfriendly  # pylint: disable=import-outside-toplevel
         for i in range(n_caches):
             cache = Cache()
             index_path = os.path.join(cache_path, "index%d" % i)
@@ -20,33 +20,34 @@ import threading
 
 from injector import singleton, inject
 
+from gst.di import SysRoot
 from gst.model.system_info import SystemInfo
 from gst.util.concurrency import synchronized_with_attr
+from gst.util.metrics import timed
 
 _LOG = logging.getLogger(__name__)
-PATH_SYS_DEVICE_VIRTUAL = "/sys/devices/virtual"
-PATH_SYS_VIRTUAL_DMI = PATH_SYS_DEVICE_VIRTUAL + "/dmi/id"
 
 
 @singleton
 class SysDevicesDmiRepository:
     @inject
-    def __init__(self) -> None:
+    def __init__(self, sys_root: SysRoot) -> None:
         self._lock = threading.RLock()
+        self._path_sys_virtual_dmi = os.path.join(sys_root, 'devices', 'virtual', 'dmi', 'id')
 
-    @staticmethod
-    def _has_sys_devices_dmi() -> bool:
-        return os.path.exists(PATH_SYS_VIRTUAL_DMI)
+    def _has_sys_devices_dmi(self) -> bool:
+        return os.path.exists(self._path_sys_virtual_dmi)
 
     @synchronized_with_attr("_lock")
+    @timed("repository/sys_devices_dmi")
     def refresh(self, system_info: SystemInfo) -> SystemInfo:
         if not self._has_sys_devices_dmi():
-            _LOG.warning("%s not found", PATH_SYS_VIRTUAL_DMI)
+            _LOG.warning("%s not found", self._path_sys_virtual_dmi)
             return system_info
 
         for attr, _ in system_info.mobo_info:
             try:
-                with open(os.path.join(PATH_SYS_VIRTUAL_DMI, attr), 'r') as file:
+                with open(os.path.join(self._path_sys_virtual_dmi, attr), 'r') as file:
                     file_content = file.read().strip()
                     system_info.mobo_info.__setattr__(attr, file_content if file_content else None)
             except PermissionError:
@@ -14,14 +14,23 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import functools
+import time
 from typing import Callable, Any
 
+from gst.util.metrics import METRICS
+
 
 def synchronized_with_attr(lock_name: str) -> Any:
     def decorator(method: Callable) -> Any:
+        lock_wait_histogram = METRICS.get_histogram(f"lock/{method.__qualname__}")
+
+        @functools.wraps(method)
         def synced_method(self: Any, *args: Any, **kws: Any) -> Any:
             lock = getattr(self, lock_name)
+            start_time = time.perf_counter()
             with lock:
+                lock_wait_histogram.record(time.perf_counter() - start_time)
                 return method(self, *args, **kws)
 
         return synced_method
@@ -19,7 +19,7 @@
 
 import re
 from enum import IntEnum
-from typing import Dict, List, Union
+from typing import Dict, Iterable, List, Optional, Set, Union
 
 
 class DmiType(IntEnum):
@@ -68,86 +68,70 @@ class DmiType(IntEnum):
     MANAGEMENT_CONTROLLER_HOST_INTERFACE = 42
 
 
-class DmiParse:
-    def __init__(self, text_output: str) -> None:
-        self.dmi_data: Dict[str, Dict[str, Union[str, int]]] = {}
-        self._parse(text_output)
-
-    def get_type(self, dmi_type: int) -> List[Dict]:
-        result: List[Dict[str, Union[str, int]]] = []
-        for entry in self.dmi_data.values():
-            if entry['DMIType'] == dmi_type:
-                result.append(entry)
-        return result
-
-    handle_re = re.compile('^Handle\\s+(.+),\\s+DMI\\s+type\\s+(\\d+),\\s+(\\d+)\\s+bytes$')
-    in_block_re = re.compile("^\\t\\t(.+)$")
-    record_re = re.compile("\\t(.+):\\s+(.+)$")
-    record2_re = re.compile("\\t(.+):$")
-
-    def _parse(self, text_output: str) -> None:
-        #  Each record is separated by double newlines
-        split_output = text_output.split('\n\n')
-
-        for record in split_output:
-            record_element = record.splitlines()
-
-            #  Entries with less than 3 lines are incomplete / inactive; skip them
-            if len(record_element) < 3:
-                continue
-
-            handle_data = DmiParse.handle_re.findall(record_element[0])
-
-            if not handle_data:
-                continue
-            handle_data = handle_data[0]
+DmiRecord = Dict[str, Union[str, int, List[str]]]
 
-            dmi_handle = handle_data[0]
 
-            self.dmi_data[dmi_handle] = {}
-            self.dmi_data[dmi_handle]["DMIType"] = int(handle_data[1])
-            self.dmi_data[dmi_handle]["DMISize"] = int(handle_data[2])
-
-            #  Okay, we know 2nd line == name
-            self.dmi_data[dmi_handle]["DMIName"] = record_element[1]
-
-            in_block_element = ""
-            in_block_list = ""
-
-            #  Loop over the rest of the record, gathering values
-            for i in range(2, len(record_element), 1):
-                if i >= len(record_element):
-                    break
-                #  Check whether we are inside a \t\t block
-                if in_block_element != "":
-
-                    in_block_data = DmiParse.in_block_re.findall(record_element[1])
-
-                    if in_block_data:
-                        if not in_block_list:
-                            in_block_list = in_block_data[0][0]
-                        else:
-                            in_block_list = f"{in_block_list}\t\t{in_block_data[0][1]}"
+class DmiParse:
+    # Parses the dmidecode text output in a single pass, line by line, so it can also be fed straight from the
+    # process stdout. Records of types not in dmi_types are skipped without being split into fields.
+    def __init__(self, text_output: Union[str, Iterable[str]], dmi_types: Optional[Iterable[int]] = None) -> None:
+        self.dmi_data: Dict[str, DmiRecord] = {}
+        self._index: Dict[int, List[DmiRecord]] = {}
+        self._dmi_types: Optional[Set[int]] = None if dmi_types is None else {int(t) for t in dmi_types}
+        self._parse(text_output.splitlines() if isinstance(text_output, str) else text_output)
 
-                        self.dmi_data[dmi_handle][in_block_element] = in_block_list
-                        continue
-                    else:
-                        # We are out of the \t\t block; reset it again, and let
-                        # the parsing continue
-                        in_block_element = ""
+    def get_type(self, dmi_type: int) -> List[DmiRecord]:
+        return self._index.get(dmi_type, [])
 
-                record_data = DmiParse.record_re.findall(record_element[i])
+    handle_re = re.compile('^Handle\\s+(.+),\\s+DMI\\s+type\\s+(\\d+),\\s+(\\d+)\\s+bytes$')
 
-                #  Is this the line containing handle identifier, type, size?
-                if record_data:
-                    self.dmi_data[dmi_handle][record_data[0][0]] = record_data[0][1]  # noq
+    def _parse(self, lines: Iterable[str]) -> None:
+        handle = ''
+        dmi_type = 0
+        record: Optional[DmiRecord] = None
+        has_name = False
+        stored = False
+        block: Optional[List[str]] = None
+
+        for line in lines:
+            line = line.rstrip()
+            if line.startswith('Handle '):
+                record = None
+                handle_data = DmiParse.handle_re.match(line)
+                if handle_data is None:
                     continue
-
-                #  Didn't findall regular entry, maybe an array of data?
-                record_data2 = DmiParse.record2_re.findall(record_element[i])
-
-                if record_data2:
-                    #  This is an array of data - let the loop know we are inside
-                    #  an array block
-                    in_block_element = record_data2[0][0]
+                dmi_type = int(handle_data.group(2))
+                if self._dmi_types is not None and dmi_type not in self._dmi_types:
                     continue
+                handle = handle_data.group(1)
+                record = {'DMIType': dmi_type, 'DMISize': int(handle_data.group(3))}
+                has_name = False
+                stored = False
+                block = None
+            elif record is None:
+                continue
+            elif not line:
+                record = None
+            elif not has_name:
+                #  The line after the handle is the record name
+                record['DMIName'] = line
+                has_name = True
+            elif line.startswith('\t\t'):
+                if block is not None:
+                    block.append(line[2:])
+            elif line.startswith('\t'):
+                key, separator, value = line[1:].partition(': ')
+                if separator:
+                    record[key] = value
+                    block = None
+                elif key.endswith(':'):
+                    #  A key without value starts a list of \t\t indented values
+                    block = []
+                    record[key[:-1]] = block
+                else:
+                    block = None
+                #  Records without any field (inactive entries, end of table) are not stored
+                if not stored:
+                    self.dmi_data[handle] = record
+                    self._index.setdefault(dmi_type, []).append(record)
+                    stored = True
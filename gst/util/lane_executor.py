@@ -0,0 +1,201 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from reactivex import abc, typing
+from reactivex.disposable import CompositeDisposable, SerialDisposable, SingleAssignmentDisposable
+from reactivex.scheduler import EventLoopScheduler
+from reactivex.scheduler.periodicscheduler import PeriodicScheduler
+
+from gst.util.metrics import METRICS
+
+_LOG = logging.getLogger(__name__)
+_TState = TypeVar("_TState")
+
+
+class LaneMetrics:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.submitted: int = 0
+        self.completed: int = 0
+        self.queue_depth: int = 0
+        self.max_queue_depth: int = 0
+        self.total_wait_time: float = 0.0
+        self.max_wait_time: float = 0.0
+        self.total_run_time: float = 0.0
+        self.max_run_time: float = 0.0
+
+    def get_mean_wait_time(self) -> float:
+        return self.total_wait_time / self.completed if self.completed else 0.0
+
+    def get_mean_run_time(self) -> float:
+        return self.total_run_time / self.completed if self.completed else 0.0
+
+
+# runs the submitted tasks one at a time, in submission order, on the workers of a shared pool or on its own thread
+class ExecutorLane:
+    def __init__(self, name: str, executor: ThreadPoolExecutor) -> None:
+        self.name = name
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._tasks: Deque[Tuple[Callable[[], Any], float]] = deque()
+        self._is_scheduled = False
+        self._metrics = LaneMetrics(name)
+        self._wait_histogram = METRICS.get_histogram(f"lane/{name}/wait")
+        self._run_histogram = METRICS.get_histogram(f"lane/{name}/run")
+
+    def submit(self, task: Callable[[], Any]) -> None:
+        with self._lock:
+            self._tasks.append((task, time.perf_counter()))
+            self._metrics.submitted += 1
+            self._metrics.queue_depth = len(self._tasks)
+            self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, self._metrics.queue_depth)
+            if self._is_scheduled:
+                return
+            self._is_scheduled = True
+        self._executor.submit(self._run_next)
+
+    def get_metrics(self) -> LaneMetrics:
+        with self._lock:
+            metrics = LaneMetrics(self.name)
+            metrics.__dict__.update(self._metrics.__dict__)
+            return metrics
+
+    def _run_next(self) -> None:
+        with self._lock:
+            task, submit_time = self._tasks.popleft()
+            self._metrics.queue_depth = len(self._tasks)
+        start_time = time.perf_counter()
+        try:
+            task()
+        except Exception:  # pylint: disable=broad-except
+            _LOG.exception(f"Error while running a task on lane {self.name}")
+        end_time = time.perf_counter()
+        self._wait_histogram.record(start_time - submit_time)
+        self._run_histogram.record(end_time - start_time)
+        with self._lock:
+            self._metrics.completed += 1
+            self._metrics.total_wait_time += start_time - submit_time
+            self._metrics.max_wait_time = max(self._metrics.max_wait_time, start_time - submit_time)
+            self._metrics.total_run_time += end_time - start_time
+            self._metrics.max_run_time = max(self._metrics.max_run_time, end_time - start_time)
+            # one task per turn, so that a busy lane cannot starve the other ones
+            self._is_scheduled = bool(self._tasks)
+            schedule_next = self._is_scheduled
+        if schedule_next:
+            self._executor.submit(self._run_next)
+
+
+# a fixed pool of named worker threads shared by serial lanes, plus one timer thread.
+# Lanes whose tasks can block for a long time (a stress test, a password prompt) are dedicated: they get a thread
+# of their own, so that they never hold a shared worker and the other lanes cannot queue behind them
+class LaneExecutor:
+    def __init__(self,
+                 max_workers: int,
+                 dedicated_lanes: Iterable[str] = (),
+                 thread_name_prefix: str = 'gst-worker') -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._dedicated_lanes = frozenset(dedicated_lanes)
+        self._dedicated_executors: List[ThreadPoolExecutor] = []
+        self._lock = threading.Lock()
+        self._lanes: Dict[str, ExecutorLane] = {}
+        self._schedulers: Dict[str, LaneScheduler] = {}
+        self._timer_scheduler = EventLoopScheduler(
+            thread_factory=lambda target: threading.Thread(target=target, name='gst-timer', daemon=True))
+
+    def get_lane(self, name: str) -> ExecutorLane:
+        with self._lock:
+            lane = self._lanes.get(name)
+            if lane is None:
+                executor = self._executor
+                if name in self._dedicated_lanes:
+                    # a lane runs one task at a time, one thread is all it needs
+                    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"gst-{name}")
+                    self._dedicated_executors.append(executor)
+                lane = ExecutorLane(name, executor)
+                self._lanes[name] = lane
+            return lane
+
+    def get_scheduler(self, name: str) -> 'LaneScheduler':
+        lane = self.get_lane(name)
+        with self._lock:
+            scheduler = self._schedulers.get(name)
+            if scheduler is None:
+                scheduler = LaneScheduler(lane, self._timer_scheduler)
+                self._schedulers[name] = scheduler
+            return scheduler
+
+    def get_metrics(self) -> Dict[str, LaneMetrics]:
+        with self._lock:
+            lanes = list(self._lanes.values())
+        return {lane.name: lane.get_metrics() for lane in lanes}
+
+    def shutdown(self) -> None:
+        self._timer_scheduler.dispose()
+        with self._lock:
+            executors = [self._executor] + self._dedicated_executors
+        for executor in executors:
+            executor.shutdown(wait=False)
+
+
+# timed actions wait on the shared timer thread and are moved to the lane only once due, so waiting never holds a worker
+class LaneScheduler(PeriodicScheduler):
+    def __init__(self, lane: ExecutorLane, timer_scheduler: EventLoopScheduler) -> None:
+        super().__init__()
+        self._lane = lane
+        self._timer_scheduler = timer_scheduler
+
+    def schedule(self,
+                 action: typing.ScheduledAction[_TState],
+                 state: Optional[_TState] = None
+                 ) -> abc.DisposableBase:
+        disposable = SingleAssignmentDisposable()
+
+        def run() -> None:
+            if not disposable.is_disposed:
+                disposable.disposable = self.invoke_action(action, state)
+
+        self._lane.submit(run)
+        return disposable
+
+    def schedule_relative(self,
+                          duetime: typing.RelativeTime,
+                          action: typing.ScheduledAction[_TState],
+                          state: Optional[_TState] = None
+                          ) -> abc.DisposableBase:
+        seconds = self.to_seconds(duetime)
+        if seconds <= 0.0:
+            return self.schedule(action, state)
+        scheduled = SerialDisposable()
+
+        def dispatch(_: abc.SchedulerBase, __: Any) -> None:
+            scheduled.disposable = self.schedule(action, state)
+
+        timer = self._timer_scheduler.schedule_relative(seconds, dispatch)
+        return CompositeDisposable(timer, scheduled)
+
+    def schedule_absolute(self,
+                          duetime: typing.AbsoluteTime,
+                          action: typing.ScheduledAction[_TState],
+                          state: Optional[_TState] = None
+                          ) -> abc.DisposableBase:
+        return self.schedule_relative(self.to_datetime(duetime) - self.now, action, state)
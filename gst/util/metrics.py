@@ -0,0 +1,151 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# log scale buckets from 1 µs to ~16.8 s, the last bucket holds everything above
+_BUCKET_UPPER_BOUNDS: List[float] = [2 ** exponent * 1e-6 for exponent in range(25)]
+
+
+class LatencyHistogram:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._buckets: List[int] = [0] * (len(_BUCKET_UPPER_BOUNDS) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        index = bisect_left(_BUCKET_UPPER_BOUNDS, seconds)
+        with self._lock:
+            self._buckets[index] += 1
+            self.count += 1
+            self.total += seconds
+            self.min = seconds if self.min is None else min(self.min, seconds)
+            self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets = [0] * (len(_BUCKET_UPPER_BOUNDS) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+
+    def get_mean(self) -> Optional[float]:
+        with self._lock:
+            return self.total / self.count if self.count else None
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        with self._lock:
+            if not self.count:
+                return None
+            rank = percentile / 100 * self.count
+            seen = 0
+            for index, bucket_count in enumerate(self._buckets):
+                seen += bucket_count
+                if seen >= rank and bucket_count:
+                    # the bucket upper bound, clamped to what was actually observed
+                    assert self.max is not None
+                    if index == len(_BUCKET_UPPER_BOUNDS):
+                        return self.max
+                    return min(_BUCKET_UPPER_BOUNDS[index], self.max)
+            return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {str(_BUCKET_UPPER_BOUNDS[index]) if index < len(_BUCKET_UPPER_BOUNDS) else 'inf': bucket_count
+                       for index, bucket_count in enumerate(self._buckets) if bucket_count}
+            result: Dict[str, Any] = {'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max}
+        result.update({
+            'mean': self.get_mean(),
+            'p50': self.get_percentile(50),
+            'p95': self.get_percentile(95),
+            'p99': self.get_percentile(99),
+            'buckets': buckets,
+        })
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def get_histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram(name))
+        return histogram
+
+    def record(self, name: str, seconds: float) -> None:
+        self.get_histogram(name).record(seconds)
+
+    def get_histograms(self) -> List[LatencyHistogram]:
+        with self._lock:
+            return sorted(self._histograms.values(), key=lambda histogram: histogram.name)
+
+    def reset(self) -> None:
+        # histograms are cleared in place because @timed keeps a reference to them
+        for histogram in self.get_histograms():
+            histogram.reset()
+
+    def to_json(self, extra: Optional[Dict[str, Any]] = None) -> str:
+        data: Dict[str, Any] = {
+            'timestamp': time.time(),
+            'histograms': {histogram.name: histogram.to_dict() for histogram in self.get_histograms()},
+        }
+        if extra:
+            data.update(extra)
+        return json.dumps(data, indent=2)
+
+
+METRICS = MetricsRegistry()
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.record(name, time.perf_counter() - start_time)
+
+
+def timed(name: str) -> Any:
+    def decorator(method: Callable) -> Any:
+        histogram = METRICS.get_histogram(name)
+
+        @functools.wraps(method)
+        def timed_method(*args: Any, **kws: Any) -> Any:
+            start_time = time.perf_counter()
+            try:
+                return method(*args, **kws)
+            finally:
+                histogram.record(time.perf_counter() - start_time)
+
+        return timed_method
+
+    return decorator
@@ -30,3 +30,7 @@ def get_data_path(path: str) -> str:
 
 def get_config_path(file: str) -> str:
     return str(Path(BaseDirectory.save_config_path(APP_PACKAGE_NAME)).joinpath(file))
+
+
+def get_cache_path(file: str) -> str:
+    return str(Path(BaseDirectory.save_cache_path(APP_PACKAGE_NAME)).joinpath(file))
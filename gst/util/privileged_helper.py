@@ -0,0 +1,104 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+# The privileged helper: started once per session as root by PrivilegedHelperRepository, it serves a fixed set
+# of read requests until GST closes its end of the socket.
+#
+# It runs only from the root owned launcher installed in HELPER_PATH (bin/gst-privileged-helper.in), which has
+# its own polkit action, and it never runs code it receives: the requests are plain data.
+#
+# Every frame is a 5 bytes header, followed by the payload:
+#   request:  opcode (1 byte), length of the argument (4 bytes, big endian), argument
+#   response: status (1 byte), length of the result (4 bytes, big endian), result
+import os
+import shutil
+import struct
+import subprocess
+from typing import Tuple
+
+HELPER_PATH = '/usr/libexec/gst/gst-privileged-helper'  # see bin/meson.build and data/com.leinardi.gst.policy.in
+HEADER = struct.Struct('>BI')
+
+OP_PING = 0
+OP_READ_FILE = 1
+OP_RUN_DMIDECODE = 2
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_DENIED = 2
+STATUS_NOT_FOUND = 3
+
+# nothing outside this list can be read, whatever the client asks
+READABLE_FILES = frozenset([
+    '/sys/firmware/dmi/tables/smbios_entry_point',
+    '/sys/firmware/dmi/tables/DMI',
+])
+MAX_ARGUMENT_SIZE = 4096
+_SEARCH_PATH = '/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin'  # the PATH of the caller is ignored
+
+
+def read_exactly(fd: int, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            raise EOFError()
+        data += chunk
+    return data
+
+
+def write_frame(fd: int, code: int, payload: bytes) -> None:
+    data = memoryview(HEADER.pack(code, len(payload)) + payload)
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _handle(opcode: int, argument: bytes) -> Tuple[int, bytes]:
+    if opcode == OP_PING:
+        return STATUS_OK, b''
+    if opcode == OP_READ_FILE:
+        path = argument.decode(errors='replace')
+        if path not in READABLE_FILES:
+            return STATUS_DENIED, path.encode()
+        with open(path, 'rb') as file:
+            return STATUS_OK, file.read()
+    if opcode == OP_RUN_DMIDECODE:
+        dmidecode = shutil.which('dmidecode', path=_SEARCH_PATH)
+        if dmidecode is None:
+            raise FileNotFoundError("dmidecode not found")
+        process = subprocess.run([dmidecode], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+        if process.returncode != 0:
+            return STATUS_ERROR, process.stderr
+        return STATUS_OK, process.stdout
+    return STATUS_DENIED, b'unknown opcode'
+
+
+def serve(read_fd: int, write_fd: int) -> int:
+    while True:
+        try:
+            opcode, length = HEADER.unpack(read_exactly(read_fd, HEADER.size))
+            if length > MAX_ARGUMENT_SIZE:
+                return 1
+            argument = read_exactly(read_fd, length)
+        except EOFError:
+            return 0
+        try:
+            status, result = _handle(opcode, argument)
+        except FileNotFoundError as err:
+            status, result = STATUS_NOT_FOUND, str(err).encode()
+        except (OSError, subprocess.SubprocessError) as err:
+            status, result = STATUS_ERROR, str(err).encode()
+        write_frame(write_fd, status, result)
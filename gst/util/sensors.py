@@ -26,19 +26,12 @@
 
 import ctypes.util
 import sys
+from functools import lru_cache
 from ctypes import cdll, c_void_p, c_char_p, Structure, c_short, c_int, c_uint, POINTER, byref, create_string_buffer, \
     cast, c_double
 from enum import Enum, IntEnum, IntFlag
 from typing import Tuple, Union, Optional
 
-_LIBC = cdll.LoadLibrary(ctypes.util.find_library("c"))
-# see https://github.com/paroj/sensors.py/issues/1
-_LIBC.free.argtypes = [c_void_p]
-
-_HDL = cdll.LoadLibrary(ctypes.util.find_library("sensors"))
-
-VERSION = c_char_p.in_dll(_HDL, "libsensors_version").value.decode("ascii")
-
 
 class SensorsError(Exception):
     pass
@@ -149,12 +142,34 @@ class Subfeature(Structure):
                 ("flags", c_uint)]
 
 
-_HDL.sensors_get_detected_chips.restype = POINTER(ChipName)
-_HDL.sensors_get_features.restype = POINTER(Feature)
-_HDL.sensors_get_all_subfeatures.restype = POINTER(Subfeature)
-_HDL.sensors_get_label.restype = c_void_p  # return pointer instead of str so we can free it
-_HDL.sensors_get_adapter_name.restype = c_char_p  # docs do not say whether to free this or not
-_HDL.sensors_strerror.restype = c_char_p
+# the shared libraries are loaded at first use, so that importing this module (e.g. for FeatureType) stays cheap
+@lru_cache(maxsize=None)
+def _libc() -> ctypes.CDLL:
+    libc = cdll.LoadLibrary(ctypes.util.find_library("c"))
+    # see https://github.com/paroj/sensors.py/issues/1
+    libc.free.argtypes = [c_void_p]
+    return libc
+
+
+@lru_cache(maxsize=None)
+def _hdl() -> ctypes.CDLL:
+    hdl = cdll.LoadLibrary(ctypes.util.find_library("sensors"))
+    hdl.sensors_get_detected_chips.restype = POINTER(ChipName)
+    hdl.sensors_get_features.restype = POINTER(Feature)
+    hdl.sensors_get_all_subfeatures.restype = POINTER(Subfeature)
+    hdl.sensors_get_label.restype = c_void_p  # return pointer instead of str so we can free it
+    hdl.sensors_get_adapter_name.restype = c_char_p  # docs do not say whether to free this or not
+    hdl.sensors_strerror.restype = c_char_p
+    return hdl
+
+
+def is_available() -> bool:
+    return ctypes.util.find_library("sensors") is not None
+
+
+def get_version() -> str:
+    return str(c_char_p.in_dll(_hdl(), "libsensors_version").value.decode("ascii"))
+
 
 # RAW API
 MODE_R = 1
@@ -163,23 +178,23 @@ COMPUTE_MAPPING = 4
 
 
 def init(cfg_file: str = None) -> None:
-    file = _LIBC.fopen(cfg_file.encode("utf-8"), "r") if cfg_file is not None else None
+    file = _libc().fopen(cfg_file.encode("utf-8"), "r") if cfg_file is not None else None
 
-    result = _HDL.sensors_init(file)
+    result = _hdl().sensors_init(file)
     if result != 0:
         raise_sensor_error(result, "sensors_init failed")
 
     if file is not None:
-        _LIBC.fclose(file)
+        _libc().fclose(file)
 
 
 def cleanup() -> None:
-    _HDL.sensors_cleanup()
+    _hdl().sensors_cleanup()
 
 
 def parse_chip_name(orig_name: str) -> ChipName:
     ret = ChipName()
-    err = _HDL.sensors_parse_chip_name(orig_name.encode("utf-8"), byref(ret))
+    err = _hdl().sensors_parse_chip_name(orig_name.encode("utf-8"), byref(ret))
 
     if err < 0:
         raise_sensor_error(err, strerror(err))
@@ -188,11 +203,11 @@ def parse_chip_name(orig_name: str) -> ChipName:
 
 
 def strerror(errnum: int) -> str:
-    return str(_HDL.sensors_strerror(errnum).decode("utf-8"))
+    return str(_hdl().sensors_strerror(errnum).decode("utf-8"))
 
 
 def free_chip_name(chip: ChipName) -> None:
-    _HDL.sensors_free_chip_name(byref(chip))
+    _hdl().sensors_free_chip_name(byref(chip))
 
 
 def get_detected_chips(match: Optional[Union[ChipName, str]], nr: int) -> Tuple[ChipName, int]:
@@ -204,7 +219,7 @@ def get_detected_chips(match: Optional[Union[ChipName, str]], nr: int) -> Tuple[
     if match is not None:
         match = byref(match)
 
-    chip = _HDL.sensors_get_detected_chips(match, byref(_nr))
+    chip = _hdl().sensors_get_detected_chips(match, byref(_nr))
     chip = chip.contents if bool(chip) else None
     return chip, _nr.value
 
@@ -214,7 +229,7 @@ def chip_snprintf_name(chip: ChipName, buffer_size: int = 200) -> str:
     @param buffer_size defaults to the size used in the sensors utility
     """
     ret = create_string_buffer(buffer_size)
-    err = _HDL.sensors_snprintf_chip_name(ret, buffer_size, byref(chip))
+    err = _hdl().sensors_snprintf_chip_name(ret, buffer_size, byref(chip))
 
     if err < 0:
         raise_sensor_error(err, strerror(err))
@@ -226,13 +241,13 @@ def do_chip_sets(chip: ChipName) -> None:
     """
     @attention this function was not tested
     """
-    err = _HDL.sensors_do_chip_sets(byref(chip))
+    err = _hdl().sensors_do_chip_sets(byref(chip))
     if err < 0:
         raise_sensor_error(err, strerror(err))
 
 
 def get_adapter_name(bus: BusId) -> str:
-    return str(_HDL.sensors_get_adapter_name(byref(bus)).decode("utf-8"))
+    return str(_hdl().sensors_get_adapter_name(byref(bus)).decode("utf-8"))
 
 
 def get_features(chip: ChipName, nr: int) -> Tuple[Feature, int]:
@@ -240,15 +255,15 @@ def get_features(chip: ChipName, nr: int) -> Tuple[Feature, int]:
     @return: (feature, next nr to query)
     """
     _nr = c_int(nr)
-    feature = _HDL.sensors_get_features(byref(chip), byref(_nr))
+    feature = _hdl().sensors_get_features(byref(chip), byref(_nr))
     feature = feature.contents if bool(feature) else None
     return feature, _nr.value
 
 
 def get_label(chip: ChipName, feature: Feature) -> str:
-    ptr = _HDL.sensors_get_label(byref(chip), byref(feature))
+    ptr = _hdl().sensors_get_label(byref(chip), byref(feature))
     val = cast(ptr, c_char_p).value.decode("utf-8")
-    _LIBC.free(ptr)
+    _libc().free(ptr)
     return val
 
 
@@ -257,14 +272,14 @@ def get_all_subfeatures(chip: ChipName, feature: Feature, nr: int) -> Tuple[Subf
     @return: (subfeature, next nr to query)
     """
     _nr = c_int(nr)
-    subfeature = _HDL.sensors_get_all_subfeatures(byref(chip), byref(feature), byref(_nr))
+    subfeature = _hdl().sensors_get_all_subfeatures(byref(chip), byref(feature), byref(_nr))
     subfeature = subfeature.contents if bool(subfeature) else None
     return subfeature, _nr.value
 
 
 def get_value(chip: ChipName, subfeature_nr: int) -> float:
     val = c_double()
-    err = _HDL.sensors_get_value(byref(chip), subfeature_nr, byref(val))
+    err = _hdl().sensors_get_value(byref(chip), subfeature_nr, byref(val))
     if err < 0:
         raise_sensor_error(err, strerror(err))
     return val.value
@@ -275,7 +290,7 @@ def set_value(chip: ChipName, subfeature_nr: int, value: float) -> None:
     @attention this function was not tested
     """
     val = c_double(value)
-    err = _HDL.sensors_set_value(byref(chip), subfeature_nr, byref(val))
+    err = _hdl().sensors_set_value(byref(chip), subfeature_nr, byref(val))
     if err < 0:
         raise_sensor_error(err, strerror(err))
 
@@ -0,0 +1,308 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+# Decodes the raw SMBIOS tables exported by the kernel in /sys/firmware/dmi/tables, see the DMTF SMBIOS
+# reference specification (DSP0134). Only the structures GST uses are decoded, with the same keys and values
+# printed by dmidecode, so that the records can be used in place of the DmiParse ones.
+
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from gst.util.dmidecode import DmiRecord, DmiType
+
+_ANCHOR_21 = b'_SM_'
+_ANCHOR_30 = b'_SM3_'
+_TYPE_END_OF_TABLE = 127
+_NOT_SPECIFIED = 'Not Specified'
+_OUT_OF_SPEC = '<OUT OF SPEC>'
+
+_PROCESSOR_TYPES = ['Other', 'Unknown', 'Central Processor', 'Math Processor', 'DSP Processor', 'Video Processor']
+_PROCESSOR_UPGRADES = [
+    'Other', 'Unknown', 'Daughter Board', 'ZIF Socket', 'Replaceable Piggy Back', 'None', 'LIF Socket', 'Slot 1',
+    'Slot 2', '370-pin Socket', 'Slot A', 'Slot M', 'Socket 423', 'Socket A (Socket 462)', 'Socket 478',
+    'Socket 754', 'Socket 940', 'Socket 939', 'Socket mPGA604', 'Socket LGA771', 'Socket LGA775', 'Socket S1',
+    'Socket AM2', 'Socket F (1207)', 'Socket LGA1366', 'Socket G34', 'Socket AM3', 'Socket C32', 'Socket LGA1156',
+    'Socket LGA1567', 'Socket PGA988A', 'Socket BGA1288', 'Socket rPGA988B', 'Socket BGA1023', 'Socket BGA1224',
+    'Socket BGA1155', 'Socket LGA1356', 'Socket LGA2011', 'Socket FS1', 'Socket FS2', 'Socket FM1', 'Socket FM2',
+    'Socket LGA2011-3', 'Socket LGA1356-3', 'Socket LGA1150', 'Socket BGA1168', 'Socket BGA1234', 'Socket BGA1364',
+    'Socket AM4', 'Socket LGA1151', 'Socket BGA1356', 'Socket BGA1440', 'Socket BGA1515', 'Socket LGA3647-1',
+    'Socket SP3', 'Socket SP3r2', 'Socket LGA2066', 'Socket BGA1392', 'Socket BGA1510', 'Socket BGA1528',
+    'Socket LGA4189', 'Socket LGA1200', 'Socket LGA4677', 'Socket LGA1700', 'Socket BGA1744', 'Socket BGA1781',
+    'Socket BGA1211', 'Socket BGA2422', 'Socket LGA1211', 'Socket LGA2422', 'Socket LGA5773', 'Socket BGA5773',
+    'Socket AM5', 'Socket SP5', 'Socket SP6', 'Socket BGA883', 'Socket BGA1190', 'Socket BGA4129',
+    'Socket LGA4710', 'Socket LGA7529',
+]
+_PROCESSOR_STATUS = ['Unknown', 'Enabled', 'Disabled By User', 'Disabled By BIOS', 'Idle', _OUT_OF_SPEC,
+                     _OUT_OF_SPEC, 'Other']
+# the processor ID is the CPUID signature only on x86
+_X86_MANUFACTURERS = ('intel', 'amd', 'advanced micro devices', 'hygon', 'zhaoxin', 'centaur')
+
+_ARRAY_LOCATIONS = ['Other', 'Unknown', 'System Board Or Motherboard', 'ISA Add-on Card', 'EISA Add-on Card',
+                    'PCI Add-on Card', 'MCA Add-on Card', 'PCMCIA Add-on Card', 'Proprietary Add-on Card', 'NuBus']
+_ARRAY_USES = ['Other', 'Unknown', 'System Memory', 'Video Memory', 'Flash Memory', 'Non-volatile RAM',
+               'Cache Memory']
+_ARRAY_ERROR_CORRECTION_TYPES = ['Other', 'Unknown', 'None', 'Parity', 'Single-bit ECC', 'Multi-bit ECC', 'CRC']
+
+_FORM_FACTORS = ['Other', 'Unknown', 'SIMM', 'SIP', 'Chip', 'DIP', 'ZIP', 'Proprietary Card', 'DIMM', 'TSOP',
+                 'Row Of Chips', 'RIMM', 'SODIMM', 'SRIMM', 'FB-DIMM', 'Die']
+_MEMORY_TYPES = ['Other', 'Unknown', 'DRAM', 'EDRAM', 'VRAM', 'SRAM', 'RAM', 'ROM', 'Flash', 'EEPROM', 'FEPROM',
+                 'EPROM', 'CDRAM', '3DRAM', 'SDRAM', 'SGRAM', 'RDRAM', 'DDR', 'DDR2', 'DDR2 FB-DIMM', 'Reserved',
+                 'Reserved', 'Reserved', 'DDR3', 'FBD2', 'DDR4', 'LPDDR', 'LPDDR2', 'LPDDR3', 'LPDDR4',
+                 'Logical non-volatile device', 'HBM', 'HBM2', 'DDR5', 'LPDDR5', 'HBM3']
+_MEMORY_TYPE_DETAILS = ['Other', 'Unknown', 'Fast-paged', 'Static Column', 'Pseudo-static', 'RAMBus', 'Synchronous',
+                        'CMOS', 'EDO', 'Window DRAM', 'Cache DRAM', 'Non-Volatile', 'Registered (Buffered)',
+                        'Unbuffered (Unregistered)', 'LRDIMM']
+_SIZE_UNITS = ['bytes', 'kB', 'MB', 'GB', 'TB', 'PB', 'EB']
+
+
+class SmbiosParseError(Exception):
+    pass
+
+
+class SmbiosStructure:
+    def __init__(self, dmi_type: int, handle: int, data: bytes, strings: List[str]) -> None:
+        self.dmi_type = dmi_type
+        self.handle = handle
+        self.data = data  # the formatted area, header included
+        self.strings = strings
+
+    def has(self, offset: int, size: int = 1) -> bool:
+        return len(self.data) >= offset + size
+
+    def byte(self, offset: int) -> int:
+        return self._unpack('<B', offset)
+
+    def word(self, offset: int) -> int:
+        return self._unpack('<H', offset)
+
+    def dword(self, offset: int) -> int:
+        return self._unpack('<I', offset)
+
+    def qword(self, offset: int) -> int:
+        return self._unpack('<Q', offset)
+
+    def string(self, offset: int) -> str:
+        index = self.byte(offset)
+        if index == 0:
+            return _NOT_SPECIFIED
+        if index > len(self.strings):
+            return '<BAD INDEX>'
+        return self.strings[index - 1].strip()
+
+    def _unpack(self, fmt: str, offset: int) -> int:
+        # a structure shorter than its type requires is malformed, the callers fall back to dmidecode
+        if not self.has(offset, struct.calcsize(fmt)):
+            raise SmbiosParseError(f"Structure 0x{self.handle:04X} of type {self.dmi_type} is too short "
+                                   f"({len(self.data)} bytes) for offset 0x{offset:02X}")
+        return int(struct.unpack_from(fmt, self.data, offset)[0])
+
+
+def parse_entry_point(entry_point: bytes) -> Tuple[Tuple[int, int], int]:
+    # returns the SMBIOS version and the maximum size of the table
+    if entry_point.startswith(_ANCHOR_30) and len(entry_point) >= 0x18:
+        major, minor = entry_point[0x07], entry_point[0x08]
+        return (major, minor), int(struct.unpack_from('<I', entry_point, 0x0C)[0])
+    if entry_point.startswith(_ANCHOR_21) and len(entry_point) >= 0x1F:
+        major, minor = entry_point[0x06], entry_point[0x07]
+        return (major, minor), int(struct.unpack_from('<H', entry_point, 0x16)[0])
+    raise SmbiosParseError("Unknown SMBIOS entry point")
+
+
+def iter_structures(table: bytes) -> Iterator[SmbiosStructure]:
+    offset = 0
+    while offset + 4 <= len(table):
+        dmi_type, length, handle = struct.unpack_from('<BBH', table, offset)
+        if length < 4:
+            raise SmbiosParseError(f"Invalid length {length} of the structure 0x{handle:04X}")
+        # the formatted area is followed by the strings, each terminated by a NUL, and by another NUL
+        strings_end = table.find(b'\0\0', offset + length)
+        if strings_end < 0:
+            raise SmbiosParseError(f"Unterminated structure 0x{handle:04X}")
+        strings_area = table[offset + length:strings_end]
+        strings = strings_area.decode('latin-1').split('\0') if strings_area else []
+        yield SmbiosStructure(dmi_type, handle, table[offset:offset + length], strings)
+        if dmi_type == _TYPE_END_OF_TABLE:
+            return
+        offset = strings_end + 2
+
+
+class SmbiosParse:
+    # Same interface as DmiParse, built from /sys/firmware/dmi/tables/smbios_entry_point and DMI
+    def __init__(self, entry_point: bytes, table: bytes, dmi_types: Optional[Iterable[int]] = None) -> None:
+        self.version, table_length = parse_entry_point(entry_point)
+        self.dmi_data: Dict[str, DmiRecord] = {}
+        self._index: Dict[int, List[DmiRecord]] = {}
+        wanted: Optional[Set[int]] = None if dmi_types is None else {int(t) for t in dmi_types}
+        for structure in iter_structures(table[:table_length] if table_length else table):
+            decoder = _DECODERS.get(structure.dmi_type)
+            if decoder is None or (wanted is not None and structure.dmi_type not in wanted):
+                continue
+            record: DmiRecord = {'DMIType': structure.dmi_type, 'DMISize': len(structure.data)}
+            record.update(decoder(structure))
+            self.dmi_data[f"0x{structure.handle:04X}"] = record
+            self._index.setdefault(structure.dmi_type, []).append(record)
+
+    def get_type(self, dmi_type: int) -> List[DmiRecord]:
+        return self._index.get(dmi_type, [])
+
+
+def _lookup(values: List[str], value: int) -> str:
+    # the SMBIOS enumerations start from 1
+    return values[value - 1] if 1 <= value <= len(values) else _OUT_OF_SPEC
+
+
+def _format_size(size: int, unit_index: int) -> str:
+    # the biggest unit that represents the size exactly, like dmidecode does
+    while size >= 1024 and size % 1024 == 0 and unit_index < len(_SIZE_UNITS) - 1:
+        size //= 1024
+        unit_index += 1
+    return f"{size} {_SIZE_UNITS[unit_index]}"
+
+
+def _format_speed(speed: int) -> str:
+    return f"{speed} MT/s" if speed else 'Unknown'
+
+
+def _get_x86_signature(eax: int) -> str:
+    # family and model as computed by the kernel for /proc/cpuinfo
+    family = (eax >> 8) & 0xF
+    model = (eax >> 4) & 0xF
+    if family == 0xF:
+        family += (eax >> 20) & 0xFF
+    if family >= 0x6:
+        model += ((eax >> 16) & 0xF) << 4
+    return f"Family {family}, Model {model}, Stepping {eax & 0xF}"
+
+
+def _decode_processor(structure: SmbiosStructure) -> DmiRecord:
+    record: DmiRecord = {
+        'DMIName': 'Processor Information',
+        'Socket Designation': structure.string(0x04),
+        'Type': _lookup(_PROCESSOR_TYPES, structure.byte(0x05)),
+        'Manufacturer': structure.string(0x07),
+        'ID': ' '.join(f"{b:02X}" for b in structure.data[0x08:0x10]),
+        'Version': structure.string(0x10),
+    }
+    manufacturer = str(record['Manufacturer']).lower()
+    if any(manufacturer.startswith(name) for name in _X86_MANUFACTURERS):
+        record['Signature'] = _get_x86_signature(structure.dword(0x08))
+    if structure.has(0x16, 2):
+        record['External Clock'] = f"{structure.word(0x12)} MHz" if structure.word(0x12) else 'Unknown'
+        record['Max Speed'] = f"{structure.word(0x14)} MHz" if structure.word(0x14) else 'Unknown'
+        record['Current Speed'] = f"{structure.word(0x16)} MHz" if structure.word(0x16) else 'Unknown'
+    if structure.has(0x19):
+        status = structure.byte(0x18)
+        record['Status'] = f"Populated, {_PROCESSOR_STATUS[status & 0x07]}" if status & 0x40 else 'Unpopulated'
+        record['Upgrade'] = _lookup(_PROCESSOR_UPGRADES, structure.byte(0x19))
+    if structure.has(0x22):
+        record['Serial Number'] = structure.string(0x20)
+        record['Asset Tag'] = structure.string(0x21)
+        record['Part Number'] = structure.string(0x22)
+    if structure.has(0x25):
+        core_count, core_enabled, thread_count = structure.byte(0x23), structure.byte(0x24), structure.byte(0x25)
+        # 0xFF means that the real value is in the 2.0 fields
+        if structure.has(0x2E, 2):
+            core_count = structure.word(0x2A) if core_count == 0xFF else core_count
+            core_enabled = structure.word(0x2C) if core_enabled == 0xFF else core_enabled
+            thread_count = structure.word(0x2E) if thread_count == 0xFF else thread_count
+        record['Core Count'] = str(core_count)
+        record['Core Enabled'] = str(core_enabled)
+        record['Thread Count'] = str(thread_count)
+    return record
+
+
+def _decode_physical_memory_array(structure: SmbiosStructure) -> DmiRecord:
+    maximum_capacity = structure.dword(0x07)
+    if maximum_capacity == 0x80000000 and structure.has(0x0F, 8):
+        maximum_capacity_text = _format_size(structure.qword(0x0F), 0)
+    else:
+        maximum_capacity_text = _format_size(maximum_capacity, 1)
+    return {
+        'DMIName': 'Physical Memory Array',
+        'Location': _lookup(_ARRAY_LOCATIONS, structure.byte(0x04)),
+        'Use': _lookup(_ARRAY_USES, structure.byte(0x05)),
+        'Error Correction Type': _lookup(_ARRAY_ERROR_CORRECTION_TYPES, structure.byte(0x06)),
+        'Maximum Capacity': maximum_capacity_text,
+        'Number Of Devices': str(structure.word(0x0D)),
+    }
+
+
+def _decode_memory_device(structure: SmbiosStructure) -> DmiRecord:
+    size = structure.word(0x0C)
+    if size == 0:
+        size_text = 'No Module Installed'
+    elif size == 0xFFFF:
+        size_text = 'Unknown'
+    elif size == 0x7FFF and structure.has(0x1C, 4):
+        size_text = _format_size(structure.dword(0x1C) & 0x7FFFFFFF, 2)
+    else:
+        size_text = _format_size(size & 0x7FFF, 1 if size & 0x8000 else 2)
+    type_detail = structure.word(0x13)
+    type_detail_text = ' '.join(name for bit, name in enumerate(_MEMORY_TYPE_DETAILS, 1) if type_detail & (1 << bit))
+    record: DmiRecord = {
+        'DMIName': 'Memory Device',
+        'Array Handle': f"0x{structure.word(0x04):04X}",
+        'Total Width': f"{structure.word(0x08)} bits" if structure.word(0x08) != 0xFFFF else 'Unknown',
+        'Data Width': f"{structure.word(0x0A)} bits" if structure.word(0x0A) != 0xFFFF else 'Unknown',
+        'Size': size_text,
+        'Form Factor': _lookup(_FORM_FACTORS, structure.byte(0x0E)),
+        'Locator': structure.string(0x10),
+        'Bank Locator': structure.string(0x11),
+        'Type': _lookup(_MEMORY_TYPES, structure.byte(0x12)),
+        'Type Detail': type_detail_text or 'None',
+    }
+    if structure.has(0x1A):
+        speed = structure.word(0x15)
+        if speed == 0xFFFF and structure.has(0x54, 4):
+            speed = structure.dword(0x54)
+        record['Speed'] = _format_speed(speed)
+        record['Manufacturer'] = structure.string(0x17)
+        record['Serial Number'] = structure.string(0x18)
+        record['Asset Tag'] = structure.string(0x19)
+        record['Part Number'] = structure.string(0x1A)
+    if structure.has(0x1B):
+        rank = structure.byte(0x1B) & 0x0F
+        record['Rank'] = str(rank) if rank else 'Unknown'
+    if structure.has(0x20, 2):
+        speed = structure.word(0x20)
+        if speed == 0xFFFF and structure.has(0x58, 4):
+            speed = structure.dword(0x58)
+        record['Configured Memory Speed'] = _format_speed(speed)
+    return record
+
+
+def _decode_memory_array_mapped_address(structure: SmbiosStructure) -> DmiRecord:
+    start, end = structure.dword(0x04), structure.dword(0x08)
+    if start == 0xFFFFFFFF and structure.has(0x17, 8):
+        start, end = structure.qword(0x0F), structure.qword(0x17)
+    else:
+        start, end = start << 10, ((end + 1) << 10) - 1
+    return {
+        'DMIName': 'Memory Array Mapped Address',
+        'Starting Address': f"0x{start:011X}",
+        'Ending Address': f"0x{end:011X}",
+        'Range Size': _format_size(end - start + 1, 0),
+        'Physical Array Handle': f"0x{structure.word(0x0C):04X}",
+        'Partition Width': str(structure.byte(0x0E)),
+    }
+
+
+_DECODERS = {
+    DmiType.PROCESSOR.value: _decode_processor,
+    DmiType.PHYSICAL_MEMORY_ARRAY.value: _decode_physical_memory_array,
+    DmiType.MEMORY_DEVICE.value: _decode_memory_device,
+    DmiType.MEMORY_ARRAY_MAPPED_ADDRESS.value: _decode_memory_array_mapped_address,
+}
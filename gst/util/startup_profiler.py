@@ -0,0 +1,139 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import builtins
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+_LOG = logging.getLogger(__name__)
+PROFILE_STARTUP_OPTION = 'profile-startup'
+STARTUP_TIME_BUDGET_SECONDS = 1.5
+_REPORT_TOP_IMPORTS = 25
+
+
+class _ImportTiming:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.cumulative: float = 0.0
+        self.self_time: float = 0.0
+
+
+class StartupProfiler:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._start_time = time.perf_counter()
+        self._phases: List[Tuple[str, float]] = []
+        self._imports: Dict[str, _ImportTiming] = {}
+        self._original_import = builtins.__import__
+
+    def install(self) -> None:
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self) -> None:
+        builtins.__import__ = self._original_import
+
+    def mark_phase(self, name: str) -> None:
+        with self._lock:
+            self._phases.append((name, time.perf_counter()))
+
+    def get_report(self) -> str:
+        with self._lock:
+            phases = list(self._phases)
+            imports = sorted(self._imports.values(), key=lambda timing: timing.self_time, reverse=True)
+        lines = ["Startup phases:"]
+        previous = self._start_time
+        for name, timestamp in phases:
+            lines.append(f"  {name:<32} {(timestamp - previous) * 1000:9.1f} ms")
+            previous = timestamp
+        lines.append(f"  {'total':<32} {(previous - self._start_time) * 1000:9.1f} ms")
+        lines.append(f"Slowest imports ({len(imports)} modules imported):")
+        lines.append(f"  {'module':<48} {'self':>9}    {'cumulative':>9}")
+        for timing in imports[:_REPORT_TOP_IMPORTS]:
+            lines.append(f"  {timing.name:<48} {timing.self_time * 1000:9.1f} ms {timing.cumulative * 1000:9.1f} ms")
+        return '\n'.join(lines)
+
+    def get_total_time(self) -> float:
+        with self._lock:
+            end_time = self._phases[-1][1] if self._phases else time.perf_counter()
+        return end_time - self._start_time
+
+    def _timed_import(self,
+                      name: str,
+                      globals: Optional[Mapping[str, object]] = None,  # pylint: disable=redefined-builtin
+                      locals: Optional[Mapping[str, object]] = None,  # pylint: disable=redefined-builtin
+                      fromlist: Optional[Sequence[str]] = None,
+                      level: int = 0) -> ModuleType:
+        module_name = name
+        if level and globals:
+            package = globals.get('__package__')
+            try:
+                module_name = importlib.util.resolve_name(
+                    '.' * level + name, package if isinstance(package, str) else None)
+            except (ImportError, ValueError):
+                pass
+        if module_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        stack: List[_ImportTiming] = self._local.__dict__.setdefault('stack', [])
+        timing = _ImportTiming(module_name)
+        stack.append(timing)
+        start_time = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            stack.pop()
+            timing.cumulative = elapsed
+            timing.self_time += elapsed
+            if stack:
+                stack[-1].self_time -= elapsed
+            with self._lock:
+                self._imports.setdefault(module_name, timing)
+
+
+_PROFILER: Optional[StartupProfiler] = None
+
+
+def enable_startup_profiler() -> None:
+    global _PROFILER  # pylint: disable=global-statement
+    if _PROFILER is None:
+        _PROFILER = StartupProfiler()
+        _PROFILER.install()
+
+
+def is_startup_profiler_enabled() -> bool:
+    return _PROFILER is not None
+
+
+def mark_startup_phase(name: str) -> None:
+    if _PROFILER is not None:
+        _PROFILER.mark_phase(name)
+
+
+def print_startup_report() -> None:
+    if _PROFILER is None:
+        return
+    _PROFILER.uninstall()
+    print(_PROFILER.get_report())
+    total_time = _PROFILER.get_total_time()
+    if total_time > STARTUP_TIME_BUDGET_SECONDS:
+        _LOG.warning(f"Startup took {total_time:.2f}s, over the budget of {STARTUP_TIME_BUDGET_SECONDS:.2f}s")
@@ -0,0 +1,68 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import math
+import statistics
+from typing import List, Optional, Sequence, Tuple
+
+# two-sided Student's t critical values at 95% by degrees of freedom, above 30 the normal one is close enough
+_T_CRITICAL_95 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]
+_Z_CRITICAL_95 = 1.960
+# Iglewicz and Hoaglin: a modified z-score above 3.5 is a potential outlier
+_MODIFIED_Z_SCORE_THRESHOLD = 3.5
+_MODIFIED_Z_SCORE_SCALE = 0.6745
+# mean absolute deviation based scale used when more than half of the samples are equal, see the same paper
+_MEAN_ABSOLUTE_DEVIATION_SCALE = 0.7979
+_MIN_OUTLIER_SAMPLES = 3
+
+
+def get_t_critical_95(degrees_of_freedom: int) -> float:
+    if degrees_of_freedom < 1:
+        raise ValueError(f"degrees_of_freedom must be at least 1, got {degrees_of_freedom}")
+    if degrees_of_freedom > len(_T_CRITICAL_95):
+        return _Z_CRITICAL_95
+    return _T_CRITICAL_95[degrees_of_freedom - 1]
+
+
+def reject_outliers(samples: Sequence[float]) -> Tuple[List[float], List[float]]:
+    # returns (kept, rejected) using the modified z-score, which unlike the standard one is not skewed by the
+    # outliers themselves
+    if len(samples) < _MIN_OUTLIER_SAMPLES:
+        return list(samples), []
+    median = statistics.median(samples)
+    deviations = [abs(sample - median) for sample in samples]
+    mad = statistics.median(deviations)
+    if mad:
+        scores = [_MODIFIED_Z_SCORE_SCALE * deviation / mad for deviation in deviations]
+    else:
+        mean_absolute_deviation = statistics.mean(deviations)
+        if not mean_absolute_deviation:
+            return list(samples), []
+        scores = [_MEAN_ABSOLUTE_DEVIATION_SCALE * deviation / mean_absolute_deviation for deviation in deviations]
+    kept = [sample for sample, score in zip(samples, scores) if score <= _MODIFIED_Z_SCORE_THRESHOLD]
+    rejected = [sample for sample, score in zip(samples, scores) if score > _MODIFIED_Z_SCORE_THRESHOLD]
+    return kept, rejected
+
+
+def get_confidence_interval_95(samples: Sequence[float]) -> Optional[float]:
+    # half width of the 95% confidence interval of the mean
+    if len(samples) < 2:
+        return None
+    return get_t_critical_95(len(samples) - 1) * statistics.stdev(samples) / math.sqrt(len(samples))
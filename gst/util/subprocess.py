@@ -15,54 +15,108 @@
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 import logging
+import os
+import selectors
+import shutil
 import subprocess
-from typing import List, Tuple
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from gst.util.deployment import is_flatpak
 
 _LOG = logging.getLogger(__name__)
 _FLATPAK_COMMAND_PREFIX = ['flatpak-spawn', '--host']
+_SBIN_PATHS = ['/usr/local/sbin', '/usr/sbin', '/sbin']  # not always in the PATH of a desktop session
+_READ_SIZE = 65536
 
+# command name, on host -> absolute path, or None if not found
+_command_path_cache: Dict[Tuple[str, bool], Optional[str]] = {}
+_command_path_cache_env: Optional[str] = None
+_command_path_cache_lock = threading.Lock()
 
-def check_if_command_is_available(command_name: str, check_on_host: bool = False) -> bool:
-    cmd = [
-        'which',
-        command_name
-    ]
 
-    # TODO check /usr/sbin/ too
-    if check_on_host and is_flatpak():
-        cmd = _FLATPAK_COMMAND_PREFIX + cmd
+def get_host_command(command: List[str]) -> List[str]:
+    # inside the Flatpak sandbox the command has to run on the host
+    return _FLATPAK_COMMAND_PREFIX + command if is_flatpak() else command
+
 
-    process = subprocess.Popen(cmd,
-                               stdout=subprocess.PIPE,
-                               stderr=subprocess.PIPE,
-                               stdin=subprocess.PIPE)
-    output, error = process.communicate()
+def find_command(command_name: str, on_host: bool = False) -> Optional[str]:
+    # resolved once per process and PATH value: under Flatpak looking on the host means spawning a process
+    global _command_path_cache_env  # pylint: disable=global-statement
+    on_host = on_host and is_flatpak()
+    with _command_path_cache_lock:
+        path_env = os.environ.get('PATH', '')
+        if path_env != _command_path_cache_env:
+            _command_path_cache.clear()
+            _command_path_cache_env = path_env
+        key = (command_name, on_host)
+        if key not in _command_path_cache:
+            _command_path_cache[key] = _find_command_on_host(command_name) if on_host \
+                else shutil.which(command_name, path=os.pathsep.join([path_env] + _SBIN_PATHS))
+            _LOG.debug(f"{command_name} resolved to {_command_path_cache[key]}")
+        return _command_path_cache[key]
 
-    return_code = process.returncode
-    log_message = f"ret code = {process.returncode};\n" \
-                  f"output = {output.decode(encoding='UTF-8').strip()};\n" \
-                  f"error = {error.decode(encoding='UTF-8').strip()}"
+
+def _find_command_on_host(command_name: str) -> Optional[str]:
+    cmd = _FLATPAK_COMMAND_PREFIX + [
+        'sh', '-c', f'PATH="$PATH:{":".join(_SBIN_PATHS)}" command -v "$1"', 'sh', command_name
+    ]
+    process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                             check=False)
     if process.returncode != 0:
-        _LOG.warning(log_message)
+        _LOG.warning(f"{command_name} not found on host; ret code = {process.returncode}; "
+                     f"error = {process.stderr.decode(encoding='UTF-8').strip()}")
+        return None
+    return process.stdout.decode(encoding='UTF-8').strip() or None
+
+
+class StreamingProcess:
+    # Runs a command and hands out its stdout and stderr line by line while it is still running, instead of
+    # buffering everything until it exits like communicate() does
+    def __init__(self, command: List[str], on_host: bool = False, new_process_group: bool = False) -> None:
+        self._process = subprocess.Popen(get_host_command(command) if on_host else command,
+                                         stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE,
+                                         stdin=subprocess.DEVNULL,
+                                         start_new_session=new_process_group)
+        self.pid = self._process.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._process.returncode
 
-    return bool(return_code == 0)
+    def iter_lines(self, timeout: Optional[float] = None) -> Iterator[Optional[Tuple[bool, str]]]:
+        # yields (is_stderr, line) as soon as a whole line is available on either stream, until both are closed,
+        # and None when nothing was printed for timeout seconds
+        assert self._process.stdout is not None and self._process.stderr is not None
+        buffers = {self._process.stdout.fileno(): b'', self._process.stderr.fileno(): b''}
+        stderr_fd = self._process.stderr.fileno()
+        with selectors.DefaultSelector() as selector:
+            for fd in buffers:
+                selector.register(fd, selectors.EVENT_READ)
+            while selector.get_map():
+                events = selector.select(timeout)
+                if not events:
+                    yield None
+                for key, _ in events:
+                    fd = key.fd
+                    chunk = os.read(fd, _READ_SIZE)
+                    if not chunk:
+                        selector.unregister(fd)
+                        if buffers[fd]:
+                            yield fd == stderr_fd, buffers[fd].decode(encoding='UTF-8', errors='replace')
+                        continue
+                    *lines, buffers[fd] = (buffers[fd] + chunk).split(b'\n')
+                    for line in lines:
+                        yield fd == stderr_fd, line.decode(encoding='UTF-8', errors='replace')
 
+    def wait(self, timeout: Optional[float] = None) -> int:
+        self._process.wait(timeout)
+        for stream in [self._process.stdout, self._process.stderr]:
+            if stream is not None:
+                stream.close()
+        return self._process.returncode
 
-# https://stackoverflow.com/a/4791612/293878
-def run_on_host_and_get_stdout(command: List[str], pipe_command: List[str] = None) -> Tuple[int, str, str]:
-    if pipe_command is None:
-        if is_flatpak():
-            command = _FLATPAK_COMMAND_PREFIX + command
-        process1 = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
-        output, error = process1.communicate()
-        return process1.returncode, output.decode(encoding='UTF-8').strip(), error.decode(encoding='UTF-8').strip()
-    if is_flatpak():
-        command = _FLATPAK_COMMAND_PREFIX + command
-        pipe_command = _FLATPAK_COMMAND_PREFIX + pipe_command
-    process1 = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE)
-    process2 = subprocess.Popen(pipe_command, stdin=process1.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    process1.stdout.close()
-    output, error = process1.communicate()
-    return process2.returncode, output.decode(encoding='UTF-8').strip(), error.decode(encoding='UTF-8').strip()
+    def send_signal(self, signal_number: int) -> None:
+        if self._process.returncode is None:
+            self._process.send_signal(signal_number)
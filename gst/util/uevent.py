@@ -0,0 +1,104 @@
+# This file is part of gst.
+#
+# Copyright (c) 2020 Roberto Leinardi
+#
+# gst is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# gst is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with gst.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+import os
+import select
+import socket
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+_LOG = logging.getLogger(__name__)
+NETLINK_KOBJECT_UEVENT = 15
+_KERNEL_UEVENT_GROUP = 1
+_LIBUDEV_MAGIC = b'libudev\0'
+_RECEIVE_BUFFER_SIZE = 64 * 1024
+
+
+class Uevent:
+    def __init__(self, action: str, devpath: str, properties: Dict[str, str]) -> None:
+        self.action = action
+        self.devpath = devpath
+        self.properties = properties
+        self.subsystem: Optional[str] = properties.get('SUBSYSTEM')
+
+
+def parse_uevent(data: bytes) -> Optional[Uevent]:
+    # Kernel messages look like "add@/devices/...\0ACTION=add\0DEVPATH=...\0SUBSYSTEM=...\0"
+    if data.startswith(_LIBUDEV_MAGIC) or b'@' not in data.split(b'\0', 1)[0]:
+        return None
+    fields = data.split(b'\0')
+    action, devpath = fields[0].decode('utf-8', 'replace').split('@', 1)
+    properties: Dict[str, str] = {}
+    for field in fields[1:]:
+        if b'=' in field:
+            key, value = field.decode('utf-8', 'replace').split('=', 1)
+            properties[key] = value
+    return Uevent(properties.get('ACTION', action), properties.get('DEVPATH', devpath), properties)
+
+
+def open_uevent_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+    try:
+        sock.bind((0, _KERNEL_UEVENT_GROUP))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class UeventListener(threading.Thread):
+    """Calls on_uevent, from its own thread, for every kernel uevent of the given subsystems.
+
+    A connected socket (e.g. one end of socket.socketpair()) can be passed as stand-in for the netlink socket.
+    """
+
+    def __init__(self,
+                 subsystems: Iterable[str],
+                 on_uevent: Callable[[Uevent], None],
+                 sock: Optional[socket.socket] = None) -> None:
+        super().__init__(name='gst-uevent', daemon=True)
+        self._subsystems = frozenset(subsystems)
+        self._on_uevent = on_uevent
+        self._sock = sock if sock is not None else open_uevent_socket()
+        self._wakeup_read_fd, self._wakeup_write_fd = os.pipe()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                readable, _, _ = select.select([self._sock.fileno(), self._wakeup_read_fd], [], [])
+                if self._wakeup_read_fd in readable:
+                    break
+                data = self._sock.recv(_RECEIVE_BUFFER_SIZE)
+                if not data:
+                    break
+                uevent = parse_uevent(data)
+                if uevent is not None and uevent.subsystem in self._subsystems:
+                    _LOG.debug(f"uevent {uevent.action} {uevent.subsystem} {uevent.devpath}")
+                    self._on_uevent(uevent)
+        except OSError:
+            if not self._stopped.is_set():
+                _LOG.exception("Error while reading uevents")
+        finally:
+            self._sock.close()
+            os.close(self._wakeup_read_fd)
+
+    def stop(self) -> None:
+        if not self._stopped.is_set():
+            self._stopped.set()
+            os.write(self._wakeup_write_fd, b'\0')
+            os.close(self._wakeup_write_fd)
@@ -15,12 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with gst.  If not, see <http://www.gnu.org/licenses/>.
 
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Callable, Dict
 
-import humanfriendly
 from gi.repository import GLib, Gtk, Gdk
 
 from gst.model.cache import Cache
+from gst.util.metrics import measure
 from gst.util.sensors import FeatureType
 
 
@@ -42,6 +42,40 @@ def build_glib_option(long_name: str,
     return option
 
 
+class FrameClockCoalescer:
+    """Applies the posted view updates once per frame clock tick of widget, keeping only the latest one per key.
+
+    Droppable updates posted while the widget is not mapped are discarded: nobody can see them and the next one
+    brings the view up to date anyway.
+    """
+
+    def __init__(self, widget: Gtk.Widget) -> None:
+        self._widget = widget
+        self._pending: Dict[str, Callable[[], None]] = {}
+        self._tick_callback_id: Optional[int] = None
+        self._widget.connect('map', lambda *_: self._schedule())
+
+    def post(self, key: str, callback: Callable[[], None], droppable: bool = True) -> None:
+        if droppable and not self._widget.get_mapped():
+            return
+        self._pending.pop(key, None)
+        self._pending[key] = callback
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._pending and self._tick_callback_id is None and self._widget.get_mapped():
+            self._tick_callback_id = self._widget.add_tick_callback(self._on_tick)
+
+    def _on_tick(self, *_: Any) -> bool:
+        self._tick_callback_id = None
+        pending = self._pending
+        self._pending = {}
+        with measure('view/frame_apply'):
+            for callback in pending.values():
+                callback()
+        return False  # GLib.SOURCE_REMOVE, the next update adds a new tick callback
+
+
 def hide_on_delete(widget: Gtk.Widget, *_: Any) -> Any:
     widget.hide()
     return widget.hide_on_delete()
@@ -148,10 +182,13 @@ def format_frequency(value: Optional[float], show_always_mhz: bool = True) -> Op
         return None
     if show_always_mhz:
         return f"{round(value / (1000 * 1000))} MHz"
-    return humanfriendly.format_size(value, binary=False).replace('byte', 'hertz').replace('B', 'Hz')
+    import humanfriendly  # pylint: disable=import-outside-toplevel
+    size: str = humanfriendly.format_size(value, binary=False)
+    return size.replace('byte', 'hertz').replace('B', 'Hz')
 
 
 def format_power(value: Optional[float]) -> Optional[str]:
+    import humanfriendly  # pylint: disable=import-outside-toplevel
     return humanfriendly.format_size(value, binary=False) \
         .replace('bytes', 'W') \
         .replace('byte', 'W') \
@@ -160,13 +197,19 @@ def format_power(value: Optional[float]) -> Optional[str]:
 
 
 def format_size(value: Optional[int]) -> Optional[str]:
+    import humanfriendly  # pylint: disable=import-outside-toplevel
     return humanfriendly.format_size(value, binary=True) if value else None
 
 
 def format_length(value: Optional[float]) -> Optional[str]:
+    import humanfriendly  # pylint: disable=import-outside-toplevel
     return humanfriendly.format_length(value) if value else None
 
 
+def format_duration(seconds: Optional[float]) -> Optional[str]:
+    return f"{seconds * 1000:.3f} ms" if seconds is not None else None
+
+
 def format_cache_size(cache: Optional[Cache]) -> Optional[str]:
     return ("%d x %s (%s)" % (
         cache.count,
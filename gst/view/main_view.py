@@ -19,25 +19,36 @@ import logging
 import math
 from typing import Optional, Any, Dict, List, Tuple
 
-from injector import inject, singleton
+from injector import inject, singleton, ProviderOf
 from gi.repository import Gtk
-from gst.di import MainBuilder
+from gst.di import MainBuilder, add_main_builder_objects
 from gst.interactor.settings_interactor import SettingsInteractor
 from gst.model import SelectedProcessor, CPU_FLAGS, CPU_BUGS
-from gst.model.cpu_info import CpuInfo
+from gst.model.core_score import CoreScore
+from gst.model.cpu_info import CpuInfo, ClockMonitoredItemKey
+from gst.model.hardware_monitor import HwMonitoredItemKey
 from gst.model.memory_bank_info import MemoryBankInfo, LOCATOR_DEFAULT_TEXT
+from gst.model.monitored_item import MonitoredItem
+from gst.model.monitored_item_change import MonitoredItemChange
 from gst.model.processor import Processor
+from gst.model.stress_ng_progress import StressNgProgress
+from gst.model.stress_tests_comparison import StressTestsComparison, REGRESSION_THRESHOLD_PERCENT
+from gst.model.stress_tests_record import StressTestsRecord
 from gst.model.stress_tests_result import StressTestsResult
 from gst.model.system_info import SystemInfo
-from gst.util.sensors import FeatureType
+from gst.util.metrics import timed, LatencyHistogram
 from gst.util.view import hide_on_delete, format_cache_size, format_cache_ways, format_cache_sets, format_frequency, \
-    format_hex, filter_flags, get_sensors_feature_type_name, format_feature_type_value, format_size
+    format_hex, filter_flags, get_sensors_feature_type_name, format_feature_type_value, format_size, \
+    FrameClockCoalescer, format_duration
 from gst.view.preferences_view import PreferencesView
 from gst.conf import APP_PACKAGE_NAME, APP_NAME, APP_VERSION, APP_SOURCE_URL
 from gst.presenter.main_presenter import MainPresenter, MainViewInterface
 
 _LOG = logging.getLogger(__name__)
 _CORE_USAGE_MAX_PER_ROW = 16
+_CORE_SWEEP_MAX_PER_ROW = 8
+_CORE_SWEEP_HEADER_HEIGHT = 24
+_CORE_SWEEP_FAILED_COLOR = (0.5, 0.5, 0.5)
 
 
 @singleton
@@ -46,14 +57,15 @@ class MainView(MainViewInterface):
     @inject
     def __init__(self,
                  presenter: MainPresenter,
-                 preferences_view: PreferencesView,
+                 preferences_view_provider: ProviderOf[PreferencesView],
                  builder: MainBuilder,
                  settings_interactor: SettingsInteractor,
                  system_info: SystemInfo
                  ) -> None:
         _LOG.debug('init MainView')
         self._presenter: MainPresenter = presenter
-        self._preferences_view = preferences_view
+        self._preferences_view_provider = preferences_view_provider
+        self._preferences_view: Optional[PreferencesView] = None
         self._presenter.main_view = self
         self._builder: Gtk.Builder = builder
         self._settings_interactor = settings_interactor
@@ -65,7 +77,7 @@ class MainView(MainViewInterface):
 
     def _init_widgets(self) -> None:
         self._window: Gtk.ApplicationWindow = self._builder.get_object('application_window')
-        self._preferences_view.set_transient_for(self._window)
+        self._frame_clock_coalescer = FrameClockCoalescer(self._window)
         self._main_menu: Gtk.Menu = self._builder.get_object('main_menu')
         self._main_infobar: Gtk.InfoBar = self._builder.get_object('main_infobar')
         self._main_infobar.connect('response', lambda b, _: b.set_revealed(False))
@@ -75,9 +87,17 @@ class MainView(MainViewInterface):
         self._context = self._statusbar.get_context_id(APP_PACKAGE_NAME)
         self._app_version: Gtk.Label = self._builder.get_object('app_version')
         self._app_version.set_label(f'{APP_NAME} v{APP_VERSION}')
-        self._about_dialog: Gtk.AboutDialog = self._builder.get_object('about_dialog')
-        self._init_about_dialog()
+        self._self_usage_label: Gtk.Label = self._builder.get_object('self_usage_label')
+        self._about_dialog: Optional[Gtk.AboutDialog] = None
         self._read_all_button: Gtk.Button = self._builder.get_object("read_all_button")
+        self._diagnostics_dialog: Optional[Gtk.Dialog] = None
+        self._diagnostics_list_store: Gtk.ListStore = self._builder.get_object("diagnostics_list_store")
+        self._benchmark_history_dialog: Optional[Gtk.Dialog] = None
+        self._core_sweep_dialog: Optional[Gtk.Dialog] = None
+        self._core_scores: List[CoreScore] = []
+        self._benchmark_runs_list_store: Gtk.ListStore = self._builder.get_object("benchmark_runs_list_store")
+        self._benchmark_comparison_list_store: Gtk.ListStore = \
+            self._builder.get_object("benchmark_comparison_list_store")
 
         # Stress tests
         self._stress_stressor_comboboxtext: Gtk.ComboBoxText = self._builder.get_object('stress_stressor_comboboxtext')
@@ -92,6 +112,9 @@ class MainView(MainViewInterface):
         self._stress_bogo_tot_entry: Gtk.Entry = self._builder.get_object('stress_bogo_tot_entry')
         self._stress_bopsust_entry: Gtk.Entry = self._builder.get_object('stress_bopsust_entry')
         self._stress_result_image: Gtk.Image = self._builder.get_object('stress_result_image')
+        self._stress_progress_bar: Gtk.ProgressBar = self._builder.get_object('stress_progress_bar')
+        self._stress_stressors_tree_view: Gtk.TreeView = self._builder.get_object('stress_stressors_tree_view')
+        self._stress_stressors_list_store: Gtk.ListStore = self._builder.get_object('stress_stressors_list_store')
         self.update_stress_tests_result(StressTestsResult())
 
         # Processor
@@ -119,16 +142,12 @@ class MainView(MainViewInterface):
         self._cpu_bogomips_entry: Gtk.Entry = self._builder.get_object('cpu_bogomips_entry')
         self._cpu_flags_entry: Gtk.Entry = self._builder.get_object('cpu_flags_entry')
         self._cpu_bugs_entry: Gtk.Entry = self._builder.get_object('cpu_bugs_entry')
-        self._cpu_flags_dialog: Gtk.Dialog = self._builder.get_object("cpu_flags_dialog")
-        self._cpu_flags_dialog.connect("delete-event", hide_on_delete)
-        self._cpu_bugs_dialog: Gtk.Dialog = self._builder.get_object("cpu_bugs_dialog")
-        self._cpu_bugs_dialog.connect("delete-event", hide_on_delete)
-        self._cpu_bugs_tree_view: Gtk.TreeView = self._builder.get_object("cpu_bugs_tree_view")
+        self._cpu_flags_dialog: Optional[Gtk.Dialog] = None
+        self._cpu_bugs_dialog: Optional[Gtk.Dialog] = None
         self._cpu_bugs_view_all_button: Gtk.Button = self._builder.get_object("cpu_bugs_view_all_button")
         self._cpu_bugs_list_store: Gtk.ListStore = self._builder.get_object("cpu_bugs_list_store")
         self._cpu_physical_package_comboboxtext: Gtk.ComboBoxText = self._builder.get_object(
             'cpu_physical_package_comboboxtext')
-        self._cpu_flags_tree_view: Gtk.TreeView = self._builder.get_object("cpu_flags_tree_view")
         self._cpu_flags_view_all_button: Gtk.Button = self._builder.get_object("cpu_flags_view_all_button")
         self._cpu_flags_list_store: Gtk.ListStore = self._builder.get_object("cpu_flags_list_store")
 
@@ -228,22 +247,76 @@ class MainView(MainViewInterface):
 
         # Clocks
         self._cpu_clocks_tree_store: Gtk.TreeStore = self._builder.get_object('cpu_clocks_tree_store')
+        self._cpu_clocks_processor_row_references: Dict[int, Gtk.TreeRowReference] = {}
+        self._cpu_clocks_row_references: Dict[ClockMonitoredItemKey, Gtk.TreeRowReference] = {}
         self._cpu_clocks_tree_view: Gtk.TreeView = self._builder.get_object("cpu_clocks_tree_view")
         for column in self._cpu_clocks_tree_view.get_columns():
             column.set_expand(True)
 
         # Hardware Monitor
         self._hwmon_tree_store: Gtk.TreeStore = self._builder.get_object('hwmon_tree_store')
+        # keyed by (chip_id,) for chip rows and (chip_id, feature_type) for feature type rows
+        self._hwmon_parent_row_references: Dict[Tuple[Any, ...], Gtk.TreeRowReference] = {}
+        self._hwmon_row_references: Dict[HwMonitoredItemKey, Gtk.TreeRowReference] = {}
         self._hwmon_tree_view: Gtk.TreeView = self._builder.get_object("hwmon_tree_view")
         for column in self._hwmon_tree_view.get_columns():
             column.set_expand(True)
 
-    def _init_about_dialog(self) -> None:
-        self._about_dialog.set_program_name(APP_NAME)
-        self._about_dialog.set_version(APP_VERSION)
-        self._about_dialog.set_website(APP_SOURCE_URL)
-        self._about_dialog.connect("delete-event", hide_on_delete)
-        self._about_dialog.connect("response", hide_on_delete)
+    def _get_about_dialog(self) -> Gtk.AboutDialog:
+        if self._about_dialog is None:
+            add_main_builder_objects(self._builder, ['about_dialog'])
+            self._about_dialog = self._builder.get_object('about_dialog')
+            self._about_dialog.set_program_name(APP_NAME)
+            self._about_dialog.set_version(APP_VERSION)
+            self._about_dialog.set_website(APP_SOURCE_URL)
+            self._about_dialog.connect("delete-event", hide_on_delete)
+            self._about_dialog.connect("response", hide_on_delete)
+        return self._about_dialog
+
+    def _get_cpu_flags_dialog(self) -> Gtk.Dialog:
+        if self._cpu_flags_dialog is None:
+            add_main_builder_objects(self._builder, ['cpu_flags_dialog'])
+            self._cpu_flags_dialog = self._builder.get_object('cpu_flags_dialog')
+            self._cpu_flags_dialog.connect("delete-event", hide_on_delete)
+        return self._cpu_flags_dialog
+
+    def _get_cpu_bugs_dialog(self) -> Gtk.Dialog:
+        if self._cpu_bugs_dialog is None:
+            add_main_builder_objects(self._builder, ['cpu_bugs_dialog'])
+            self._cpu_bugs_dialog = self._builder.get_object('cpu_bugs_dialog')
+            self._cpu_bugs_dialog.connect("delete-event", hide_on_delete)
+        return self._cpu_bugs_dialog
+
+    def _get_diagnostics_dialog(self) -> Gtk.Dialog:
+        if self._diagnostics_dialog is None:
+            add_main_builder_objects(self._builder, ['diagnostics_dialog'])
+            # only the signals of the objects added above are still pending
+            self._builder.connect_signals(self._presenter)
+            self._diagnostics_dialog = self._builder.get_object('diagnostics_dialog')
+            self._diagnostics_dialog.connect("delete-event", hide_on_delete)
+        return self._diagnostics_dialog
+
+    def _get_benchmark_history_dialog(self) -> Gtk.Dialog:
+        if self._benchmark_history_dialog is None:
+            add_main_builder_objects(self._builder, ['benchmark_history_dialog'])
+            # only the signals of the objects added above are still pending
+            self._builder.connect_signals(self._presenter)
+            self._benchmark_history_dialog = self._builder.get_object('benchmark_history_dialog')
+            self._benchmark_history_dialog.connect("delete-event", hide_on_delete)
+        return self._benchmark_history_dialog
+
+    def _get_core_sweep_dialog(self) -> Gtk.Dialog:
+        if self._core_sweep_dialog is None:
+            add_main_builder_objects(self._builder, ['core_sweep_dialog'])
+            self._core_sweep_dialog = self._builder.get_object('core_sweep_dialog')
+            self._core_sweep_dialog.connect("delete-event", hide_on_delete)
+            self._builder.get_object('core_sweep_drawing_area').connect("draw", self._on_core_sweep_draw)
+        return self._core_sweep_dialog
+
+    def init_preferences_view(self) -> None:
+        if self._preferences_view is None:
+            self._preferences_view = self._preferences_view_provider.get()
+            self._preferences_view.set_transient_for(self._window)
 
     def show(self) -> None:
         self._presenter.on_start()
@@ -262,7 +335,7 @@ class MainView(MainViewInterface):
             self._window.show()
 
     def show_about_dialog(self) -> None:
-        self._about_dialog.show()
+        self._get_about_dialog().show()
 
     def set_statusbar_text(self, text: str) -> None:
         self._statusbar.remove_all(self._context)
@@ -274,7 +347,7 @@ class MainView(MainViewInterface):
             physical_package = self._system_info.cpu_info.physical_package_id_list[physical_package_id]
             index: int = next(index for index in physical_package if index is not None)
             self._selected_processor[1] = index
-            self.init_system_info()
+            self._init_system_info()
 
     def select_mem_bank(self, mem_bank_id: int) -> None:
         if mem_bank_id != self._selected_mem_bank:
@@ -282,14 +355,197 @@ class MainView(MainViewInterface):
             self._update_memory()
 
     def open_flags_dialog(self) -> None:
-        self._cpu_flags_dialog.show_all()
+        self._get_cpu_flags_dialog().show_all()
 
     def open_bugs_dialog(self) -> None:
-        self._cpu_bugs_dialog.show_all()
+        self._get_cpu_bugs_dialog().show_all()
+
+    def show_diagnostics(self, histograms: List[LatencyHistogram]) -> None:
+        self._diagnostics_list_store.clear()
+        for histogram in histograms:
+            if histogram.count:
+                self._diagnostics_list_store.append([
+                    histogram.name,
+                    str(histogram.count),
+                    format_duration(histogram.get_mean()),
+                    format_duration(histogram.get_percentile(50)),
+                    format_duration(histogram.get_percentile(95)),
+                    format_duration(histogram.get_percentile(99)),
+                    format_duration(histogram.max),
+                ])
+        self._get_diagnostics_dialog().show_all()
+
+    def show_benchmark_history(self, records: List[StressTestsRecord], baseline_timestamp: Optional[float]) -> None:
+        dialog = self._get_benchmark_history_dialog()
+        self._benchmark_runs_list_store.clear()
+        for record in records:
+            self._benchmark_runs_list_store.append([
+                record.timestamp,
+                datetime.datetime.fromtimestamp(record.timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+                record.stressor,
+                str(record.workers),
+                self._format_metric(record.bopsust, '{:.2f}'),
+                record.cpu_model or '',
+                record.microcode or '',
+                record.bios_version or '',
+                record.kernel or '',
+                record.governor or '',
+                '★' if record.timestamp == baseline_timestamp else '',
+            ])
+        self.show_benchmark_comparison(None)
+        dialog.show_all()
+
+    def get_selected_benchmark_run(self) -> Optional[float]:
+        model, tree_iter = self._builder.get_object('benchmark_runs_tree_selection').get_selected()
+        return None if tree_iter is None else model.get_value(tree_iter, 0)
+
+    def show_benchmark_comparison(self, comparison: Optional[StressTestsComparison]) -> None:
+        label: Gtk.Label = self._builder.get_object('benchmark_comparison_label')
+        self._benchmark_comparison_list_store.clear()
+        if comparison is None:
+            label.set_text("Select a run to compare it with the baseline")
+            return
+        if not comparison.is_comparable():
+            baseline, run = comparison.baseline, comparison.run
+            label.set_text(f"Not comparable: the baseline ran {baseline.stressor} with {baseline.workers} workers, "
+                           f"this run {run.stressor} with {run.workers} workers")
+            return
+        for stressor in comparison.stressors:
+            self._benchmark_comparison_list_store.append([
+                stressor.stressor,
+                self._format_metric(stressor.baseline_real_time_rate or stressor.baseline_usr_sys_time_rate,
+                                    '{:.2f}'),
+                self._format_metric(stressor.run_real_time_rate or stressor.run_usr_sys_time_rate, '{:.2f}'),
+                self._format_metric(stressor.get_real_time_delta_percent(), '{:+.1f}%'),
+                self._format_metric(stressor.get_usr_sys_time_delta_percent(), '{:+.1f}%'),
+                'Regression' if stressor.is_regression() else '',
+            ])
+        baseline_date = datetime.datetime.fromtimestamp(comparison.baseline.timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        text = f"Compared with the {comparison.baseline.stressor} baseline of {baseline_date}"
+        if comparison.fingerprint_changes:
+            changes = ', '.join(change.replace('_', ' ') for change in comparison.fingerprint_changes)
+            text += f", changed since then: {changes}"
+        if comparison.has_regressions():
+            text += f". Regressions bigger than {REGRESSION_THRESHOLD_PERCENT:.0f}% found!"
+        label.set_text(text)
+
+    def show_core_sweep(self, core_scores: List[CoreScore]) -> None:
+        dialog = self._get_core_sweep_dialog()
+        self._core_scores = core_scores
+        scored = [core_score for core_score in core_scores if core_score.successful and core_score.bopsust]
+        label: Gtk.Label = self._builder.get_object('core_sweep_label')
+        if scored:
+            fastest = max(scored, key=lambda core_score: core_score.bopsust)
+            slowest = min(scored, key=lambda core_score: core_score.bopsust)
+            spread = (fastest.bopsust - slowest.bopsust) / fastest.bopsust * 100
+            label.set_text(f"Bogo ops/s (usr+sys time) of the single core benchmark pinned to each core. "
+                           f"Fastest: core {fastest.core_id} of processor #{fastest.physical_package_id} "
+                           f"({fastest.bopsust:.2f}), slowest: core {slowest.core_id} of processor "
+                           f"#{slowest.physical_package_id} ({slowest.bopsust:.2f}), {spread:.1f}% apart")
+        else:
+            label.set_text("The benchmark failed on every core")
+        self._builder.get_object('core_sweep_drawing_area').queue_draw()
+        dialog.show_all()
+
+    def _on_core_sweep_draw(self, widget: Gtk.DrawingArea, context: Any) -> bool:
+        # a cell per core, one block of rows per physical package, from red (slowest) to green (fastest)
+        packages: Dict[int, List[CoreScore]] = {}
+        for core_score in self._core_scores:
+            packages.setdefault(core_score.physical_package_id, []).append(core_score)
+        if not packages:
+            return False
+        scores = [core_score.bopsust for core_score in self._core_scores
+                  if core_score.successful and core_score.bopsust]
+        min_score = min(scores, default=0.0)
+        max_score = max(scores, default=0.0)
+        columns = min(_CORE_SWEEP_MAX_PER_ROW, max(len(cores) for cores in packages.values()))
+        rows = sum(math.ceil(len(cores) / columns) for cores in packages.values())
+        cell_width = widget.get_allocated_width() / columns
+        cell_height = (widget.get_allocated_height() - _CORE_SWEEP_HEADER_HEIGHT * len(packages)) / rows
+        text_color = widget.get_style_context().get_color(Gtk.StateFlags.NORMAL)
+        y = 0.0
+        for physical_package_id, cores in sorted(packages.items()):
+            context.set_source_rgba(text_color.red, text_color.green, text_color.blue, text_color.alpha)
+            context.move_to(4, y + _CORE_SWEEP_HEADER_HEIGHT - 8)
+            context.show_text(f"Processor #{physical_package_id}")
+            y += _CORE_SWEEP_HEADER_HEIGHT
+            for index, core_score in enumerate(cores):
+                x = (index % columns) * cell_width
+                cell_y = y + (index // columns) * cell_height
+                context.set_source_rgb(*self._get_core_sweep_color(core_score, min_score, max_score))
+                context.rectangle(x + 1, cell_y + 1, cell_width - 2, cell_height - 2)
+                context.fill()
+                context.set_source_rgb(0, 0, 0)
+                lines = [f"Core {core_score.core_id}",
+                         f"{core_score.bopsust:.0f}" if core_score.successful and core_score.bopsust else "failed"]
+                for line_index, line in enumerate(lines):
+                    extents = context.text_extents(line)
+                    context.move_to(x + (cell_width - extents.width) / 2,
+                                    cell_y + cell_height / 2 + (line_index - 0.5) * extents.height * 1.6
+                                    + extents.height / 2)
+                    context.show_text(line)
+            y += math.ceil(len(cores) / columns) * cell_height
+        return False
+
+    @staticmethod
+    def _get_core_sweep_color(core_score: CoreScore, min_score: float,
+                              max_score: float) -> Tuple[float, float, float]:
+        if not core_score.successful or not core_score.bopsust:
+            return _CORE_SWEEP_FAILED_COLOR
+        ratio = (core_score.bopsust - min_score) / (max_score - min_score) if max_score > min_score else 1.0
+        return min(1.0, 2 * (1 - ratio)), min(1.0, 2 * ratio), 0.2
+
+    def choose_diagnostics_file(self) -> Optional[str]:
+        dialog = Gtk.FileChooserNative.new("Save Diagnostics",
+                                           self._get_diagnostics_dialog(),
+                                           Gtk.FileChooserAction.SAVE,
+                                           "_Save",
+                                           "_Cancel")
+        dialog.set_do_overwrite_confirmation(True)
+        dialog.set_current_name(f'{APP_PACKAGE_NAME}-diagnostics.json')
+        response = dialog.run()
+        filename = dialog.get_filename() if response == Gtk.ResponseType.ACCEPT else None
+        dialog.destroy()
+        return filename
 
     def init_system_info(self) -> None:
+        self._frame_clock_coalescer.post('init_system_info', self._init_system_info, droppable=False)
+
+    def refresh_system_info(self) -> None:
+        self._frame_clock_coalescer.post('refresh_system_info', self._refresh_system_info)
+
+    def init_cpu_info(self) -> None:
+        self._frame_clock_coalescer.post('init_cpu_info', self._init_cpu_info, droppable=False)
+
+    def init_cpu_cache(self) -> None:
+        self._frame_clock_coalescer.post('init_cpu_cache',
+                                         lambda: self._update_cpu_cache(self._system_info.cpu_info),
+                                         droppable=False)
+
+    def init_mobo_info(self) -> None:
+        self._frame_clock_coalescer.post('init_mobo_info', self._update_mobo_info, droppable=False)
+
+    def init_memory(self) -> None:
+        self._frame_clock_coalescer.post('init_memory', self._update_memory, droppable=False)
+
+    def init_hwmon(self) -> None:
+        self._frame_clock_coalescer.post('init_hwmon', lambda: self._update_hwmon(init=True), droppable=False)
+
+    def init_cpu_usage(self) -> None:
+        self._frame_clock_coalescer.post('init_cpu_usage', self._init_cpu_usage, droppable=False)
+
+    def _init_cpu_info(self) -> None:
+        self._update_cpu_info(self._system_info.cpu_info, init=True)
+        self._update_clocks(init=True)
+
+    def _init_cpu_usage(self) -> None:
+        self._update_cpu_usage()
+        self._update_mem_usage()
+
+    def _init_system_info(self) -> None:
         _LOG.debug("view init_system_info")
         self._update_cpu_info(self._system_info.cpu_info, init=True)
+        self._update_cpu_cache(self._system_info.cpu_info)
         self._update_mobo_info()
         self._update_clocks(init=True)
         self._update_cpu_usage()
@@ -297,12 +553,13 @@ class MainView(MainViewInterface):
         self._update_hwmon(init=True)
         self._update_memory()
 
-    def refresh_system_info(self) -> None:
+    def _refresh_system_info(self) -> None:
         _LOG.debug('refresh system info')
         self._update_cpu_usage()
         self._update_mem_usage()
         self._update_clocks()
         self._update_hwmon()
+        self._update_self_usage()
 
     def toggle_stress_tests_button(self, is_running: bool) -> None:
         if is_running:
@@ -332,9 +589,64 @@ class MainView(MainViewInterface):
             self._set_entry_with_label_text('stress_elapsed', None)
         self._set_entry_with_label_text('stress_bogo_tot', None if result.bogo_ops is None else str(result.bogo_ops))
         self._set_entry_with_label_text('stress_bopsust', None if result.bopsust is None else f"{result.bopsust:.2f}")
+        tooltip: List[str] = []
+        if result.statistics is not None and result.statistics.ci95 is not None:
+            self._set_entry_with_label_text('stress_bopsust',
+                                            f"{result.bopsust:.2f} ± {result.statistics.ci95:.2f}")
+            tooltip.append(f"Mean of {len(result.statistics.samples)} runs, "
+                           f"standard deviation {result.statistics.stddev:.2f}, "
+                           f"95% confidence interval ±{result.statistics.get_relative_ci95():.2f}%")
+            if result.statistics.rejected:
+                rejected = ', '.join(f"{sample:.2f}" for sample in result.statistics.rejected)
+                tooltip.append(f"Outliers left out: {rejected}")
+        if result.noisy and result.noise is not None:
+            tooltip.append(f"Not reliable, other processes were using {result.noise.cpu_percent:.0f}% of the CPU")
+        if result.self_cpu_percent is not None:
+            tooltip.append(f"{APP_NAME} used {result.self_cpu_percent:.1f}% of a CPU core during the run")
+        self._stress_bopsust_entry.set_tooltip_text('\n'.join(tooltip) or None)
+        self._stress_stressors_list_store.clear()
+        for stressor in result.stressors:
+            self._stress_stressors_list_store.append([
+                stressor.stressor,
+                self._format_metric(stressor.instances, '{}'),
+                self._format_metric(stressor.bogo_ops, '{}'),
+                self._format_metric(stressor.real_time, '{:.2f}'),
+                self._format_metric(stressor.usr_time, '{:.2f}'),
+                self._format_metric(stressor.sys_time, '{:.2f}'),
+                self._format_metric(stressor.bogo_ops_per_second_real_time, '{:.2f}'),
+                self._format_metric(stressor.bogo_ops_per_second_usr_sys_time, '{:.2f}'),
+            ])
+        self._stress_stressors_tree_view.set_visible(bool(result.stressors))
         if result.return_code and result.return_code != 2:
             self.show_error_message_dialog("stress-ng error!", result.error)
 
+    @staticmethod
+    def _format_metric(value: Any, template: str) -> str:
+        return '' if value is None else template.format(value)
+
+    def update_stress_tests_progress(self, progress: Optional[StressNgProgress]) -> None:
+        if progress is None:
+            self._stress_progress_bar.set_visible(False)
+            return
+        fraction = progress.get_fraction()
+        if fraction is None:
+            self._stress_progress_bar.pulse()
+        else:
+            self._stress_progress_bar.set_fraction(fraction)
+        if progress.cooling_down:
+            text = "cooling down"
+        elif progress.settling:
+            text = "waiting for the other processes to quiet down"
+        else:
+            text = f"{progress.running_workers} workers, {progress.cpu_percent:.0f}% CPU"
+        if progress.failures:
+            text += f", {len(progress.failures)} failed"
+        if progress.runs > 1:
+            text = f"Run {progress.run} of {progress.runs}: {text}"
+        self._stress_progress_bar.set_text(text)
+        self._stress_progress_bar.set_tooltip_text(progress.last_message)
+        self._stress_progress_bar.set_visible(True)
+
     def get_stress_test_config(self) -> Tuple[str, int, int]:
         return (self._stress_stressor_comboboxtext.get_active_id(),
                 self._stress_workers_comboboxtext.get_active_id(),
@@ -352,7 +664,7 @@ class MainView(MainViewInterface):
     def _setup_flags_widgets(self, flags: Optional[List[str]]) -> None:
         self._set_entry_with_label_text('cpu_flags', filter_flags(flags))
         self._cpu_flags_view_all_button.set_sensitive(flags)
-        if flags and self._cpu_flags_tree_view.get_model().iter_n_children() == 0:
+        if flags and self._cpu_flags_list_store.iter_n_children() == 0:
             for flag in flags:
                 flag_description = CPU_FLAGS.get(flag)
                 self._cpu_flags_list_store.append([flag, flag_description])
@@ -360,11 +672,12 @@ class MainView(MainViewInterface):
     def _setup_bugs_widgets(self, bugs: Optional[List[str]]) -> None:
         self._set_entry_with_label_text('cpu_bugs', ', '.join(bugs).replace('_', ' ').title() if bugs else None)
         self._cpu_bugs_view_all_button.set_sensitive(bugs)
-        if bugs and self._cpu_bugs_tree_view.get_model().iter_n_children() == 0:
+        if bugs and self._cpu_bugs_list_store.iter_n_children() == 0:
             for bug in bugs:
                 bug_description = CPU_BUGS.get(bug)
                 self._cpu_bugs_list_store.append([bug, bug_description])
 
+    @timed("view/cpu_info")
     def _update_cpu_info(self, cpu_info: CpuInfo, init: bool = False) -> None:
         if not cpu_info:
             _LOG.error("CpuInfo is None")
@@ -378,30 +691,6 @@ class MainView(MainViewInterface):
             processor: Processor = cpu_info.get_processor(self._selected_processor)
 
             self._set_entry_with_label_text('cpu_bogomips', "%g" % processor.bogomips if processor.bogomips else None)
-            text_dict = {
-                'size': format_cache_size(processor.cache_l1_data),
-                'ways': format_cache_ways(processor.cache_l1_data),
-                'sets': format_cache_sets(processor.cache_l1_data)
-            }
-            self._set_entries_with_label_text('cpu_cache_l1_data', text_dict)
-            text_dict = {
-                'size': format_cache_size(processor.cache_l1_inst),
-                'ways': format_cache_ways(processor.cache_l1_inst),
-                'sets': format_cache_sets(processor.cache_l1_inst)
-            }
-            self._set_entries_with_label_text('cpu_cache_l1_inst', text_dict)
-            text_dict = {
-                'size': format_cache_size(processor.cache_l2),
-                'ways': format_cache_ways(processor.cache_l2),
-                'sets': format_cache_sets(processor.cache_l2)
-            }
-            self._set_entries_with_label_text('cpu_cache_l2', text_dict)
-            text_dict = {
-                'size': format_cache_size(processor.cache_l3),
-                'ways': format_cache_ways(processor.cache_l3),
-                'sets': format_cache_sets(processor.cache_l3)
-            }
-            self._set_entries_with_label_text('cpu_cache_l3', text_dict)
             self._set_entry_with_label_text('cpu_microcode', processor.microcode)
             self._set_entry_with_label_text('cpu_cores', str(processor.cores))
             # self._set_entry_with_label_text('cpu_bus_speed', format_frequency(processor.default_bus_speed), True)
@@ -428,10 +717,40 @@ class MainView(MainViewInterface):
         # self._set_entry_with_label_text('cpu_rated_fsb', None)
         # self._set_entry_with_label_text('cpu_v_core', None)
 
+    @timed("view/cpu_cache")
+    def _update_cpu_cache(self, cpu_info: CpuInfo) -> None:
+        processor: Processor = cpu_info.get_processor(self._selected_processor)
+        text_dict = {
+            'size': format_cache_size(processor.cache_l1_data),
+            'ways': format_cache_ways(processor.cache_l1_data),
+            'sets': format_cache_sets(processor.cache_l1_data)
+        }
+        self._set_entries_with_label_text('cpu_cache_l1_data', text_dict)
+        text_dict = {
+            'size': format_cache_size(processor.cache_l1_inst),
+            'ways': format_cache_ways(processor.cache_l1_inst),
+            'sets': format_cache_sets(processor.cache_l1_inst)
+        }
+        self._set_entries_with_label_text('cpu_cache_l1_inst', text_dict)
+        text_dict = {
+            'size': format_cache_size(processor.cache_l2),
+            'ways': format_cache_ways(processor.cache_l2),
+            'sets': format_cache_sets(processor.cache_l2)
+        }
+        self._set_entries_with_label_text('cpu_cache_l2', text_dict)
+        text_dict = {
+            'size': format_cache_size(processor.cache_l3),
+            'ways': format_cache_ways(processor.cache_l3),
+            'sets': format_cache_sets(processor.cache_l3)
+        }
+        self._set_entries_with_label_text('cpu_cache_l3', text_dict)
+
+    @timed("view/mobo_info")
     def _update_mobo_info(self) -> None:
         for attr, value in self._system_info.mobo_info:
             self._set_entry_with_label_text(f"mobo_{attr}", value)
 
+    @timed("view/cpu_usage")
     def _update_cpu_usage(self) -> None:
         if not self._cpu_core_usage_cores_levelbars:
             core_count = len(self._system_info.cpu_usage.cores)
@@ -475,88 +794,167 @@ class MainView(MainViewInterface):
         self._set_entry_text(load_avg_entry, "{} ({:.1f}%)", load_avg, percentage)
         load_avg_entry.set_progress_fraction(percentage / 100)
 
+    @timed("view/mem_usage")
     def _update_mem_usage(self) -> None:
         self._set_entry_with_label_text('mem_usage_total', format_size(self._system_info.mem_usage.total))
         self._set_entry_with_label_text('mem_usage_available', format_size(self._system_info.mem_usage.available))
         self._set_levelbar(self._mem_usage_levelbar, self._system_info.mem_usage.percent)
 
+    def _update_self_usage(self) -> None:
+        self_usage = self._system_info.self_usage
+        if self_usage.cpu_percent is None:
+            self._self_usage_label.set_label('')
+            return
+        self._self_usage_label.set_label(f"{APP_NAME}: {self_usage.cpu_percent:.1f}% CPU, "
+                                         f"{format_size(self_usage.rss)}, {self_usage.threads} threads")
+
+    @timed("view/clocks")
     def _update_clocks(self, init: bool = False) -> None:
+        cpu_info = self._system_info.cpu_info
         if init:
             self._cpu_clocks_tree_store.clear()
-            for physical_package_id, processor in self._system_info.cpu_info.clock_monitored_items.items():
-                processor_row = self._cpu_clocks_tree_store.append(None, [physical_package_id,
-                                                                          f"Processor {physical_package_id}",
-                                                                          "", "", ""])
-                for item in processor.values():
-                    self._cpu_clocks_tree_store.append(
-                        processor_row,
-                        [int(item.item_id),
-                         item.name,
-                         format_frequency(item.value),
-                         format_frequency(item.value_min),
-                         format_frequency(item.value_max)]
-                    )
-                self._cpu_clocks_tree_view.expand_all()
+            self._cpu_clocks_processor_row_references.clear()
+            self._cpu_clocks_row_references.clear()
+            cpu_info.pop_clock_changes()
+            cpu_info.pop_updated_clock_monitored_items()
+            for physical_package_id, processor in list(cpu_info.clock_monitored_items.items()):
+                for item in list(processor.values()):
+                    self._add_clock_row((physical_package_id, int(item.item_id)), item)
+            self._cpu_clocks_tree_view.expand_all()
         else:
-            processor_iter = self._cpu_clocks_tree_store.get_iter_first()
-            while processor_iter is not None:
-                physical_package = self._cpu_clocks_tree_store[processor_iter][0]
-                if self._cpu_clocks_tree_store.iter_has_child(processor_iter):
-                    core_iter = self._cpu_clocks_tree_store.iter_children(processor_iter)
-                    while core_iter is not None:
-                        core_id = self._cpu_clocks_tree_store[core_iter][0]
-                        item = self._system_info.cpu_info.get_clock_monitored_item(physical_package, core_id)
-                        self._cpu_clocks_tree_store[core_iter][2] = format_frequency(item.value)
-                        self._cpu_clocks_tree_store[core_iter][3] = format_frequency(item.value_min)
-                        self._cpu_clocks_tree_store[core_iter][4] = format_frequency(item.value_max)
-                        core_iter = self._cpu_clocks_tree_store.iter_next(core_iter)
-                processor_iter = self._cpu_clocks_tree_store.iter_next(processor_iter)
+            for change in cpu_info.pop_clock_changes():
+                if change.type == MonitoredItemChange.ADD:
+                    self._add_clock_row(change.key, change.item, expand=True)
+                else:
+                    self._remove_clock_row(change.key)
+            for key, item in cpu_info.pop_updated_clock_monitored_items():
+                core_iter = self._get_row_iter(self._cpu_clocks_tree_store, self._cpu_clocks_row_references.get(key))
+                if core_iter is not None:
+                    self._cpu_clocks_tree_store.set(core_iter,
+                                                    [2, 3, 4],
+                                                    [format_frequency(item.value),
+                                                     format_frequency(item.value_min),
+                                                     format_frequency(item.value_max)])
+
+    def _add_clock_row(self, key: ClockMonitoredItemKey, item: MonitoredItem, expand: bool = False) -> None:
+        if key in self._cpu_clocks_row_references:
+            return
+        physical_package_id = key[0]
+        processor_iter = self._get_row_iter(self._cpu_clocks_tree_store,
+                                            self._cpu_clocks_processor_row_references.get(physical_package_id))
+        if processor_iter is None:
+            processor_iter = self._cpu_clocks_tree_store.append(None, [physical_package_id,
+                                                                       f"Processor {physical_package_id}",
+                                                                       "", "", ""])
+            self._cpu_clocks_processor_row_references[physical_package_id] = \
+                self._get_row_reference(self._cpu_clocks_tree_store, processor_iter)
+        core_iter = self._cpu_clocks_tree_store.append(
+            processor_iter,
+            [int(item.item_id),
+             item.name,
+             format_frequency(item.value),
+             format_frequency(item.value_min),
+             format_frequency(item.value_max)]
+        )
+        self._cpu_clocks_row_references[key] = self._get_row_reference(self._cpu_clocks_tree_store, core_iter)
+        if expand:
+            self._cpu_clocks_tree_view.expand_to_path(self._cpu_clocks_tree_store.get_path(core_iter))
 
+    def _remove_clock_row(self, key: ClockMonitoredItemKey) -> None:
+        core_iter = self._get_row_iter(self._cpu_clocks_tree_store, self._cpu_clocks_row_references.pop(key, None))
+        if core_iter is None:
+            return
+        processor_iter = self._cpu_clocks_tree_store.iter_parent(core_iter)
+        self._cpu_clocks_tree_store.remove(core_iter)
+        if processor_iter is not None and not self._cpu_clocks_tree_store.iter_has_child(processor_iter):
+            self._cpu_clocks_tree_store.remove(processor_iter)
+            self._cpu_clocks_processor_row_references.pop(key[0], None)
+
+    @timed("view/hwmon")
     def _update_hwmon(self, init: bool = False) -> None:
+        hwmon = self._system_info.hwmon
         if init:
             self._hwmon_tree_store.clear()
-            for chip_id, chip in self._system_info.hwmon.hw_monitored_items.items():
-                chip_row = self._hwmon_tree_store.append(None, [chip_id, chip_id, "", "", ""])
-                for feature_type_id, feature_type in chip.items():
-                    feature_type_row = self._hwmon_tree_store.append(
-                        chip_row,
-                        [str(feature_type_id.value),
-                         get_sensors_feature_type_name(feature_type_id),
-                         "", "", ""])
-                    for item in feature_type.values():
-                        self._hwmon_tree_store.append(
-                            feature_type_row,
-                            [item.item_id,
-                             item.name,
-                             format_feature_type_value(item.value, item.value_type),
-                             format_feature_type_value(item.value_min, item.value_type),
-                             format_feature_type_value(item.value_max, item.value_type)]
-                        )
+            self._hwmon_parent_row_references.clear()
+            self._hwmon_row_references.clear()
+            hwmon.pop_changes()
+            hwmon.pop_updated_items()
+            for chip_id, chip in list(hwmon.hw_monitored_items.items()):
+                for feature_type_id, feature_type in list(chip.items()):
+                    for item in list(feature_type.values()):
+                        self._add_hwmon_row((chip_id, feature_type_id, item.item_id), item)
             self._hwmon_tree_view.expand_all()
         else:
-            chip_iter = self._hwmon_tree_store.get_iter_first()
-            while chip_iter is not None:
-                chip = self._hwmon_tree_store[chip_iter][0]
-                if self._hwmon_tree_store.iter_has_child(chip_iter):
-                    feature_type_iter = self._hwmon_tree_store.iter_children(chip_iter)
-                    while feature_type_iter is not None:
-                        feature_type = self._hwmon_tree_store[feature_type_iter][0]
-                        if self._hwmon_tree_store.iter_has_child(feature_type_iter):
-                            feature_iter = self._hwmon_tree_store.iter_children(feature_type_iter)
-                            while feature_iter is not None:
-                                item_id = self._hwmon_tree_store[feature_iter][0]
-                                item = self._system_info.hwmon.get_hw_monitored_item(chip,
-                                                                                     FeatureType(int(feature_type)),
-                                                                                     item_id)
-                                self._hwmon_tree_store[feature_iter][2] = format_feature_type_value(item.value,
-                                                                                                    item.value_type)
-                                self._hwmon_tree_store[feature_iter][3] = format_feature_type_value(item.value_min,
-                                                                                                    item.value_type)
-                                self._hwmon_tree_store[feature_iter][4] = format_feature_type_value(item.value_max,
-                                                                                                    item.value_type)
-                                feature_iter = self._hwmon_tree_store.iter_next(feature_iter)
-                        feature_type_iter = self._hwmon_tree_store.iter_next(feature_type_iter)
-                chip_iter = self._hwmon_tree_store.iter_next(chip_iter)
+            for change in hwmon.pop_changes():
+                if change.type == MonitoredItemChange.ADD:
+                    self._add_hwmon_row(change.key, change.item, expand=True)
+                else:
+                    self._remove_hwmon_row(change.key)
+            for key, item in hwmon.pop_updated_items():
+                item_iter = self._get_row_iter(self._hwmon_tree_store, self._hwmon_row_references.get(key))
+                if item_iter is not None:
+                    self._hwmon_tree_store.set(item_iter,
+                                               [2, 3, 4],
+                                               [format_feature_type_value(item.value, item.value_type),
+                                                format_feature_type_value(item.value_min, item.value_type),
+                                                format_feature_type_value(item.value_max, item.value_type)])
+
+    def _add_hwmon_row(self, key: HwMonitoredItemKey, item: MonitoredItem, expand: bool = False) -> None:
+        if key in self._hwmon_row_references:
+            return
+        chip_id, feature_type_id, _ = key
+        chip_iter = self._get_row_iter(self._hwmon_tree_store, self._hwmon_parent_row_references.get((chip_id,)))
+        if chip_iter is None:
+            chip_iter = self._hwmon_tree_store.append(None, [chip_id, chip_id, "", "", ""])
+            self._hwmon_parent_row_references[(chip_id,)] = self._get_row_reference(self._hwmon_tree_store, chip_iter)
+        feature_type_iter = self._get_row_iter(self._hwmon_tree_store,
+                                               self._hwmon_parent_row_references.get((chip_id, feature_type_id)))
+        if feature_type_iter is None:
+            feature_type_iter = self._hwmon_tree_store.append(
+                chip_iter,
+                [str(feature_type_id.value),
+                 get_sensors_feature_type_name(feature_type_id),
+                 "", "", ""])
+            self._hwmon_parent_row_references[(chip_id, feature_type_id)] = \
+                self._get_row_reference(self._hwmon_tree_store, feature_type_iter)
+        item_iter = self._hwmon_tree_store.append(
+            feature_type_iter,
+            [item.item_id,
+             item.name,
+             format_feature_type_value(item.value, item.value_type),
+             format_feature_type_value(item.value_min, item.value_type),
+             format_feature_type_value(item.value_max, item.value_type)]
+        )
+        self._hwmon_row_references[key] = self._get_row_reference(self._hwmon_tree_store, item_iter)
+        if expand:
+            self._hwmon_tree_view.expand_to_path(self._hwmon_tree_store.get_path(item_iter))
+
+    def _remove_hwmon_row(self, key: HwMonitoredItemKey) -> None:
+        item_iter = self._get_row_iter(self._hwmon_tree_store, self._hwmon_row_references.pop(key, None))
+        if item_iter is None:
+            return
+        chip_id, feature_type_id, _ = key
+        feature_type_iter = self._hwmon_tree_store.iter_parent(item_iter)
+        self._hwmon_tree_store.remove(item_iter)
+        if feature_type_iter is None or self._hwmon_tree_store.iter_has_child(feature_type_iter):
+            return
+        chip_iter = self._hwmon_tree_store.iter_parent(feature_type_iter)
+        self._hwmon_tree_store.remove(feature_type_iter)
+        self._hwmon_parent_row_references.pop((chip_id, feature_type_id), None)
+        if chip_iter is not None and not self._hwmon_tree_store.iter_has_child(chip_iter):
+            self._hwmon_tree_store.remove(chip_iter)
+            self._hwmon_parent_row_references.pop((chip_id,), None)
+
+    @staticmethod
+    def _get_row_reference(tree_store: Gtk.TreeStore, tree_iter: Gtk.TreeIter) -> Gtk.TreeRowReference:
+        return Gtk.TreeRowReference.new(tree_store, tree_store.get_path(tree_iter))
+
+    @staticmethod
+    def _get_row_iter(tree_store: Gtk.TreeStore,
+                      row_reference: Optional[Gtk.TreeRowReference]) -> Optional[Gtk.TreeIter]:
+        if row_reference is None or not row_reference.valid():
+            return None
+        return tree_store.get_iter(row_reference.get_path())
 
     def _setup_mem_bank_combobox(self, mem_bank_list: List[MemoryBankInfo]) -> None:
         self._mem_bank_comboboxtext.remove_all()
@@ -585,6 +983,7 @@ class MainView(MainViewInterface):
         self._stress_workers_comboboxtext.set_sensitive(sensitive)
         self._stress_timeout_comboboxtext.set_sensitive(sensitive)
 
+    @timed("view/memory")
     def _update_memory(self) -> None:
         self._setup_mem_bank_combobox(self._system_info.memory_bank_info_list)
         mem_bank_info = self._system_info.memory_bank_info_list[self._selected_mem_bank]
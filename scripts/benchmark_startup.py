@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# Measures warm and cold startup of gst using its --profile-startup report.
+# Cold runs drop the page cache first, so they need to be run as root.
+# Make sure that no other gst instance is running: the GApplication would just activate it.
+#
+# With --compare REF, REF is built with meson in a temporary git worktree and both builds are measured the same
+# way: the time from starting the process to the first paint of the main window. This works also with trees
+# older than --profile-startup, but it does not split the time in phases.
+import argparse
+import os
+import re
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+TOTAL_PATTERN = re.compile(r'^\s+total\s+([0-9.]+) ms')
+PHASE_PATTERN = re.compile(r'^\s+(.+?)\s+([0-9.]+) ms$')
+FIRST_PAINT_MARKER = 'gst-benchmark-first-paint'
+FIRST_PAINT = 'first paint'
+# runs a gst launcher script and prints the marker in the first idle callback after the main window is presented,
+# which is after its first redraw, like the "first paint" phase of --profile-startup
+LAUNCHER = f'''
+import runpy
+import sys
+import gi
+gi.require_version('Gtk', '3.0')
+from gi.repository import GLib, Gtk
+
+def _print_marker():
+    print('{FIRST_PAINT_MARKER}', flush=True)
+    return GLib.SOURCE_REMOVE
+
+_present = Gtk.Window.present
+
+def _present_and_mark(window):
+    _present(window)
+    if Gtk.Window.present is _present_and_mark:
+        Gtk.Window.present = _present
+        GLib.idle_add(_print_marker, priority=GLib.PRIORITY_DEFAULT_IDLE)
+
+Gtk.Window.present = _present_and_mark
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name='__main__')
+'''
+
+
+def drop_caches() -> None:
+    subprocess.check_call(['sync'])
+    with open('/proc/sys/vm/drop_caches', 'w', encoding='utf-8') as file:
+        file.write('3\n')
+
+
+def run_once(command: list, timeout: float) -> dict:
+    phases = {}
+    process = subprocess.Popen(command + ['--profile-startup'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               universal_newlines=True)
+    deadline = time.monotonic() + timeout
+    try:
+        for line in process.stdout:
+            if line.startswith('Slowest imports'):
+                break
+            match = PHASE_PATTERN.match(line)
+            if match:
+                phases[match.group(1)] = float(match.group(2))
+            if TOTAL_PATTERN.match(line) or time.monotonic() > deadline:
+                break
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return phases
+
+
+def run_once_until_first_paint(script: str, arguments: list, timeout: float) -> dict:
+    start_time = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', LAUNCHER, script] + arguments, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, universal_newlines=True)
+    deadline = time.monotonic() + timeout
+    try:
+        for line in process.stdout:
+            if line.strip() == FIRST_PAINT_MARKER:
+                return {FIRST_PAINT: (time.perf_counter() - start_time) * 1000}
+            if time.monotonic() > deadline:
+                break
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return {}
+
+
+def build_ref(ref: str, work_dir: str) -> str:
+    # returns the path of the installed launcher script
+    worktree = os.path.join(work_dir, 'src')
+    build_dir = os.path.join(work_dir, 'build')
+    install_dir = os.path.join(work_dir, 'install')
+    subprocess.check_call(['git', 'worktree', 'add', '--detach', worktree, ref])
+    subprocess.check_call(['meson', 'setup', build_dir, worktree, f"--prefix={install_dir}"],
+                          stdout=subprocess.DEVNULL)
+    subprocess.check_call(['ninja', '-C', build_dir, 'install'], stdout=subprocess.DEVNULL)
+    return os.path.join(install_dir, 'bin', 'gst')
+
+
+def measure(run: Callable[[], dict], runs: int, cold: bool) -> dict:
+    results = {}
+    run()  # warm up the page cache
+    results['Warm startup'] = [run() for _ in range(runs)]
+    if cold:
+        cold_runs = []
+        for _ in range(runs):
+            drop_caches()
+            cold_runs.append(run())
+        results['Cold startup'] = cold_runs
+    return results
+
+
+def print_comparison(ref: str, before: dict, after: dict) -> None:
+    print(f"First paint, {ref} -> working tree (median)")
+    for mode, before_runs in before.items():
+        before_values = [run[FIRST_PAINT] for run in before_runs if FIRST_PAINT in run]
+        after_values = [run[FIRST_PAINT] for run in after[mode] if FIRST_PAINT in run]
+        if not before_values or not after_values:
+            print(f"  {mode:<32} no first paint within the timeout")
+            continue
+        before_median, after_median = statistics.median(before_values), statistics.median(after_values)
+        change = (after_median - before_median) / before_median * 100
+        print(f"  {mode:<32} {before_median:9.1f} ms -> {after_median:9.1f} ms   {change:+6.1f}%")
+
+
+def print_summary(title: str, runs: list) -> None:
+    print(f"{title} ({len(runs)} runs)")
+    for phase in runs[0]:
+        values = [run[phase] for run in runs if phase in run]
+        print(f"  {phase:<32} median {statistics.median(values):9.1f} ms   min {min(values):9.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the warm and cold startup time of gst")
+    parser.add_argument('--runs', type=int, default=5, help="number of runs for each mode")
+    parser.add_argument('--timeout', type=float, default=30, help="seconds to wait for the startup report")
+    parser.add_argument('--cold', action='store_true', help="also measure cold startups (requires root)")
+    parser.add_argument('--compare', metavar='REF',
+                        help="also build this git ref with meson and report the time to the first paint of both")
+    parser.add_argument('command', nargs='*', default=['gst'], help="command used to start gst")
+    args = parser.parse_args()
+
+    if args.cold and os.geteuid() != 0:
+        print("Cold startups need root to drop the page cache", file=sys.stderr)
+        return 1
+
+    if not args.compare:
+        for title, runs in measure(lambda: run_once(args.command, args.timeout), args.runs, args.cold).items():
+            print_summary(title, runs)
+        return 0
+
+    script = shutil.which(args.command[0])
+    if script is None:
+        print(f"{args.command[0]} not found, --compare needs the gst launcher script", file=sys.stderr)
+        return 1
+    work_dir = tempfile.mkdtemp(prefix='gst-startup-')
+    try:
+        ref_script = build_ref(args.compare, work_dir)
+        before = measure(lambda: run_once_until_first_paint(ref_script, [], args.timeout), args.runs, args.cold)
+        after = measure(lambda: run_once_until_first_paint(script, args.command[1:], args.timeout), args.runs,
+                        args.cold)
+    finally:
+        subprocess.call(['git', 'worktree', 'remove', '--force', os.path.join(work_dir, 'src')])
+        shutil.rmtree(work_dir, ignore_errors=True)
+    for title, runs in before.items():
+        print_summary(f"{title}, {args.compare}", runs)
+        print_summary(f"{title}, working tree", after[title])
+    print_comparison(args.compare, before, after)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())